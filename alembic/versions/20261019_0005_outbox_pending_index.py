@@ -0,0 +1,36 @@
+"""outbox indexes for submission ingest
+
+Revision ID: 20261019_0005
+Revises: 20260409_0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0005"
+down_revision = "20260409_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_outbox_events_event_type_status_id",
+        "outbox_events",
+        ["event_type", "status", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_outbox_events_ingest_submission_id",
+        "outbox_events",
+        [sa.text("(payload_json ->> 'submissionId')")],
+        unique=False,
+        postgresql_where=sa.text("event_type = 'submission.ingest'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_events_ingest_submission_id", table_name="outbox_events")
+    op.drop_index("ix_outbox_events_event_type_status_id", table_name="outbox_events")
@@ -0,0 +1,45 @@
+"""unique idempotency key per test
+
+Revision ID: 20261019_0006
+Revises: 20261019_0005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0006"
+down_revision = "20261019_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the earliest submission per (test_id, idempotency_key); later duplicates lose the key.
+    op.execute(
+        """
+        UPDATE submissions SET idempotency_key = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY test_id, idempotency_key ORDER BY submitted_at, id
+                ) AS rn
+                FROM submissions
+                WHERE idempotency_key IS NOT NULL
+            ) ranked
+            WHERE ranked.rn > 1
+        )
+        """
+    )
+    op.create_index(
+        "uq_submissions_test_id_idempotency_key",
+        "submissions",
+        ["test_id", "idempotency_key"],
+        unique=True,
+        postgresql_where=sa.text("idempotency_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_submissions_test_id_idempotency_key", table_name="submissions")
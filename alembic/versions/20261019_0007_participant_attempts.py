@@ -0,0 +1,37 @@
+"""participant attempt counters
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0007"
+down_revision = "20261019_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "participant_attempts",
+        sa.Column("test_id", sa.BigInteger(), sa.ForeignKey("tests.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("attempt_value", sa.String(length=200), nullable=False),
+        sa.Column("used", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("test_id", "attempt_value"),
+    )
+    op.execute(
+        """
+        INSERT INTO participant_attempts (test_id, attempt_value, used)
+        SELECT test_id, participant_attempt_value, count(*)
+        FROM submissions
+        GROUP BY test_id, participant_attempt_value
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("participant_attempts")
@@ -0,0 +1,43 @@
+"""per-test submission counters
+
+Revision ID: 20261019_0008
+Revises: 20261019_0007
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0008"
+down_revision = "20261019_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "test_stats",
+        sa.Column("test_id", sa.BigInteger(), sa.ForeignKey("tests.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pending", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_submitted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        """
+        INSERT INTO test_stats (test_id, total, pending, completed, last_submitted_at)
+        SELECT
+            test_id,
+            count(*),
+            count(*) FILTER (WHERE status = 'PENDING_REVIEW'),
+            count(*) FILTER (WHERE status = 'COMPLETED'),
+            max(submitted_at)
+        FROM submissions
+        GROUP BY test_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("test_stats")
@@ -0,0 +1,60 @@
+"""leaderboard projection
+
+Revision ID: 20261019_0009
+Revises: 20261019_0008
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261019_0009"
+down_revision = "20261019_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    submission_status = postgresql.ENUM(name="submissionstatus", create_type=False)
+    op.create_table(
+        "leaderboard_entries",
+        sa.Column(
+            "submission_id",
+            sa.UUID(),
+            sa.ForeignKey("submissions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("test_id", sa.BigInteger(), sa.ForeignKey("tests.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", submission_status, nullable=False),
+        sa.Column("final_score", sa.Float(), nullable=True),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("participant_full_name", sa.String(length=200), nullable=False),
+        sa.Column("participant_secondary", sa.String(length=200), nullable=False, server_default=""),
+        sa.Column("participant_attempt_value", sa.String(length=200), nullable=False),
+        sa.Column("participant_fields_json", sa.JSON(), nullable=False),
+    )
+    op.create_index(
+        "ix_leaderboard_entries_test_status_score",
+        "leaderboard_entries",
+        ["test_id", "status", sa.text("final_score DESC"), "submitted_at"],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO leaderboard_entries (
+            submission_id, test_id, status, final_score, submitted_at,
+            participant_full_name, participant_secondary, participant_attempt_value, participant_fields_json
+        )
+        SELECT
+            id, test_id, status, final_score, submitted_at,
+            participant_full_name, participant_secondary, participant_attempt_value, participant_fields_json
+        FROM submissions
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leaderboard_entries_test_status_score", table_name="leaderboard_entries")
+    op.drop_table("leaderboard_entries")
@@ -0,0 +1,27 @@
+"""keyset index for submission listing
+
+Revision ID: 20261019_0010
+Revises: 20261019_0009
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "20261019_0010"
+down_revision = "20261019_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_submissions_test_id_submitted_at_id",
+        "submissions",
+        ["test_id", "submitted_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_submissions_test_id_submitted_at_id", table_name="submissions")
@@ -0,0 +1,54 @@
+"""normalized submission answers
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+Create Date: 2026-10-19
+
+Existing submissions are filled in by the ``submission_answers_backfill`` task,
+since normalization and scoring happen in Python.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0011"
+down_revision = "20261019_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "submission_answers",
+        sa.Column(
+            "submission_id",
+            sa.UUID(),
+            sa.ForeignKey("submissions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("question_id", sa.UUID(), primary_key=True),
+        sa.Column("test_id", sa.BigInteger(), sa.ForeignKey("tests.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("normalized_value", sa.Text(), nullable=False),
+        sa.Column("is_correct", sa.Boolean(), nullable=True),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("part_mask", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_submission_answers_question_value",
+        "submission_answers",
+        ["question_id", "normalized_value"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_submission_answers_test_submission",
+        "submission_answers",
+        ["test_id", "submission_id", "question_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_submission_answers_test_submission", table_name="submission_answers")
+    op.drop_index("ix_submission_answers_question_value", table_name="submission_answers")
+    op.drop_table("submission_answers")
@@ -0,0 +1,34 @@
+"""per-test analytics snapshots
+
+Revision ID: 20261019_0012
+Revises: 20261019_0011
+Create Date: 2026-10-19
+
+Snapshots are created by the ``analytics_rebuild`` task, which picks up every
+test with submissions and no snapshot.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0012"
+down_revision = "20261019_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "test_analytics",
+        sa.Column("test_id", sa.BigInteger(), sa.ForeignKey("tests.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("payload_json", sa.JSON(), nullable=False),
+        sa.Column("source_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("source_completed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("stale", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("test_analytics")
@@ -0,0 +1,30 @@
+"""answers schema version
+
+Revision ID: 20261019_0013
+Revises: 20261019_0012
+Create Date: 2026-10-19
+
+Existing rows start at version 0 and are rewritten by the
+``answers_schema_migrate`` task; the application writes new rows at the
+current version.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0013"
+down_revision = "20261019_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "submissions",
+        sa.Column("answers_schema_version", sa.SmallInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("submissions", "answers_schema_version")
@@ -0,0 +1,36 @@
+"""submission draft autosave log
+
+Revision ID: 20261019_0014
+Revises: 20261019_0013
+Create Date: 2026-10-19
+
+Used for participant autosave when Redis is not enabled; events of ended tests
+are removed by the ``drafts_purge`` task.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0014"
+down_revision = "20261019_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "submission_draft_events",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("draft_id", sa.UUID(), nullable=False),
+        sa.Column("test_id", sa.BigInteger(), sa.ForeignKey("tests.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("participant_fields_json", sa.JSON(), nullable=True),
+        sa.Column("answers_json", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_submission_draft_events_draft_id", "submission_draft_events", ["draft_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_submission_draft_events_draft_id", table_name="submission_draft_events")
+    op.drop_table("submission_draft_events")
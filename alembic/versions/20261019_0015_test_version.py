@@ -0,0 +1,26 @@
+"""test version column for compiled snapshot invalidation
+
+Revision ID: 20261019_0015
+Revises: 20261019_0014
+Create Date: 2026-10-19
+
+Every test edit bumps ``tests.version`` in the same transaction; API replicas
+and workers read it with the snapshot lookup instead of a per-process counter.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0015"
+down_revision = "20261019_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("tests", sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("tests", "version")
@@ -0,0 +1,31 @@
+"""outbox index for queued idempotency-key lookups
+
+Revision ID: 20261019_0016
+Revises: 20261019_0015
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0016"
+down_revision = "20261019_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_outbox_events_ingest_idempotency_key",
+        "outbox_events",
+        [sa.text("(payload_json ->> 'idempotencyKey')")],
+        unique=False,
+        postgresql_where=sa.text(
+            "event_type = 'submission.ingest' AND (payload_json ->> 'idempotencyKey') IS NOT NULL"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_events_ingest_idempotency_key", table_name="outbox_events")
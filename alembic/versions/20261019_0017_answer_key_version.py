@@ -0,0 +1,31 @@
+"""answer key versions for rescoring submission_answers
+
+Revision ID: 20261019_0017
+Revises: 20261019_0016
+Create Date: 2026-10-19
+
+Edits that change a test's answer key bump ``tests.answer_key_version``; the
+analytics rebuild rescores the test's ``submission_answers`` and records the
+version it scored against on ``test_analytics``.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0017"
+down_revision = "20261019_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("tests", sa.Column("answer_key_version", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column(
+        "test_analytics", sa.Column("answer_key_version", sa.Integer(), nullable=False, server_default="0")
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("test_analytics", "answer_key_version")
+    op.drop_column("tests", "answer_key_version")
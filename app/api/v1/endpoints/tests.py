@@ -1,20 +1,31 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import db_session, get_current_user, get_current_user_optional, get_idempotency_key
-from app.core.constants import QuestionType
 from app.core.ratelimit import rate_limit
-from app.models.domain import Question, Submission, Test
+from app.core.responses import ORJSONResponse
 from app.schemas.common import APIMessage
 from app.schemas.submissions import (
+    AnswerClustersResponse,
+    BulkFinalizeOut,
+    BulkFinalizeRequest,
+    BulkManualGradesOut,
+    BulkManualGradesRequest,
+    DraftCreateRequest,
+    DraftOut,
+    DraftPatchRequest,
+    DraftSavedOut,
     FinalizeRequest,
     LeaderboardResponse,
     ManualGradesPatchRequest,
     SubmissionCreateRequest,
+    SubmissionImportOut,
+    SubmissionIngestStatusOut,
     SubmissionOut,
+    SubmissionQueuedOut,
 )
 from app.schemas.tests import (
     AttemptValidateOut,
@@ -25,12 +36,31 @@ from app.schemas.tests import (
     TestPatchRequest,
     TestSummaryOut,
 )
+from app.services.attempt_session import SESSION_CLIENT_HEADER, SESSION_HEADER
+from app.services.draft_service import DraftService
+from app.services.export_service import SubmissionExportService, stream_submissions_export
+from app.services.import_service import SubmissionImportService, read_import_file
+from app.services.leaderboard_stream import leaderboard_hub
+from app.services.payload_cache import EncodedPayload
 from app.services.submission_service import SubmissionService
 from app.services.test_service import TestService
+from app.utils.spreadsheet import make_writer
 
 router = APIRouter(prefix="/tests", tags=["tests"])
 
 
+def _cached_json_response(request: Request, payload: EncodedPayload) -> Response:
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {item.strip().removeprefix("W/") for item in if_none_match.split(",")}
+    if payload.etag in candidates or "*" in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        headers["Content-Encoding"] = "gzip"
+        return Response(payload.gzip_body, media_type="application/json", headers=headers)
+    return Response(payload.body, media_type="application/json", headers=headers)
+
+
 @router.get("", response_model=list[TestSummaryOut])
 async def list_tests(user=Depends(get_current_user), db: AsyncSession = Depends(db_session)):
     service = TestService(db)
@@ -46,13 +76,15 @@ async def create_test(payload: TestCreateRequest, user=Depends(get_current_user)
 @router.get("/{test_id}", response_model=TestDetailOut)
 async def get_test(
     test_id: int,
+    request: Request,
     user=Depends(get_current_user_optional),
     db: AsyncSession = Depends(db_session),
 ):
     service = TestService(db)
+    compiled = await service.get_compiled_test_or_404(test_id)
+    if not user or compiled.creator_id != user.id:
+        return _cached_json_response(request, await service.public_detail_payload(compiled))
     row = await service.get_test_or_404(test_id)
-    if not user or row.creator_id != user.id:
-        return service.serialize_test_detail(row, include_correct=False)
     return service.serialize_test_detail(row, include_correct=True)
 
 
@@ -80,34 +112,90 @@ async def publish_link(test_id: int, request: Request):
 
 
 @router.get("/{test_id}/session-config", response_model=SessionConfigOut)
-async def session_config(test_id: int, db: AsyncSession = Depends(db_session)):
+async def session_config(
+    test_id: int,
+    request: Request,
+    client_id: UUID | None = Header(None, alias=SESSION_CLIENT_HEADER),
+    db: AsyncSession = Depends(db_session),
+):
     service = TestService(db)
-    return await service.session_config(test_id)
+    response = _cached_json_response(request, await service.session_config_payload(test_id))
+    session = await service.start_session(test_id, str(client_id or ""))
+    if session:
+        response.headers[SESSION_HEADER] = session["session_token"]
+    return response
 
 
 @router.post("/{test_id}/attempts/validate", response_model=AttemptValidateOut)
 async def validate_attempt(
-    test_id: int, payload: AttemptValidateRequest, db: AsyncSession = Depends(db_session)
+    test_id: int,
+    payload: AttemptValidateRequest,
+    client_id: UUID | None = Header(None, alias=SESSION_CLIENT_HEADER),
+    db: AsyncSession = Depends(db_session),
 ):
     service = TestService(db)
-    return await service.validate_attempt(test_id, payload.participant_value)
+    return await service.validate_attempt(test_id, payload.participant_value, str(client_id or ""))
 
 
-@router.post("/{test_id}/submissions", response_model=SubmissionOut)
+@router.post("/{test_id}/submissions", response_model=SubmissionOut | SubmissionQueuedOut)
 async def create_submission(
     test_id: int,
     payload: SubmissionCreateRequest,
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(db_session),
     idem_key: str | None = Depends(get_idempotency_key),
 ):
     rate_limit(key=f"submit:{request.client.host}:{test_id}", limit=25, window_seconds=60)
     service = SubmissionService(db)
-    return await service.create_submission(
+    result = await service.create_submission(
         test_id=test_id,
         participant_values=payload.participant_values,
         answers=payload.answers,
         idempotency_key=idem_key,
+        draft_id=payload.draft_id,
+        session_token=request.headers.get(SESSION_HEADER),
+    )
+    if result["status"] in {"queued", "failed"}:
+        response.status_code = status.HTTP_202_ACCEPTED
+    return result
+
+
+@router.post("/{test_id}/drafts", response_model=DraftSavedOut)
+async def create_draft(
+    test_id: int, payload: DraftCreateRequest, request: Request, db: AsyncSession = Depends(db_session)
+):
+    rate_limit(key=f"draft-create:{request.client.host}:{test_id}", limit=25, window_seconds=60)
+    return await DraftService(db).create(test_id, payload.participant_values)
+
+
+@router.patch("/{test_id}/drafts/{draft_id}", response_model=DraftSavedOut)
+async def save_draft(
+    test_id: int,
+    draft_id: UUID,
+    payload: DraftPatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(db_session),
+):
+    rate_limit(key=f"draft:{request.client.host}:{test_id}", limit=240, window_seconds=60)
+    return await DraftService(db).save(test_id, draft_id, payload.answers)
+
+
+@router.get("/{test_id}/drafts/{draft_id}", response_model=DraftOut)
+async def get_draft(test_id: int, draft_id: UUID, db: AsyncSession = Depends(db_session)):
+    return await DraftService(db).get(test_id, draft_id)
+
+
+@router.get("/{test_id}/submissions/{submission_id}/status", response_model=SubmissionIngestStatusOut)
+async def submission_status(
+    test_id: int,
+    submission_id: UUID,
+    user=Depends(get_current_user_optional),
+    db: AsyncSession = Depends(db_session),
+):
+    service = SubmissionService(db)
+    return await service.submission_status(
+        test_id=test_id, submission_id=submission_id, user_id=user.id if user else None
     )
 
 
@@ -115,12 +203,56 @@ async def create_submission(
 async def list_submissions(
     test_id: int,
     status: str | None = None,
-    latest: int | None = None,
+    latest: int | None = Query(default=None, ge=1),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = None,
     user=Depends(get_current_user),
     db: AsyncSession = Depends(db_session),
 ):
     service = SubmissionService(db)
-    return await service.list_submissions(test_id=test_id, user_id=user.id, status=status, latest=latest)
+    items, next_cursor = await service.list_submissions(
+        test_id=test_id,
+        user_id=user.id,
+        status=status,
+        latest=latest,
+        limit=limit,
+        cursor=cursor,
+    )
+    response = ORJSONResponse(items)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/{test_id}/submissions/export")
+async def export_submissions(
+    test_id: int,
+    fmt: str = Query(default="csv", alias="format", pattern="^(csv|xlsx)$"),
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(db_session),
+):
+    test = await SubmissionExportService(db).test_for_owner(test_id, user.id)
+    await db.close()
+    writer = make_writer(fmt)
+    return StreamingResponse(
+        stream_submissions_export(test, writer),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f'attachment; filename="test-{test_id}-submissions.{writer.extension}"'},
+    )
+
+
+@router.post("/{test_id}/submissions/import", response_model=SubmissionImportOut)
+async def import_submissions(
+    test_id: int,
+    file: UploadFile = File(...),
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(db_session),
+):
+    """CSV (fullName, phone, field keys, Q1..Qn or question ids, submittedAt) or NDJSON rows."""
+    name = (file.filename or "").lower()
+    fmt = "ndjson" if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (file.content_type or "") else "csv"
+    service = SubmissionImportService(db)
+    return await service.import_submissions(test_id, user.id, await read_import_file(file), fmt)
 
 
 @router.patch("/{test_id}/submissions/{submission_id}/manual-grades", response_model=SubmissionOut)
@@ -137,6 +269,60 @@ async def patch_manual_grades(
     )
 
 
+@router.patch("/{test_id}/manual-grades", response_model=BulkManualGradesOut)
+async def bulk_patch_manual_grades(
+    test_id: int,
+    payload: BulkManualGradesRequest,
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(db_session),
+):
+    service = SubmissionService(db)
+    return await service.bulk_patch_manual_grades(
+        test_id=test_id,
+        user_id=user.id,
+        items=[item.model_dump() for item in payload.items],
+    )
+
+
+@router.get(
+    "/{test_id}/questions/{question_id}/answer-clusters", response_model=AnswerClustersResponse
+)
+async def answer_clusters(
+    test_id: int,
+    question_id: UUID,
+    threshold: float = Query(default=0.8, ge=0.1, le=1.0),
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(db_session),
+):
+    service = SubmissionService(db)
+    return await service.answer_clusters(
+        test_id=test_id, question_id=question_id, user_id=user.id, threshold=threshold
+    )
+
+
+@router.post("/{test_id}/submissions/finalize", response_model=BulkFinalizeOut)
+async def bulk_finalize(
+    test_id: int,
+    payload: BulkFinalizeRequest,
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(db_session),
+):
+    service = SubmissionService(db)
+    return await service.bulk_finalize(test_id=test_id, user_id=user.id, submission_ids=payload.submissionIds)
+
+
+@router.post("/{test_id}/submissions/finalize-graded", response_model=BulkFinalizeOut)
+async def finalize_graded(
+    test_id: int,
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(db_session),
+):
+    service = SubmissionService(db)
+    return await service.bulk_finalize(
+        test_id=test_id, user_id=user.id, submission_ids=None, fully_graded_only=True
+    )
+
+
 @router.post("/{test_id}/submissions/{submission_id}/finalize", response_model=SubmissionOut)
 async def finalize_submission(
     test_id: int,
@@ -155,9 +341,37 @@ async def finalize_submission(
 
 
 @router.get("/{test_id}/leaderboard", response_model=LeaderboardResponse)
-async def leaderboard(test_id: int, db: AsyncSession = Depends(db_session)):
+async def leaderboard(
+    test_id: int,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    ranked_cursor: str | None = None,
+    pending_cursor: str | None = None,
+    db: AsyncSession = Depends(db_session),
+):
+    service = SubmissionService(db)
+    # The service emits the LeaderboardResponse shape already; skip re-validating thousands of rows.
+    return ORJSONResponse(
+        await service.leaderboard(test_id, limit=limit, ranked_cursor=ranked_cursor, pending_cursor=pending_cursor)
+    )
+
+
+@router.get("/{test_id}/leaderboard/stream")
+async def leaderboard_stream(test_id: int, db: AsyncSession = Depends(db_session)):
+    await TestService(db).get_compiled_test_or_404(test_id)
+    # Release the connection; the stream can stay open for the whole olympiad.
+    await db.close()
+    return StreamingResponse(
+        leaderboard_hub.stream(test_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{test_id}/questions/stats")
+async def get_all_question_stats(test_id: int, db: AsyncSession = Depends(db_session)) -> dict:
+    """Option distributions for every question of a test in one round-trip"""
     service = SubmissionService(db)
-    return await service.leaderboard(test_id)
+    return await service.all_question_stats(test_id)
 
 
 @router.get("/{test_id}/questions/{question_id}/stats")
@@ -167,56 +381,10 @@ async def get_question_stats(
     db: AsyncSession = Depends(db_session),
 ) -> dict:
     """Get detailed stats for a question including option distribution"""
-
-    # Get test
-    result = await db.execute(select(Test).where(Test.id == test_id))
-    test = result.scalar_one_or_none()
-    if not test:
-        raise HTTPException(status_code=404, detail="Test not found")
-
-    # Parse question ID
     try:
         q_uuid = UUID(question_id)
     except (ValueError, AttributeError):
         raise HTTPException(status_code=400, detail="Invalid question ID")
 
-    # Find question in test
-    question = next((q for q in test.questions if q.id == q_uuid), None)
-    if not question:
-        raise HTTPException(status_code=404, detail="Question not found")
-
-    # Get all completed submissions
-    stmt = select(Submission).where(
-        Submission.test_id == test_id,
-        Submission.status == "completed",
-    )
-    result = await db.execute(stmt)
-    submissions = result.scalars().all()
-
-    # Build response
-    options_data = {}
-
-    if question.q_type == QuestionType.MULTIPLE_CHOICE:
-        for option in question.options:
-            idx = option.option_index
-            count = sum(
-                1 for s in submissions
-                if str(question.id) in s.answers_json
-                and str(s.answers_json[str(question.id)]) == str(idx)
-            )
-            options_data[idx] = {
-                "index": idx,
-                "html": option.option_html,
-                "count": count,
-                "percentage": (count / len(submissions) * 100) if submissions else 0,
-            }
-
-    return {
-        "questionId": str(question.id),
-        "type": question.q_type.value,
-        "content": question.content_html,
-        "sortOrder": question.sort_order,
-        "points": question.points,
-        "options": options_data,
-        "totalResponses": len(submissions),
-    }
+    service = SubmissionService(db)
+    return await service.question_stats(test_id, q_uuid)
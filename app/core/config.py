@@ -36,6 +36,18 @@ class Settings(BaseSettings):
     db_password: str = "postgres"
     db_sslmode: Literal["disable", "allow", "prefer", "require", "verify-ca", "verify-full"] = "disable"
     redis_url: str = "redis://localhost:6379/0"
+    redis_cache_enabled: bool = False
+
+    submission_ingest_mode: Literal["direct", "queued"] = "direct"
+    submission_ingest_batch_size: int = 500
+
+    # Reject submissions without a valid attempt-session token (issued at test start). Anonymous
+    # starts are pinned to the client-chosen X-Attempt-Client id, so only tests with attempts
+    # enabled hold a participant to one clock.
+    attempt_session_enforced: bool = False
+    attempt_session_grace_seconds: int = 30
+
+    compiled_test_cache_size: int = 512
 
     jwt_secret_key: str = Field(default="change-me-access", min_length=16)
     jwt_refresh_secret_key: str = Field(default="change-me-refresh", min_length=16)
@@ -44,9 +44,17 @@ class SubmissionStatus(StrEnum):
     COMPLETED = "completed"
 
 
+# Widths of the ``submissions.participant_*`` and ``submissions.idempotency_key`` columns.
+PARTICIPANT_VALUE_MAX_LENGTH = 200
+IDEMPOTENCY_KEY_MAX_LENGTH = 128
+
 DEFAULT_FREE_LIMITS = {
     "activeTests": 3,
     "questionsPerTest": 30,
     "submissionsPerTest": 100,
     "manualReviewRecent": 20,
 }
+
+# Bumped when stored ``answers_json`` needs a rewrite; rows below it are legacy
+# (e.g. positional keys) and are canonicalized on read until migrated.
+ANSWERS_SCHEMA_VERSION = 1
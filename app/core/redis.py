@@ -0,0 +1,29 @@
+import asyncio
+from weakref import WeakKeyDictionary
+
+from redis.asyncio import Redis
+
+from app.core.config import get_settings
+
+# Async Redis clients bind their connection pool to the loop that first uses them;
+# Celery tasks run each job under a fresh ``asyncio.run``, so clients are kept per loop.
+_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, Redis] = WeakKeyDictionary()
+
+
+def get_redis() -> Redis | None:
+    settings = get_settings()
+    if not settings.redis_cache_enabled:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = Redis.from_url(settings.redis_url)
+        _clients[loop] = client
+    return client
+
+
+async def close_redis() -> None:
+    """Closes the current loop's client; call before the loop itself is closed."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
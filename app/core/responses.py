@@ -0,0 +1,15 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON encoded with orjson.
+
+    UUIDs, datetimes (UTC rendered with ``Z`` like Pydantic) and enums are encoded
+    natively, so serializers can return plain dicts without a model round-trip.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
@@ -56,6 +56,26 @@ def create_refresh_token(user_id: UUID) -> str:
     return jwt.encode(payload, settings.jwt_refresh_secret_key, algorithm="HS256")
 
 
+def create_attempt_session_token(
+    test_id: int, subject: str, started_at: datetime, expires_at: datetime, secret_key: str
+) -> str:
+    payload = {
+        "sub": subject,
+        "type": "attempt_session",
+        "tid": test_id,
+        "iat": int(started_at.timestamp()),
+        "exp": int(expires_at.timestamp()),
+    }
+    return jwt.encode(payload, secret_key, algorithm="HS256")
+
+
+def decode_attempt_session_token(token: str, secret_key: str) -> dict[str, Any]:
+    payload = jwt.decode(token, secret_key, algorithms=["HS256"])
+    if payload.get("type") != "attempt_session":
+        raise jwt.InvalidTokenError("invalid token type")
+    return payload
+
+
 def decode_access_token(token: str) -> dict[str, Any]:
     settings = get_settings()
     return jwt.decode(token, settings.jwt_secret_key, algorithms=["HS256"])
@@ -0,0 +1,21 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+LOADER_CACHE_KEY = "loader_cache"
+
+
+def loader_cache(db: AsyncSession | Session, kind: str) -> dict:
+    """Per-transaction memo of loaded entities, kept on ``Session.info``.
+
+    Services sharing a session (one request) reuse what an earlier call already
+    loaded; the memo is dropped on commit and rollback so the next transaction
+    sees fresh rows.
+    """
+    return db.info.setdefault(LOADER_CACHE_KEY, {}).setdefault(kind, {})
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_loader_cache(session: Session, *args) -> None:
+    session.info.pop(LOADER_CACHE_KEY, None)
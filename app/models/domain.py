@@ -9,15 +9,19 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants import (
+    ANSWERS_SCHEMA_VERSION,
     FieldType,
     PlanCode,
     QuestionType,
@@ -93,6 +97,10 @@ class Test(Base, TimestampMixin):
     test_type: Mapped[TestType] = mapped_column(Enum(TestType), default=TestType.EXAM, nullable=False)
     creator_plan_snapshot: Mapped[PlanCode] = mapped_column(Enum(PlanCode), default=PlanCode.FREE)
     status: Mapped[str] = mapped_column(String(32), default="active", nullable=False)
+    # Bumped by every edit; compiled snapshots are keyed by it.
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Bumped by edits that change how answers are scored; see ``TestAnalytics.answer_key_version``.
+    answer_key_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
 
     creator: Mapped["User"] = relationship(back_populates="tests")
     participant_fields: Mapped[list["ParticipantField"]] = relationship(
@@ -163,6 +171,9 @@ class Submission(Base):
     participant_secondary: Mapped[str] = mapped_column(String(200), default="", nullable=False)
     participant_fields_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
     answers_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    answers_schema_version: Mapped[int] = mapped_column(
+        SmallInteger, default=ANSWERS_SCHEMA_VERSION, server_default="0", nullable=False
+    )
     auto_score: Mapped[float] = mapped_column(Float, default=0, nullable=False)
     auto_max_score: Mapped[float] = mapped_column(Float, default=0, nullable=False)
     final_score: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -181,6 +192,110 @@ class Submission(Base):
         back_populates="submission", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index(
+            "uq_submissions_test_id_idempotency_key",
+            "test_id",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=text("idempotency_key IS NOT NULL"),
+        ),
+        Index("ix_submissions_test_id_submitted_at_id", "test_id", "submitted_at", "id"),
+    )
+
+
+class SubmissionAnswer(Base):
+    """One row per answered question, normalized and scored at submit time."""
+
+    __tablename__ = "submission_answers"
+    submission_id: Mapped[UUID] = mapped_column(
+        ForeignKey("submissions.id", ondelete="CASCADE"), primary_key=True
+    )
+    question_id: Mapped[UUID] = mapped_column(primary_key=True)
+    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete="CASCADE"), nullable=False)
+    normalized_value: Mapped[str] = mapped_column(Text, nullable=False)
+    is_correct: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    part_mask: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_submission_answers_question_value", "question_id", "normalized_value"),
+        Index("ix_submission_answers_test_submission", "test_id", "submission_id", "question_id"),
+    )
+
+
+class LeaderboardEntry(Base):
+    """Answer-free projection of a submission used to serve leaderboards."""
+
+    __tablename__ = "leaderboard_entries"
+    submission_id: Mapped[UUID] = mapped_column(
+        ForeignKey("submissions.id", ondelete="CASCADE"), primary_key=True
+    )
+    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[SubmissionStatus] = mapped_column(Enum(SubmissionStatus), nullable=False)
+    final_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    participant_full_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    participant_secondary: Mapped[str] = mapped_column(String(200), default="", nullable=False)
+    participant_attempt_value: Mapped[str] = mapped_column(String(200), nullable=False)
+    participant_fields_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_leaderboard_entries_test_status_score",
+            "test_id",
+            "status",
+            text("final_score DESC"),
+            "submitted_at",
+        ),
+    )
+
+
+class TestStats(Base):
+    __tablename__ = "test_stats"
+    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete="CASCADE"), primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    pending: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_submitted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class TestAnalytics(Base):
+    """Precomputed per-test analytics; read endpoints only ever load this row."""
+
+    __tablename__ = "test_analytics"
+    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete="CASCADE"), primary_key=True)
+    payload_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    source_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    source_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stale: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # ``tests.answer_key_version`` the test's ``submission_answers`` verdicts were last rescored against.
+    answer_key_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+
+
+class SubmissionDraftEvent(Base):
+    """Append-only autosave log; a draft is the fold of its events in id order."""
+
+    __tablename__ = "submission_draft_events"
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    draft_id: Mapped[UUID] = mapped_column(nullable=False)
+    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete="CASCADE"), nullable=False)
+    participant_fields_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    answers_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
+    )
+
+    __table_args__ = (Index("ix_submission_draft_events_draft_id", "draft_id", "id"),)
+
+
+class ParticipantAttempt(Base):
+    __tablename__ = "participant_attempts"
+    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete="CASCADE"), primary_key=True)
+    attempt_value: Mapped[str] = mapped_column(String(200), primary_key=True)
+    used: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
 
 class ManualGrade(Base):
     __tablename__ = "manual_grades"
@@ -240,6 +355,22 @@ class OutboxEvent(Base):
         DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
     )
 
+    __table_args__ = (
+        Index("ix_outbox_events_event_type_status_id", "event_type", "status", "id"),
+        Index(
+            "ix_outbox_events_ingest_submission_id",
+            text("(payload_json ->> 'submissionId')"),
+            postgresql_where=text("event_type = 'submission.ingest'"),
+        ),
+        Index(
+            "ix_outbox_events_ingest_idempotency_key",
+            text("(payload_json ->> 'idempotencyKey')"),
+            postgresql_where=text(
+                "event_type = 'submission.ingest' AND (payload_json ->> 'idempotencyKey') IS NOT NULL"
+            ),
+        ),
+    )
+
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.domain import TestAnalytics, TestStats
+
+
+class AnalyticsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, test_id: int) -> TestAnalytics | None:
+        res = await self.db.execute(
+            select(TestAnalytics)
+            .where(TestAnalytics.test_id == test_id)
+            .execution_options(populate_existing=True)
+        )
+        return res.scalar_one_or_none()
+
+    async def save(
+        self,
+        test_id: int,
+        payload: dict,
+        source_total: int,
+        source_completed: int,
+        computed_at: datetime,
+        stale: bool = False,
+        answer_key_version: int = 0,
+    ) -> None:
+        values = {
+            "payload_json": payload,
+            "source_total": source_total,
+            "source_completed": source_completed,
+            "stale": stale,
+            "computed_at": computed_at,
+            "answer_key_version": answer_key_version,
+        }
+        stmt = pg_insert(TestAnalytics).values(test_id=test_id, **values)
+        await self.db.execute(stmt.on_conflict_do_update(index_elements=[TestAnalytics.test_id], set_=values))
+
+    async def mark_stale(self, test_id: int) -> None:
+        await self.db.execute(
+            update(TestAnalytics)
+            .where(TestAnalytics.test_id == test_id)
+            .values(stale=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def stale_test_ids(self, limit: int) -> list[int]:
+        """Tests whose snapshot is missing, marked stale, or built from older submission counters."""
+        res = await self.db.execute(
+            select(TestStats.test_id)
+            .outerjoin(TestAnalytics, TestAnalytics.test_id == TestStats.test_id)
+            .where(
+                TestStats.total > 0,
+                or_(
+                    TestAnalytics.test_id.is_(None),
+                    TestAnalytics.stale,
+                    TestAnalytics.source_total != TestStats.total,
+                    TestAnalytics.source_completed != TestStats.completed,
+                ),
+            )
+            .order_by(TestStats.last_submitted_at.desc().nulls_last())
+            .limit(limit)
+        )
+        return list(res.scalars().all())
@@ -0,0 +1,73 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.domain import ParticipantAttempt
+
+BULK_CHUNK_SIZE = 5000
+
+
+def reserve_attempt_statement(test_id: int, attempt_value: str, limit: int):
+    stmt = pg_insert(ParticipantAttempt).values(test_id=test_id, attempt_value=attempt_value, used=1)
+    return stmt.on_conflict_do_update(
+        index_elements=[ParticipantAttempt.test_id, ParticipantAttempt.attempt_value],
+        set_={"used": ParticipantAttempt.used + 1},
+        where=ParticipantAttempt.used < limit,
+    ).returning(ParticipantAttempt.used)
+
+
+class AttemptRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def used(self, test_id: int, attempt_value: str) -> int:
+        res = await self.db.execute(
+            select(ParticipantAttempt.used).where(
+                ParticipantAttempt.test_id == test_id,
+                ParticipantAttempt.attempt_value == attempt_value,
+            )
+        )
+        return int(res.scalar() or 0)
+
+    async def reserve(self, test_id: int, attempt_value: str, limit: int) -> int | None:
+        """Atomically consume one attempt; returns the new count, or None once ``limit`` is reached.
+
+        The counter row stays locked until the surrounding transaction ends, so a rollback
+        (failed insert, rejected submit) gives the attempt back.
+        """
+        if limit < 1:
+            return None
+        res = await self.db.execute(reserve_attempt_statement(test_id, attempt_value, limit))
+        return res.scalar_one_or_none()
+
+    async def used_many(self, test_id: int, attempt_values: list[str]) -> dict[str, int]:
+        used: dict[str, int] = {}
+        for start in range(0, len(attempt_values), BULK_CHUNK_SIZE):
+            res = await self.db.execute(
+                select(ParticipantAttempt.attempt_value, ParticipantAttempt.used).where(
+                    ParticipantAttempt.test_id == test_id,
+                    ParticipantAttempt.attempt_value.in_(attempt_values[start : start + BULK_CHUNK_SIZE]),
+                )
+            )
+            used.update({value: int(count) for value, count in res.all()})
+        return used
+
+    async def reserve_many(self, test_id: int, counts: dict[str, int], limit: int) -> set[str]:
+        """Consume ``counts[value]`` attempts per value; returns the values whose reservation fit under ``limit``."""
+        items = list(counts.items())
+        reserved: set[str] = set()
+        for start in range(0, len(items), BULK_CHUNK_SIZE):
+            stmt = pg_insert(ParticipantAttempt).values(
+                [
+                    {"test_id": test_id, "attempt_value": value, "used": count}
+                    for value, count in items[start : start + BULK_CHUNK_SIZE]
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ParticipantAttempt.test_id, ParticipantAttempt.attempt_value],
+                set_={"used": ParticipantAttempt.used + stmt.excluded.used},
+                where=ParticipantAttempt.used + stmt.excluded.used <= limit,
+            ).returning(ParticipantAttempt.attempt_value)
+            res = await self.db.execute(stmt)
+            reserved.update(res.scalars().all())
+        return reserved
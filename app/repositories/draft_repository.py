@@ -0,0 +1,87 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.domain import SubmissionDraftEvent, Test
+
+
+def fold_draft_events(events) -> tuple[dict[str, str], dict[str, str | int | float]]:
+    """Replays ``(participant_fields_json, answers_json)`` deltas; a ``None`` answer clears the question."""
+    participant_values: dict[str, str] = {}
+    answers: dict[str, str | int | float] = {}
+    for participant_fields, delta in events:
+        if participant_fields is not None:
+            participant_values = participant_fields
+        for question_id, value in (delta or {}).items():
+            if value is None:
+                answers.pop(question_id, None)
+            else:
+                answers[question_id] = value
+    return participant_values, answers
+
+
+class DraftRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def append(
+        self,
+        test_id: int,
+        draft_id: UUID,
+        answers: dict,
+        participant_values: dict[str, str] | None = None,
+    ) -> None:
+        await self.db.execute(
+            insert(SubmissionDraftEvent).values(
+                draft_id=draft_id,
+                test_id=test_id,
+                participant_fields_json=participant_values,
+                answers_json=answers,
+            )
+        )
+
+    async def revision(self, test_id: int, draft_id: UUID) -> int:
+        """Answer saves so far; the creating event is not counted, as in the Redis backend."""
+        res = await self.db.execute(
+            select(func.count())
+            .select_from(SubmissionDraftEvent)
+            .where(SubmissionDraftEvent.draft_id == draft_id, SubmissionDraftEvent.test_id == test_id)
+        )
+        return max(res.scalar_one() - 1, 0)
+
+    async def exists(self, test_id: int, draft_id: UUID) -> bool:
+        res = await self.db.execute(
+            select(SubmissionDraftEvent.id)
+            .where(SubmissionDraftEvent.draft_id == draft_id, SubmissionDraftEvent.test_id == test_id)
+            .limit(1)
+        )
+        return res.scalar_one_or_none() is not None
+
+    async def events(self, test_id: int, draft_id: UUID) -> list[tuple[int, dict | None, dict]]:
+        res = await self.db.execute(
+            select(
+                SubmissionDraftEvent.id,
+                SubmissionDraftEvent.participant_fields_json,
+                SubmissionDraftEvent.answers_json,
+            )
+            .where(SubmissionDraftEvent.draft_id == draft_id, SubmissionDraftEvent.test_id == test_id)
+            .order_by(SubmissionDraftEvent.id)
+        )
+        return [tuple(row) for row in res.all()]
+
+    async def delete(self, test_id: int, draft_id: UUID) -> None:
+        await self.db.execute(
+            delete(SubmissionDraftEvent).where(
+                SubmissionDraftEvent.draft_id == draft_id, SubmissionDraftEvent.test_id == test_id
+            )
+        )
+
+    async def purge_ended(self, ended_before: datetime) -> int:
+        res = await self.db.execute(
+            delete(SubmissionDraftEvent).where(
+                SubmissionDraftEvent.test_id.in_(select(Test.id).where(Test.end_time < ended_before))
+            )
+        )
+        return res.rowcount or 0
@@ -0,0 +1,105 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import SubmissionStatus
+from app.models.domain import LeaderboardEntry, Submission
+
+ENTRY_COLUMNS = (
+    "test_id",
+    "status",
+    "final_score",
+    "submitted_at",
+    "participant_full_name",
+    "participant_secondary",
+    "participant_attempt_value",
+    "participant_fields_json",
+)
+
+
+def entry_values(submission: dict) -> dict:
+    return {"submission_id": submission["id"], **{name: submission[name] for name in ENTRY_COLUMNS}}
+
+
+class LeaderboardRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, submissions: list[dict]) -> None:
+        if not submissions:
+            return
+        stmt = pg_insert(LeaderboardEntry.__table__).on_conflict_do_nothing(
+            index_elements=[LeaderboardEntry.submission_id]
+        )
+        await self.db.execute(stmt, [entry_values(row) for row in submissions])
+
+    async def sync(self, test_id: int, submission_ids: list[UUID] | None = None) -> None:
+        """Copy status and score from ``submissions`` for a test (or some of its rows)."""
+        source = select(Submission.id, *(getattr(Submission, name) for name in ENTRY_COLUMNS)).where(
+            Submission.test_id == test_id
+        )
+        if submission_ids is not None:
+            if not submission_ids:
+                return
+            source = source.where(Submission.id.in_(submission_ids))
+        stmt = pg_insert(LeaderboardEntry).from_select(["submission_id", *ENTRY_COLUMNS], source)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[LeaderboardEntry.submission_id],
+                set_={"status": stmt.excluded.status, "final_score": stmt.excluded.final_score},
+            )
+        )
+
+    async def ranked(
+        self,
+        test_id: int,
+        limit: int | None = None,
+        after: tuple[float, datetime, UUID] | None = None,
+    ) -> list[LeaderboardEntry]:
+        """Keyset page ordered by ``final_score DESC, submitted_at, submission_id``."""
+        query = select(LeaderboardEntry).where(
+            LeaderboardEntry.test_id == test_id,
+            LeaderboardEntry.status == SubmissionStatus.COMPLETED,
+            LeaderboardEntry.final_score.is_not(None),
+        )
+        if after is not None:
+            score, submitted_at, submission_id = after
+            query = query.where(
+                or_(
+                    LeaderboardEntry.final_score < score,
+                    and_(
+                        LeaderboardEntry.final_score == score,
+                        tuple_(LeaderboardEntry.submitted_at, LeaderboardEntry.submission_id)
+                        > (submitted_at, submission_id),
+                    ),
+                )
+            )
+        query = query.order_by(
+            LeaderboardEntry.final_score.desc(),
+            LeaderboardEntry.submitted_at,
+            LeaderboardEntry.submission_id,
+        ).limit(limit)
+        res = await self.db.execute(query)
+        return list(res.scalars().all())
+
+    async def pending(
+        self,
+        test_id: int,
+        limit: int | None = None,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> list[LeaderboardEntry]:
+        """Newest-first keyset page over ``(submitted_at, submission_id)``."""
+        query = select(LeaderboardEntry).where(
+            LeaderboardEntry.test_id == test_id,
+            LeaderboardEntry.status == SubmissionStatus.PENDING_REVIEW,
+        )
+        if before is not None:
+            query = query.where(tuple_(LeaderboardEntry.submitted_at, LeaderboardEntry.submission_id) < before)
+        query = query.order_by(
+            LeaderboardEntry.submitted_at.desc(), LeaderboardEntry.submission_id.desc()
+        ).limit(limit)
+        res = await self.db.execute(query)
+        return list(res.scalars().all())
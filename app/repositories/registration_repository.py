@@ -19,6 +19,18 @@ class RegistrationRepository:
         )
         return res.scalar_one_or_none()
 
+    async def registered_phones(self, test_id: int, phones: list[str]) -> set[str]:
+        registered: set[str] = set()
+        for start in range(0, len(phones), 5000):
+            res = await self.db.execute(
+                select(TestRegistration.phone_e164).where(
+                    TestRegistration.test_id == test_id,
+                    TestRegistration.phone_e164.in_(phones[start : start + 5000]),
+                )
+            )
+            registered.update(res.scalars().all())
+        return registered
+
     async def upsert_registration(
         self,
         test_id: int,
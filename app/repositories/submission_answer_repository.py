@@ -0,0 +1,94 @@
+from functools import lru_cache
+from uuid import UUID
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import SubmissionStatus
+from app.models.domain import Submission, SubmissionAnswer
+
+
+@lru_cache(maxsize=4096)
+def _question_uuid(question_id: str) -> UUID:
+    return UUID(question_id)
+
+
+def answer_rows(submission_id: UUID, test_id: int, scores: list) -> list[dict]:
+    """Column values for the ``AnswerScore`` tuples produced by ``score_answers``."""
+    return [
+        {
+            "submission_id": submission_id,
+            "question_id": _question_uuid(score.question_id),
+            "test_id": test_id,
+            "normalized_value": score.normalized_value,
+            "is_correct": score.is_correct,
+            "score": score.score,
+            "part_mask": score.part_mask,
+        }
+        for score in scores
+    ]
+
+
+class SubmissionAnswerRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        stmt = pg_insert(SubmissionAnswer.__table__).on_conflict_do_nothing(
+            index_elements=[SubmissionAnswer.submission_id, SubmissionAnswer.question_id]
+        )
+        # executemany: SQLAlchemy batches the rows (insertmanyvalues) under the bind-parameter limit.
+        await self.db.execute(stmt, rows)
+
+    async def replace(self, rows: list[dict]) -> None:
+        """Upsert rows, overwriting the verdicts of answers scored against an older answer key."""
+        if not rows:
+            return
+        stmt = pg_insert(SubmissionAnswer.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SubmissionAnswer.submission_id, SubmissionAnswer.question_id],
+            set_={
+                name: stmt.excluded[name]
+                for name in ("test_id", "normalized_value", "is_correct", "score", "part_mask")
+            },
+        )
+        await self.db.execute(stmt, rows)
+
+    async def value_counts(
+        self, test_id: int, question_ids: list[str], status: SubmissionStatus | None = None
+    ) -> dict[str, dict[str, int]]:
+        if not question_ids:
+            return {}
+        query = (
+            select(SubmissionAnswer.question_id, SubmissionAnswer.normalized_value, func.count())
+            .where(
+                SubmissionAnswer.test_id == test_id,
+                SubmissionAnswer.question_id.in_([UUID(question_id) for question_id in question_ids]),
+            )
+            .group_by(SubmissionAnswer.question_id, SubmissionAnswer.normalized_value)
+        )
+        if status is not None:
+            query = query.join(Submission, Submission.id == SubmissionAnswer.submission_id).where(
+                Submission.status == status
+            )
+        res = await self.db.execute(query)
+        counts: dict[str, dict[str, int]] = {}
+        for question_id, value, count in res.all():
+            counts.setdefault(str(question_id), {})[value] = int(count)
+        return counts
+
+    async def correct_counts(self, test_id: int) -> dict[str, tuple[int, int]]:
+        """Per question: answers with the first part (or the whole answer) correct, and with the second part correct."""
+        res = await self.db.execute(
+            select(
+                SubmissionAnswer.question_id,
+                func.count(case((SubmissionAnswer.part_mask.op("&")(1) == 1, 1))),
+                func.count(case((SubmissionAnswer.part_mask.op("&")(2) == 2, 1))),
+            )
+            .where(SubmissionAnswer.test_id == test_id)
+            .group_by(SubmissionAnswer.question_id)
+        )
+        return {str(question_id): (int(first), int(second)) for question_id, first, second in res.all()}
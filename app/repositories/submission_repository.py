@@ -1,10 +1,93 @@
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import JSON, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 
-from app.models.domain import Submission
+from app.core.constants import ANSWERS_SCHEMA_VERSION, QuestionType, SubmissionStatus
+from app.models.domain import ManualGrade, Question, Submission, SubmissionAnswer
+
+UPSERT_CHUNK_SIZE = 5000
+MANUAL_QUESTION_TYPES = (QuestionType.ESSAY, QuestionType.SHORT_ANSWER)
+EXPORT_COLUMNS = (
+    Submission.id,
+    Submission.participant_full_name,
+    Submission.participant_secondary,
+    Submission.participant_attempt_value,
+    Submission.participant_fields_json,
+    Submission.status,
+    Submission.auto_score,
+    Submission.auto_max_score,
+    Submission.final_score,
+    Submission.submitted_at,
+    Submission.answers_json,
+    Submission.answers_schema_version,
+)
+GRADING_COLUMNS = (
+    Submission.id,
+    Submission.test_id,
+    Submission.answers_json,
+    Submission.answers_schema_version,
+    Submission.auto_score,
+    Submission.auto_max_score,
+    Submission.final_score,
+    Submission.status,
+    Submission.submitted_at,
+    Submission.reviewed_at,
+    Submission.review_by,
+)
+
+
+def finalize_classic_statement(
+    test_id: int,
+    reviewer_id: UUID,
+    reviewed_at: datetime,
+    submission_ids: list[UUID] | None = None,
+    required_manual_count: int | None = None,
+):
+    """Set final_score = auto_score + clamped manual grades in one UPDATE.
+
+    Without ``submission_ids`` only pending submissions are finalized, so earlier
+    finalizations (and their overrides) are left alone; with
+    ``required_manual_count`` only those that have that many manual grades.
+    """
+    graded = (
+        select(ManualGrade)
+        .join(Question, Question.id == ManualGrade.question_id)
+        .where(
+            ManualGrade.submission_id == Submission.id,
+            Question.test_id == test_id,
+            Question.q_type.in_(MANUAL_QUESTION_TYPES),
+        )
+    )
+    manual_total = graded.with_only_columns(
+        func.coalesce(
+            func.sum(func.least(func.greatest(ManualGrade.score, 0.0), func.greatest(Question.points, 1.0))),
+            0.0,
+        )
+    ).scalar_subquery()
+
+    stmt = update(Submission).where(Submission.test_id == test_id)
+    if submission_ids is not None:
+        stmt = stmt.where(Submission.id.in_(submission_ids))
+    if submission_ids is None or required_manual_count is not None:
+        stmt = stmt.where(Submission.status == SubmissionStatus.PENDING_REVIEW)
+    if required_manual_count is not None:
+        graded_count = graded.with_only_columns(func.count(ManualGrade.id)).scalar_subquery()
+        stmt = stmt.where(graded_count >= required_manual_count)
+    return (
+        stmt.values(
+            final_score=Submission.auto_score + manual_total,
+            status=SubmissionStatus.COMPLETED,
+            reviewed_at=reviewed_at,
+            review_by=reviewer_id,
+        )
+        .returning(Submission.id)
+        .execution_options(synchronize_session=False)
+    )
 
 
 class SubmissionRepository:
@@ -16,6 +99,37 @@ class SubmissionRepository:
         await self.db.flush()
         return row
 
+    async def insert_idempotent(self, values: dict) -> Submission | None:
+        """Insert a submission; returns None if ``idempotency_key`` already exists for the test."""
+        stmt = pg_insert(Submission).values(**values)
+        if values.get("idempotency_key"):
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=[Submission.test_id, Submission.idempotency_key],
+                index_where=Submission.idempotency_key.is_not(None),
+            )
+        res = await self.db.scalars(stmt.returning(Submission))
+        return res.one_or_none()
+
+    async def insert_many_idempotent(self, rows: list[dict]) -> list[Row]:
+        """Multi-row insert; rows whose ``idempotency_key`` already exists for the test are dropped.
+
+        Returns ``(id, test_id, status)`` for the rows actually inserted.
+        """
+        stmt = pg_insert(Submission).on_conflict_do_nothing(
+            index_elements=[Submission.test_id, Submission.idempotency_key],
+            index_where=Submission.idempotency_key.is_not(None),
+        )
+        res = await self.db.execute(stmt.returning(Submission.id, Submission.test_id, Submission.status), rows)
+        return list(res.all())
+
+    async def get_by_idempotency_key(self, test_id: int, idempotency_key: str) -> Submission | None:
+        res = await self.db.execute(
+            select(Submission).where(
+                Submission.test_id == test_id, Submission.idempotency_key == idempotency_key
+            )
+        )
+        return res.scalar_one_or_none()
+
     async def get(self, submission_id: UUID) -> Submission | None:
         res = await self.db.execute(
             select(Submission)
@@ -24,22 +138,113 @@ class SubmissionRepository:
         )
         return res.scalar_one_or_none()
 
-    async def list_for_test(self, test_id: int, include_manual_grades: bool = True) -> list[Submission]:
-        query = select(Submission).where(Submission.test_id == test_id).order_by(Submission.submitted_at.desc())
+    async def list_for_grading(self, test_id: int, include_manual_grades: bool = True) -> list[Submission]:
+        """Entities with answers and scoring columns only; participant fields stay unloaded."""
+        query = (
+            select(Submission)
+            .where(Submission.test_id == test_id)
+            .order_by(Submission.submitted_at.desc())
+            .options(load_only(*GRADING_COLUMNS))
+        )
         if include_manual_grades:
             query = query.options(selectinload(Submission.manual_grades))
         res = await self.db.execute(query)
         return list(res.scalars().all())
 
-    async def count_for_attempt_value(self, test_id: int, participant_attempt_value: str) -> int:
+    async def page_for_test(
+        self,
+        test_id: int,
+        limit: int,
+        status: SubmissionStatus | None = None,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> list[Submission]:
+        """Newest-first keyset page over ``(submitted_at, id)``."""
+        query = select(Submission).where(Submission.test_id == test_id)
+        if status is not None:
+            query = query.where(Submission.status == status)
+        if before is not None:
+            query = query.where(tuple_(Submission.submitted_at, Submission.id) < before)
+        query = (
+            query.order_by(Submission.submitted_at.desc(), Submission.id.desc())
+            .limit(limit)
+            .options(selectinload(Submission.manual_grades))
+        )
+        res = await self.db.execute(query)
+        return list(res.scalars().all())
+
+    async def answers_after(
+        self, after: UUID | None, limit: int, legacy_only: bool = False, test_id: int | None = None
+    ) -> list[Row]:
+        """``(id, test_id, answers_json, answers_schema_version)`` rows in id order, for batch jobs."""
+        query = select(Submission.id, Submission.test_id, Submission.answers_json, Submission.answers_schema_version)
+        if test_id is not None:
+            query = query.where(Submission.test_id == test_id)
+        if after is not None:
+            query = query.where(Submission.id > after)
+        if legacy_only:
+            query = query.where(Submission.answers_schema_version < ANSWERS_SCHEMA_VERSION)
+        res = await self.db.execute(query.order_by(Submission.id).limit(limit))
+        return list(res.all())
+
+    async def store_canonical_answers(self, answers_by_id: dict[UUID, dict]) -> None:
+        """Rewrite ``answers_json`` at the current schema version (one executemany by primary key)."""
+        if not answers_by_id:
+            return
+        await self.db.execute(
+            update(Submission),
+            [
+                {"id": submission_id, "answers_json": answers, "answers_schema_version": ANSWERS_SCHEMA_VERSION}
+                for submission_id, answers in answers_by_id.items()
+            ],
+        )
+
+    async def stream_for_export(self, test_id: int, batch_size: int) -> AsyncResult:
+        """Server-side cursor over export rows, oldest first, with per-question verdicts as ``verdicts``."""
+        verdicts = (
+            select(func.json_object_agg(SubmissionAnswer.question_id, SubmissionAnswer.is_correct, type_=JSON))
+            .where(SubmissionAnswer.submission_id == Submission.id)
+            .scalar_subquery()
+        )
+        query = (
+            select(*EXPORT_COLUMNS, verdicts.label("verdicts"))
+            .where(Submission.test_id == test_id)
+            .order_by(Submission.submitted_at, Submission.id)
+            .execution_options(yield_per=batch_size)
+        )
+        return await self.db.stream(query)
+
+    async def existing_ids_for_test(self, test_id: int, submission_ids: list[UUID]) -> set[UUID]:
+        if not submission_ids:
+            return set()
         res = await self.db.execute(
-            select(func.count(Submission.id)).where(
-                Submission.test_id == test_id,
-                Submission.participant_attempt_value == participant_attempt_value,
-            )
+            select(Submission.id).where(Submission.test_id == test_id, Submission.id.in_(submission_ids))
         )
-        return int(res.scalar() or 0)
+        return set(res.scalars().all())
 
-    async def count_for_test(self, test_id: int) -> int:
-        res = await self.db.execute(select(func.count(Submission.id)).where(Submission.test_id == test_id))
-        return int(res.scalar() or 0)
+    async def upsert_manual_grades(self, rows: list[dict]) -> int:
+        # One statement per chunk keeps bind parameters under the PostgreSQL limit (32767).
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = pg_insert(ManualGrade).values(rows[start : start + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ManualGrade.submission_id, ManualGrade.question_id],
+                set_={
+                    "score": stmt.excluded.score,
+                    "grader_id": stmt.excluded.grader_id,
+                    "graded_at": stmt.excluded.graded_at,
+                },
+            )
+            await self.db.execute(stmt)
+        return len(rows)
+
+    async def finalize_classic(
+        self,
+        test_id: int,
+        reviewer_id: UUID,
+        reviewed_at: datetime,
+        submission_ids: list[UUID] | None = None,
+        required_manual_count: int | None = None,
+    ) -> list[UUID]:
+        res = await self.db.execute(
+            finalize_classic_statement(test_id, reviewer_id, reviewed_at, submission_ids, required_manual_count)
+        )
+        return list(res.scalars().all())
@@ -1,11 +1,10 @@
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.constants import SubmissionStatus
-from app.models.domain import Question, Submission, Test
+from app.models.domain import Question, Test, TestStats
 
 
 class TestRepository:
@@ -28,6 +27,7 @@ class TestRepository:
         return int(res.scalar() or 0)
 
     async def get_by_id(self, test_id: int) -> Test | None:
+        # Long-lived worker sessions keep earlier rows in the identity map; always read the current ones.
         res = await self.db.execute(
             select(Test)
             .where(Test.id == test_id)
@@ -35,9 +35,30 @@ class TestRepository:
                 selectinload(Test.questions).selectinload(Question.options),
                 selectinload(Test.participant_fields),
             )
+            .execution_options(populate_existing=True)
         )
         return res.scalar_one_or_none()
 
+    async def version(self, test_id: int, lock: bool = False) -> int | None:
+        """``lock`` waits out an in-flight edit and blocks new ones until the caller commits."""
+        query = select(Test.version).where(Test.id == test_id)
+        if lock:
+            query = query.with_for_update(read=True)
+        res = await self.db.execute(query)
+        return res.scalar_one_or_none()
+
+    async def bump_version(self, test_id: int, answer_key_changed: bool = False) -> None:
+        """Retire compiled snapshots of the test; commits with the edit it belongs to.
+
+        ``answer_key_changed`` also bumps ``answer_key_version`` so stored answer verdicts get rescored.
+        """
+        values = {"version": Test.version + 1}
+        if answer_key_changed:
+            values["answer_key_version"] = Test.answer_key_version + 1
+        await self.db.execute(
+            update(Test).where(Test.id == test_id).values(**values).execution_options(synchronize_session=False)
+        )
+
     async def add(self, row: Test) -> Test:
         self.db.add(row)
         await self.db.flush()
@@ -59,24 +80,8 @@ class TestRepository:
     async def submission_stats_bulk(self, test_ids: list[int]) -> dict[int, tuple[int, int]]:
         if not test_ids:
             return {}
-
-        total_res = await self.db.execute(
-            select(Submission.test_id, func.count(Submission.id))
-            .where(Submission.test_id.in_(test_ids))
-            .group_by(Submission.test_id)
-        )
-        pending_res = await self.db.execute(
-            select(Submission.test_id, func.count(Submission.id))
-            .where(
-                Submission.test_id.in_(test_ids),
-                Submission.status == SubmissionStatus.PENDING_REVIEW,
-            )
-            .group_by(Submission.test_id)
+        res = await self.db.execute(
+            select(TestStats.test_id, TestStats.total, TestStats.pending).where(TestStats.test_id.in_(test_ids))
         )
-
-        totals = {int(test_id): int(count) for test_id, count in total_res.all()}
-        pendings = {int(test_id): int(count) for test_id, count in pending_res.all()}
-        return {
-            test_id: (totals.get(test_id, 0), pendings.get(test_id, 0))
-            for test_id in test_ids
-        }
+        stats = {int(test_id): (int(total), int(pending)) for test_id, total, pending in res.all()}
+        return {test_id: stats.get(test_id, (0, 0)) for test_id in test_ids}
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import SubmissionStatus
+from app.models.domain import Submission, TestStats
+
+
+def record_stats_statement(
+    test_id: int,
+    total: int = 0,
+    pending: int = 0,
+    completed: int = 0,
+    submitted_at: datetime | None = None,
+    limit: int | None = None,
+):
+    stmt = pg_insert(TestStats).values(
+        test_id=test_id,
+        total=total,
+        pending=pending,
+        completed=completed,
+        last_submitted_at=submitted_at,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[TestStats.test_id],
+        set_={
+            "total": TestStats.total + stmt.excluded.total,
+            "pending": TestStats.pending + stmt.excluded.pending,
+            "completed": TestStats.completed + stmt.excluded.completed,
+            "last_submitted_at": func.greatest(TestStats.last_submitted_at, stmt.excluded.last_submitted_at),
+        },
+        where=(TestStats.total + total <= limit) if limit is not None else None,
+    ).returning(TestStats.total)
+
+
+class TestStatsRepository:
+    """Per-test submission counters kept in step with ``submissions`` inside the same transaction."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, test_id: int) -> TestStats | None:
+        # Counters are changed with Core statements, so always refresh the identity map copy.
+        res = await self.db.execute(
+            select(TestStats).where(TestStats.test_id == test_id).execution_options(populate_existing=True)
+        )
+        return res.scalar_one_or_none()
+
+    async def record(
+        self,
+        test_id: int,
+        total: int = 0,
+        pending: int = 0,
+        completed: int = 0,
+        submitted_at: datetime | None = None,
+        limit: int | None = None,
+    ) -> bool:
+        """Apply counter deltas; returns False (and changes nothing) if ``total`` would exceed ``limit``."""
+        res = await self.db.execute(
+            record_stats_statement(test_id, total, pending, completed, submitted_at, limit)
+        )
+        return res.scalar_one_or_none() is not None
+
+    async def mark_completed(self, test_id: int, count: int = 1) -> None:
+        if count:
+            await self.record(test_id, pending=-count, completed=count)
+
+    async def recount(self, test_id: int) -> None:
+        """Rebuild the counters from ``submissions`` after mass status changes."""
+        res = await self.db.execute(
+            select(
+                func.count(Submission.id),
+                func.count(case((Submission.status == SubmissionStatus.PENDING_REVIEW, 1))),
+                func.count(case((Submission.status == SubmissionStatus.COMPLETED, 1))),
+                func.max(Submission.submitted_at),
+            ).where(Submission.test_id == test_id)
+        )
+        total, pending, completed, last_submitted_at = res.one()
+        stmt = pg_insert(TestStats).values(
+            test_id=test_id,
+            total=total,
+            pending=pending,
+            completed=completed,
+            last_submitted_at=last_submitted_at,
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TestStats.test_id],
+                set_={
+                    "total": stmt.excluded.total,
+                    "pending": stmt.excluded.pending,
+                    "completed": stmt.excluded.completed,
+                    "last_submitted_at": stmt.excluded.last_submitted_at,
+                },
+            )
+        )
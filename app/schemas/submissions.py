@@ -1,12 +1,49 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+# Grade rows one bulk request may write (submissions x questions across all items).
+MAX_BULK_GRADE_ROWS = 50_000
 
 
 class SubmissionCreateRequest(BaseModel):
-    participant_values: dict[str, str]
+    participant_values: dict[str, str] = Field(default_factory=dict)
+    answers: dict[str, str | int | float] = Field(default_factory=dict)
+    # Answers saved in this draft are merged under ``answers``; the draft is sealed on success.
+    draft_id: UUID | None = None
+
+    @model_validator(mode="after")
+    def require_values_without_draft(self) -> "SubmissionCreateRequest":
+        # Only a draft can stand in for the participant values and answers.
+        if self.draft_id is None:
+            missing = [name for name in ("participant_values", "answers") if name not in self.model_fields_set]
+            if missing:
+                raise ValueError(f"{', '.join(missing)} required without draft_id")
+        return self
+
+
+class DraftCreateRequest(BaseModel):
+    participant_values: dict[str, str] = Field(default_factory=dict)
+
+
+class DraftPatchRequest(BaseModel):
+    answers: dict[str, str | int | float | None]
+
+
+class DraftSavedOut(BaseModel):
+    id: UUID
+    testId: int
+    revision: int
+    savedAt: datetime
+
+
+class DraftOut(BaseModel):
+    id: UUID
+    testId: int
+    participantValues: dict[str, str]
     answers: dict[str, str | int | float]
+    revision: int
 
 
 class SubmissionParticipantOut(BaseModel):
@@ -30,14 +67,79 @@ class SubmissionOut(BaseModel):
     reviewedAt: datetime | None
 
 
+class SubmissionQueuedOut(BaseModel):
+    id: UUID
+    testId: int
+    status: str
+    submittedAt: datetime
+
+
+class SubmissionIngestStatusOut(BaseModel):
+    id: UUID
+    testId: int
+    # queued | failed | stored | duplicate (dropped; ``duplicateOf`` is the submission kept under its key)
+    status: str
+    duplicateOf: UUID | None = None
+    submission: SubmissionOut | None = None
+
+
 class ManualGradesPatchRequest(BaseModel):
     grades: dict[str, float] = Field(default_factory=dict)
 
 
+class BulkManualGradeItem(BaseModel):
+    submissionIds: list[UUID] = Field(min_length=1, max_length=10000)
+    grades: dict[str, float] = Field(default_factory=dict)
+
+
+class BulkManualGradesRequest(BaseModel):
+    items: list[BulkManualGradeItem] = Field(min_length=1, max_length=5000)
+
+    @model_validator(mode="after")
+    def limit_total_rows(self) -> "BulkManualGradesRequest":
+        total = sum(len(item.submissionIds) * len(item.grades) for item in self.items)
+        if total > MAX_BULK_GRADE_ROWS:
+            raise ValueError(f"At most {MAX_BULK_GRADE_ROWS} grades per request")
+        return self
+
+
+class BulkManualGradesOut(BaseModel):
+    updatedCount: int
+    submissionIds: list[UUID]
+
+
+class AnswerVariantOut(BaseModel):
+    text: str
+    count: int
+
+
+class AnswerClusterOut(BaseModel):
+    representative: str
+    size: int
+    submissionIds: list[UUID]
+    variants: list[AnswerVariantOut]
+    gradedCount: int
+
+
+class AnswerClustersResponse(BaseModel):
+    questionId: str
+    totalAnswers: int
+    clusters: list[AnswerClusterOut]
+
+
 class FinalizeRequest(BaseModel):
     final_score_override: float | None = None
 
 
+class BulkFinalizeRequest(BaseModel):
+    submissionIds: list[UUID] = Field(min_length=1, max_length=10000)
+
+
+class BulkFinalizeOut(BaseModel):
+    finalizedCount: int
+    submissionIds: list[UUID]
+
+
 class LeaderboardItem(BaseModel):
     id: UUID
     participant: SubmissionParticipantOut
@@ -68,6 +170,7 @@ class RaschStatsOut(BaseModel):
     easiestQuestion: RaschQuestionStat | None = None
     hardestQuestion: RaschQuestionStat | None = None
     questionStats: list[RaschQuestionStat] = Field(default_factory=list)
+    computedAt: datetime | None = None
 
 
 class LeaderboardResponse(BaseModel):
@@ -75,3 +178,16 @@ class LeaderboardResponse(BaseModel):
     pending: list[PendingItem]
     stats: dict[str, int]
     raschStats: RaschStatsOut | None = None
+    nextRankedCursor: str | None = None
+    nextPendingCursor: str | None = None
+
+
+class SubmissionImportError(BaseModel):
+    line: int
+    error: str
+
+
+class SubmissionImportOut(BaseModel):
+    importedCount: int
+    errorCount: int
+    errors: list[SubmissionImportError] = Field(default_factory=list)
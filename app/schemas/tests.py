@@ -123,3 +123,6 @@ class AttemptValidateOut(BaseModel):
     used_attempts: int
     max_attempts: int
     reason: str | None = None
+    session_token: str | None = None
+    started_at: datetime | None = None
+    deadline: datetime | None = None
@@ -0,0 +1,242 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+import structlog
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import QuestionType, ScoringType, SubmissionStatus
+from app.models.domain import TestAnalytics
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.repositories.submission_answer_repository import SubmissionAnswerRepository, answer_rows
+from app.repositories.submission_repository import SubmissionRepository
+from app.repositories.test_repository import TestRepository
+from app.repositories.test_stats_repository import TestStatsRepository
+from app.services.compiled_test import CompiledTest, compile_test
+from app.services.rasch_service import RaschItemStat
+from app.services.scoring_service import CohortGrader, score_answers, stored_answers
+from app.services.test_service import TestService
+
+logger = structlog.get_logger()
+
+TWO_PART_TYPES = {QuestionType.TWO_PART_WRITTEN, QuestionType.TWO_PART_MATH}
+OBJECTIVE_TYPES = {
+    QuestionType.MULTIPLE_CHOICE,
+    QuestionType.TRUE_FALSE,
+    QuestionType.TWO_PART_WRITTEN,
+    QuestionType.TWO_PART_MATH,
+}
+RESCORE_BATCH_SIZE = 1000
+
+
+def question_distributions(
+    test: CompiledTest, counts: dict[str, dict[str, int]], total: int
+) -> list[dict]:
+    """Option distributions per question; ``counts`` maps question id to normalized value counts."""
+    output = []
+    for question in test.questions:
+        options_data = {}
+        if question.q_type == QuestionType.MULTIPLE_CHOICE:
+            question_counts = counts.get(str(question.id), {})
+            for option in question.options:
+                idx = option.option_index
+                count = question_counts.get(str(idx), 0)
+                options_data[str(idx)] = {
+                    "index": idx,
+                    "html": option.option_html,
+                    "count": count,
+                    "percentage": (count / total * 100) if total else 0,
+                }
+        output.append(
+            {
+                "questionId": str(question.id),
+                "type": question.q_type.value,
+                "content": question.content_html,
+                "sortOrder": question.sort_order,
+                "points": question.points,
+                "options": options_data,
+                "totalResponses": total,
+            }
+        )
+    return output
+
+
+def rasch_stats(test: CompiledTest, total: int, correct_counts: dict[str, tuple[int, int]]) -> dict | None:
+    """``correct_counts`` maps question id to (correct, second part correct) counts."""
+    if test.scoring_type != ScoringType.RASCH or not total:
+        return None
+
+    objective_questions = [q for q in test.questions if q.q_type in OBJECTIVE_TYPES]
+    if not objective_questions:
+        return None
+
+    item_counts: list[tuple[str, int]] = []
+    for q in objective_questions:
+        first, second = correct_counts.get(str(q.id), (0, 0))
+        if q.q_type in TWO_PART_TYPES:
+            item_counts.append((f"{q.id}:first", first))
+            item_counts.append((f"{q.id}:second", second))
+        else:
+            item_counts.append((str(q.id), first))
+    item_stats = [
+        RaschItemStat(
+            item_id=item_id,
+            correct_count=correct,
+            incorrect_count=max(total - correct, 0),
+            total_count=max(total, correct),
+            accuracy=(correct / max(total, correct)) if total else 0.0,
+        )
+        for item_id, correct in item_counts
+    ]
+    item_stat_map = {stat.item_id: stat for stat in item_stats}
+
+    question_stats: list[dict] = []
+    for q in objective_questions:
+        if q.q_type in TWO_PART_TYPES:
+            related_ids = [f"{q.id}:first", f"{q.id}:second"]
+        else:
+            related_ids = [str(q.id)]
+        related_stats = [item_stat_map[item_id] for item_id in related_ids if item_id in item_stat_map]
+        if not related_stats:
+            continue
+        correct_count = sum(item.correct_count for item in related_stats)
+        incorrect_count = sum(item.incorrect_count for item in related_stats)
+        total_count = sum(item.total_count for item in related_stats)
+        accuracy = (correct_count / total_count) if total_count > 0 else 0.0
+        question_stats.append(
+            {
+                "questionId": str(q.id),
+                "label": f"{q.sort_order + 1}-savol",
+                "contentPreview": question_preview(q.content_html),
+                "correctCount": correct_count,
+                "incorrectCount": incorrect_count,
+                "totalCount": total_count,
+                "accuracy": round(accuracy, 4),
+                "itemCount": len(related_stats),
+            }
+        )
+
+    if not question_stats:
+        return None
+
+    ordered = sorted(
+        question_stats,
+        key=lambda item: (-float(item["accuracy"]), -int(item["correctCount"]), item["label"]),
+    )
+    reverse_ordered = sorted(
+        question_stats,
+        key=lambda item: (float(item["accuracy"]), -int(item["incorrectCount"]), item["label"]),
+    )
+
+    return {
+        "totalSubmissions": total,
+        "easiestQuestion": ordered[0],
+        "hardestQuestion": reverse_ordered[0],
+        "questionStats": question_stats,
+    }
+
+
+def question_preview(html: str, limit: int = 140) -> str:
+    text = " ".join(str(html or "").replace("<", " <").replace(">", "> ").split())
+    cleaned = []
+    inside_tag = False
+    for ch in text:
+        if ch == "<":
+            inside_tag = True
+            continue
+        if ch == ">":
+            inside_tag = False
+            cleaned.append(" ")
+            continue
+        if not inside_tag:
+            cleaned.append(ch)
+    plain = " ".join("".join(cleaned).split())
+    if len(plain) <= limit:
+        return plain
+    return f"{plain[: max(limit - 1, 0)].rstrip()}…"
+
+
+class AnalyticsService:
+    """Builds the per-test analytics snapshot served by the leaderboard and stats endpoints.
+
+    Snapshots are rebuilt by the ``analytics_rebuild`` task when the submission
+    counters they were built from move or the test is edited. An edit to the
+    answer key also rescores the test's ``submission_answers`` first.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = AnalyticsRepository(db)
+        self.answers_repo = SubmissionAnswerRepository(db)
+        self.submissions = SubmissionRepository(db)
+        self.stats = TestStatsRepository(db)
+        self.tests = TestRepository(db)
+        self.test_service = TestService(db)
+
+    async def snapshot(self, test_id: int) -> TestAnalytics | None:
+        return await self.repo.get(test_id)
+
+    async def build(self, test: CompiledTest) -> tuple[dict, int, int]:
+        stats = await self.stats.get(test.id)
+        total = stats.total if stats else 0
+        completed = stats.completed if stats else 0
+        choice_ids = [str(q.id) for q in test.questions if q.q_type == QuestionType.MULTIPLE_CHOICE]
+        counts = await self.answers_repo.value_counts(test.id, choice_ids, status=SubmissionStatus.COMPLETED)
+        payload = {"questions": question_distributions(test, counts, completed), "raschStats": None}
+        if test.scoring_type == ScoringType.RASCH and total:
+            payload["raschStats"] = rasch_stats(test, total, await self.answers_repo.correct_counts(test.id))
+        return payload, total, completed
+
+    async def rebuild(self, test_id: int) -> bool:
+        # A fresh load rather than the compiled-test cache, which may lag the edit that marked this stale.
+        try:
+            row = await self.test_service.get_test_or_404(test_id)
+        except HTTPException:
+            return False
+        test = compile_test(row, row.version)
+        snapshot = await self.repo.get(test_id)
+        if (snapshot.answer_key_version if snapshot else 0) != row.answer_key_version:
+            await self.rescore_answers(test)
+        payload, total, completed = await self.build(test)
+        # Only clear ``stale`` if no edit landed while the snapshot was being built.
+        current_version = await self.tests.version(test_id, lock=True)
+        await self.repo.save(
+            test_id,
+            payload,
+            total,
+            completed,
+            datetime.now(UTC),
+            stale=current_version != row.version,
+            answer_key_version=row.answer_key_version,
+        )
+        await self.db.commit()
+        return True
+
+    async def rescore_answers(self, test: CompiledTest, batch_size: int = RESCORE_BATCH_SIZE) -> int:
+        """Recompute ``submission_answers`` verdicts, frozen at submit time, against the current answer key."""
+        grader = CohortGrader()
+        after: UUID | None = None
+        rescored = 0
+        while True:
+            rows = await self.submissions.answers_after(after, batch_size, test_id=test.id)
+            if not rows:
+                return rescored
+            values: list[dict] = []
+            for submission_id, _, answers_json, schema_version in rows:
+                canonical_answers = stored_answers(test.questions, answers_json, schema_version)
+                scores = score_answers(test.questions, canonical_answers, test.scoring_type, grader)
+                values.extend(answer_rows(submission_id, test.id, scores))
+            await self.answers_repo.replace(values)
+            await self.db.commit()
+            rescored += len(rows)
+            after = rows[-1][0]
+
+    async def rebuild_stale(self, limit: int) -> int:
+        rebuilt = 0
+        for test_id in await self.repo.stale_test_ids(limit):
+            try:
+                rebuilt += int(await self.rebuild(test_id))
+            except Exception as exc:
+                await self.db.rollback()
+                logger.exception("analytics_rebuild_failed", test_id=test_id, error=str(exc))
+        return rebuilt
@@ -0,0 +1,106 @@
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import jwt
+import structlog
+from fastapi import HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.core.security import create_attempt_session_token, decode_attempt_session_token
+from app.services.compiled_test import CompiledTest
+
+logger = structlog.get_logger()
+
+SESSION_KEY_PREFIX = "nexo:attempt-session:"
+SESSION_HEADER = "X-Attempt-Session"
+# Client-generated id (e.g. the draft id) that anonymous sessions are pinned to. The
+# client can send a new one at any time, so it only keeps reloads from restarting the clock.
+SESSION_CLIENT_HEADER = "X-Attempt-Client"
+
+
+class AttemptSessionService:
+    """Per-participant test timers carried in signed tokens.
+
+    Starting a session signs ``(test, participant, started_at)`` with an expiry at
+    ``min(start + duration, end_time)`` plus a grace period, so the submit path
+    checks the deadline from the token alone. The start time is pinned in Redis
+    (``SET NX`` with a TTL) per participant, so asking again does not restart
+    the clock. Anonymous sessions (attempts disabled) are pinned per client id,
+    which the participant chooses: a client that sends a fresh id gets a fresh
+    clock. Tests that need a hard per-participant limit must enable attempts so
+    starts are pinned to the registered phone. When sessions are enforced and
+    the start cannot be pinned, no token is issued.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], Redis | None] = get_redis,
+        enforced: bool | None = None,
+        grace_seconds: int | None = None,
+        secret_key: str | None = None,
+    ):
+        self._redis = redis_factory
+        if enforced is None or grace_seconds is None or secret_key is None:
+            settings = get_settings()
+            enforced = settings.attempt_session_enforced if enforced is None else enforced
+            grace_seconds = settings.attempt_session_grace_seconds if grace_seconds is None else grace_seconds
+            secret_key = settings.jwt_secret_key if secret_key is None else secret_key
+        self.enforced = enforced
+        self.grace = timedelta(seconds=grace_seconds)
+        self._secret_key = secret_key
+
+    async def start(self, test: CompiledTest, subject: str = "", attempt: int = 0, client_id: str = "") -> dict:
+        owner = subject or (f"client:{client_id}" if client_id else "")
+        started_at = await self._started_at(test, owner, attempt)
+        deadline = min(started_at + timedelta(minutes=test.duration_minutes), test.end_time)
+        return {
+            "session_token": create_attempt_session_token(
+                test.id, subject, started_at, deadline + self.grace, self._secret_key
+            ),
+            "started_at": started_at,
+            "deadline": deadline,
+        }
+
+    def check(self, test: CompiledTest, token: str | None, subject: str = "") -> str | None:
+        """Returns why a submission is refused, or ``None`` when it is within its session."""
+        if not token:
+            return "Attempt session required" if self.enforced else None
+        try:
+            payload = decode_attempt_session_token(token, self._secret_key)
+        except jwt.ExpiredSignatureError:
+            return "Test duration exceeded"
+        except jwt.InvalidTokenError:
+            return "Invalid attempt session"
+        if payload.get("tid") != test.id or (test.attempts_enabled and payload.get("sub") != subject):
+            return "Invalid attempt session"
+        return None
+
+    async def _started_at(self, test: CompiledTest, owner: str, attempt: int) -> datetime:
+        now = datetime.now(UTC)
+        if not owner:
+            if self.enforced:
+                raise HTTPException(status_code=400, detail=f"{SESSION_CLIENT_HEADER} header required")
+            return now
+        redis = self._redis()
+        if redis is None:
+            return self._unpinned(test, now)
+        key = f"{SESSION_KEY_PREFIX}{test.id}:{owner}:{attempt}"
+        ttl = max(int((test.end_time + self.grace - now).total_seconds()), 1)
+        try:
+            if await redis.set(key, int(now.timestamp()), nx=True, ex=ttl):
+                return now
+            stored = await redis.get(key)
+        except RedisError as exc:
+            logger.warning("attempt_session_redis_error", test_id=test.id, error=str(exc))
+            return self._unpinned(test, now)
+        return datetime.fromtimestamp(int(stored), UTC) if stored else now
+
+    def _unpinned(self, test: CompiledTest, now: datetime) -> datetime:
+        # Without a pin every request for the same owner would start a new clock.
+        if self.enforced:
+            logger.warning("attempt_session_unpinned", test_id=test.id)
+            raise HTTPException(status_code=503, detail="Attempt sessions temporarily unavailable")
+        return now
@@ -0,0 +1,114 @@
+import hashlib
+import random
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from app.services.scoring_service import _normalize_text
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 64) - 1
+
+
+@dataclass
+class AnswerCluster:
+    representative: str
+    submission_ids: list[UUID] = field(default_factory=list)
+    variants: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.submission_ids)
+
+
+def normalize_answer(value: str | int | float) -> str:
+    return " ".join(_normalize_text(value).split())
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def _hash_shingle(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _permutations(num_perm: int, seed: int = 1) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)]
+
+
+def minhash_signature(shingle_set: set[str], permutations: list[tuple[int, int]]) -> tuple[int, ...]:
+    if not shingle_set:
+        return tuple(MAX_HASH for _ in permutations)
+    hashes = [_hash_shingle(item) for item in shingle_set]
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in permutations)
+
+
+def estimated_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    if not left:
+        return 0.0
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+def cluster_answers(
+    answers: list[tuple[UUID, str | int | float]],
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    bands: int = 16,
+) -> list[AnswerCluster]:
+    # Pass 1: exact matches after normalization.
+    exact: dict[str, list[tuple[UUID, str]]] = {}
+    for submission_id, raw in answers:
+        exact.setdefault(normalize_answer(raw), []).append((submission_id, str(raw or "")))
+
+    keys = list(exact.keys())
+    parent = list(range(len(keys)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    # Pass 2: near-duplicates via MinHash LSH banding, verified against the threshold.
+    permutations = _permutations(num_perm)
+    rows_per_band = max(1, num_perm // bands)
+    signatures: dict[int, tuple[int, ...]] = {}
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for index, key in enumerate(keys):
+        if not key:
+            continue
+        signature = minhash_signature(shingles(key), permutations)
+        signatures[index] = signature
+        for band in range(bands):
+            chunk = signature[band * rows_per_band : (band + 1) * rows_per_band]
+            if chunk:
+                buckets.setdefault((band, chunk), []).append(index)
+
+    for members in buckets.values():
+        anchor = members[0]
+        for other in members[1:]:
+            root_a, root_b = find(anchor), find(other)
+            if root_a == root_b:
+                continue
+            if estimated_similarity(signatures[anchor], signatures[other]) >= threshold:
+                parent[root_b] = root_a
+
+    grouped: dict[int, list[int]] = {}
+    for index in range(len(keys)):
+        grouped.setdefault(find(index), []).append(index)
+
+    clusters: list[AnswerCluster] = []
+    for members in grouped.values():
+        members.sort(key=lambda index: (-len(exact[keys[index]]), keys[index]))
+        cluster = AnswerCluster(representative=exact[keys[members[0]]][0][1])
+        for index in members:
+            rows = exact[keys[index]]
+            cluster.variants[rows[0][1]] = len(rows)
+            cluster.submission_ids.extend(submission_id for submission_id, _ in rows)
+        clusters.append(cluster)
+
+    clusters.sort(key=lambda item: (-item.size, normalize_answer(item.representative)))
+    return clusters
@@ -0,0 +1,233 @@
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import lru_cache
+from uuid import UUID
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.constants import FieldType, PlanCode, QuestionType, ScoringType, TestType
+from app.core.redis import get_redis
+from app.models.domain import Test
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledOption:
+    option_index: int
+    option_html: str
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledParticipantField:
+    field_key: str
+    label: str
+    field_type: FieldType
+    required: bool
+    locked: bool
+    sort_order: int
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledQuestion:
+    id: UUID
+    q_type: QuestionType
+    content_html: str
+    points: float
+    correct_answer_text: str
+    sort_order: int
+    options: tuple[CompiledOption, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTest:
+    """Immutable snapshot of a test; attribute names mirror the ORM models so
+    scoring and serialization code accepts either."""
+
+    id: int
+    version: int
+    creator_id: UUID
+    title: str
+    description: str
+    start_time: datetime
+    end_time: datetime
+    duration_minutes: int
+    attempts_count: int
+    attempts_enabled: bool
+    registration_window_hours: int | None
+    scoring_type: ScoringType
+    test_type: TestType
+    creator_plan_snapshot: PlanCode
+    created_at: datetime
+    participant_fields: tuple[CompiledParticipantField, ...]
+    questions: tuple[CompiledQuestion, ...]
+
+
+def compile_test(row: Test, version: int) -> CompiledTest:
+    return CompiledTest(
+        id=int(row.id),
+        version=version,
+        creator_id=row.creator_id,
+        title=row.title,
+        description=row.description,
+        start_time=row.start_time,
+        end_time=row.end_time,
+        duration_minutes=row.duration_minutes,
+        attempts_count=row.attempts_count,
+        attempts_enabled=row.attempts_enabled,
+        registration_window_hours=row.registration_window_hours,
+        scoring_type=row.scoring_type,
+        test_type=row.test_type,
+        creator_plan_snapshot=row.creator_plan_snapshot,
+        created_at=row.created_at,
+        participant_fields=tuple(
+            CompiledParticipantField(
+                field_key=f.field_key,
+                label=f.label,
+                field_type=f.field_type,
+                required=f.required,
+                locked=f.locked,
+                sort_order=f.sort_order,
+            )
+            for f in sorted(row.participant_fields, key=lambda f: f.sort_order)
+        ),
+        questions=tuple(
+            CompiledQuestion(
+                id=q.id,
+                q_type=q.q_type,
+                content_html=q.content_html,
+                points=float(q.points),
+                correct_answer_text=q.correct_answer_text,
+                sort_order=q.sort_order,
+                options=tuple(
+                    CompiledOption(option_index=o.option_index, option_html=o.option_html)
+                    for o in sorted(q.options, key=lambda o: o.option_index)
+                ),
+            )
+            for q in sorted(row.questions, key=lambda q: q.sort_order)
+        ),
+    )
+
+
+def dump_compiled_test(compiled: CompiledTest) -> bytes:
+    return json.dumps(asdict(compiled), default=str, ensure_ascii=False).encode("utf-8")
+
+
+def load_compiled_test(raw: bytes) -> CompiledTest:
+    data = json.loads(raw)
+    return CompiledTest(
+        id=int(data["id"]),
+        version=int(data["version"]),
+        creator_id=UUID(data["creator_id"]),
+        title=data["title"],
+        description=data["description"],
+        start_time=datetime.fromisoformat(data["start_time"]),
+        end_time=datetime.fromisoformat(data["end_time"]),
+        duration_minutes=int(data["duration_minutes"]),
+        attempts_count=int(data["attempts_count"]),
+        attempts_enabled=bool(data["attempts_enabled"]),
+        registration_window_hours=data["registration_window_hours"],
+        scoring_type=ScoringType(data["scoring_type"]),
+        test_type=TestType(data["test_type"]),
+        creator_plan_snapshot=PlanCode(data["creator_plan_snapshot"]),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        participant_fields=tuple(
+            CompiledParticipantField(**{**f, "field_type": FieldType(f["field_type"])})
+            for f in data["participant_fields"]
+        ),
+        questions=tuple(
+            CompiledQuestion(
+                id=UUID(q["id"]),
+                q_type=QuestionType(q["q_type"]),
+                content_html=q["content_html"],
+                points=float(q["points"]),
+                correct_answer_text=q["correct_answer_text"],
+                sort_order=int(q["sort_order"]),
+                options=tuple(CompiledOption(**o) for o in q["options"]),
+            )
+            for q in data["questions"]
+        ),
+    )
+
+
+class CompiledTestCache:
+    """Per-process LRU of compiled tests, optionally backed by Redis.
+
+    Entries are keyed by ``tests.version``, which every edit bumps in the same
+    transaction. Callers read the current version from the database, so a
+    snapshot built before an edit is never served on any replica or worker;
+    Redis only shares built snapshots between processes.
+    """
+
+    def __init__(self, maxsize: int, redis_factory: Callable[[], Redis | None] = get_redis):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, CompiledTest] = OrderedDict()
+        self._redis = redis_factory
+
+    def _snapshot_key(self, test_id: int, version: int) -> str:
+        return f"nexo:compiled-test:{test_id}:v{version}"
+
+    async def get(self, test_id: int, version: int) -> CompiledTest | None:
+        compiled = self._entries.get(test_id)
+        if compiled is not None:
+            if compiled.version == version:
+                self._entries.move_to_end(test_id)
+                return compiled
+            if compiled.version < version:
+                self._entries.pop(test_id, None)
+
+        redis = self._redis()
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(self._snapshot_key(test_id, version))
+        except RedisError as exc:
+            logger.warning("compiled_test_cache_redis_error", error=str(exc))
+            return None
+        if raw is None:
+            return None
+        compiled = load_compiled_test(raw)
+        self._store_local(compiled)
+        return compiled
+
+    async def put(self, compiled: CompiledTest) -> None:
+        self._store_local(compiled)
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                self._snapshot_key(compiled.id, compiled.version),
+                dump_compiled_test(compiled),
+                ex=24 * 60 * 60,
+            )
+        except RedisError as exc:
+            logger.warning("compiled_test_cache_redis_error", error=str(exc))
+
+    def invalidate(self, test_id: int) -> None:
+        """Drops the local entry early; correctness does not depend on it."""
+        self._entries.pop(test_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _store_local(self, compiled: CompiledTest) -> None:
+        current = self._entries.get(compiled.id)
+        if current is not None and current.version > compiled.version:
+            # A slower request built an older version; keep the newer one.
+            return
+        self._entries[compiled.id] = compiled
+        self._entries.move_to_end(compiled.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+@lru_cache
+def get_compiled_test_cache() -> CompiledTestCache:
+    return CompiledTestCache(maxsize=get_settings().compiled_test_cache_size)
@@ -0,0 +1,189 @@
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import structlog
+from fastapi import HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import get_redis
+from app.repositories.draft_repository import DraftRepository, fold_draft_events
+from app.services.compiled_test import CompiledTest
+from app.services.test_service import TestService
+
+logger = structlog.get_logger()
+
+DRAFT_KEY_PREFIX = "nexo:draft:"
+# Drafts stay readable for a while after the test closes, then expire / get purged.
+DRAFT_RETENTION_AFTER_END = timedelta(hours=1)
+
+_PARTICIPANT_FIELD = "p"
+_REVISION_FIELD = "r"
+_ANSWER_PREFIX = "a:"
+
+
+@dataclass(slots=True)
+class DraftState:
+    id: UUID
+    participant_values: dict[str, str]
+    answers: dict[str, str | int | float]
+    revision: int
+
+
+class DraftService:
+    """Server-side autosave of in-progress answers.
+
+    A draft holds answer deltas sent by the participant while the test is open;
+    the final submission reads it and seals (removes) it. Drafts live in a Redis
+    hash when Redis is enabled, otherwise in the append-only
+    ``submission_draft_events`` table.
+    """
+
+    def __init__(self, db: AsyncSession, redis_factory: Callable[[], Redis | None] = get_redis):
+        self.db = db
+        self.repo = DraftRepository(db)
+        self.test_service = TestService(db)
+        self._redis = redis_factory
+
+    async def create(self, test_id: int, participant_values: dict[str, str]) -> dict:
+        test = await self._active_test(test_id)
+        draft_id = uuid4()
+        redis = self._redis()
+        if redis is None:
+            await self.repo.append(test_id, draft_id, {}, participant_values)
+            await self.db.commit()
+        else:
+            key = self._key(test_id, draft_id)
+            try:
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(
+                        key,
+                        mapping={_PARTICIPANT_FIELD: json.dumps(participant_values), _REVISION_FIELD: 0},
+                    )
+                    pipe.expireat(key, self._expires_at(test))
+                    await pipe.execute()
+            except RedisError as exc:
+                self._unavailable(exc)
+        return self._saved(draft_id, test_id, 0)
+
+    async def save(self, test_id: int, draft_id: UUID, answers: dict[str, str | int | float | None]) -> dict:
+        """Merges answer deltas into the draft; ``None`` clears a question."""
+        test = await self._active_test(test_id)
+        question_ids = {str(question.id) for question in test.questions}
+        unknown = [question_id for question_id in answers if question_id not in question_ids]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown question id: {unknown[0]}")
+
+        redis = self._redis()
+        if redis is None:
+            if not await self.repo.exists(test_id, draft_id):
+                raise HTTPException(status_code=404, detail="Draft not found")
+            await self.repo.append(test_id, draft_id, answers)
+            revision = await self.repo.revision(test_id, draft_id)
+            await self.db.commit()
+            return self._saved(draft_id, test_id, revision)
+
+        key = self._key(test_id, draft_id)
+        values = {f"{_ANSWER_PREFIX}{k}": json.dumps(v) for k, v in answers.items() if v is not None}
+        cleared = [f"{_ANSWER_PREFIX}{k}" for k, v in answers.items() if v is None]
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.hexists(key, _PARTICIPANT_FIELD)
+                if values:
+                    pipe.hset(key, mapping=values)
+                if cleared:
+                    pipe.hdel(key, *cleared)
+                pipe.hincrby(key, _REVISION_FIELD, 1)
+                pipe.expireat(key, self._expires_at(test))
+                results = await pipe.execute()
+            if not results[0]:
+                # The draft expired, was sealed or never existed; drop what was just written.
+                await redis.delete(key)
+                raise HTTPException(status_code=404, detail="Draft not found")
+            revision = int(results[-2])
+        except RedisError as exc:
+            self._unavailable(exc)
+        return self._saved(draft_id, test_id, revision)
+
+    async def get(self, test_id: int, draft_id: UUID) -> dict:
+        draft = await self.load(test_id, draft_id)
+        if draft is None:
+            raise HTTPException(status_code=404, detail="Draft not found")
+        return {
+            "id": draft.id,
+            "testId": test_id,
+            "participantValues": draft.participant_values,
+            "answers": draft.answers,
+            "revision": draft.revision,
+        }
+
+    async def load(self, test_id: int, draft_id: UUID) -> DraftState | None:
+        redis = self._redis()
+        if redis is None:
+            events = await self.repo.events(test_id, draft_id)
+            if not events:
+                return None
+            participant_values, answers = fold_draft_events((fields, delta) for _, fields, delta in events)
+            # Revisions count answer saves per draft in both backends.
+            return DraftState(draft_id, participant_values, answers, len(events) - 1)
+
+        try:
+            raw = await redis.hgetall(self._key(test_id, draft_id))
+        except RedisError as exc:
+            self._unavailable(exc)
+        if not raw:
+            return None
+        fields = {k.decode() if isinstance(k, bytes) else k: v for k, v in raw.items()}
+        answers = {
+            name.removeprefix(_ANSWER_PREFIX): json.loads(value)
+            for name, value in fields.items()
+            if name.startswith(_ANSWER_PREFIX)
+        }
+        return DraftState(
+            draft_id,
+            json.loads(fields.get(_PARTICIPANT_FIELD) or "{}"),
+            answers,
+            int(fields.get(_REVISION_FIELD) or 0),
+        )
+
+    async def seal(self, test_id: int, draft_id: UUID) -> None:
+        """Removes a draft once its submission is committed."""
+        redis = self._redis()
+        if redis is None:
+            await self.repo.delete(test_id, draft_id)
+            await self.db.commit()
+            return
+        try:
+            await redis.delete(self._key(test_id, draft_id))
+        except RedisError as exc:
+            # The submission is already stored; the key expires with the test.
+            logger.warning("draft_seal_redis_error", test_id=test_id, error=str(exc))
+
+    async def purge_ended(self) -> int:
+        purged = await self.repo.purge_ended(datetime.now(UTC) - DRAFT_RETENTION_AFTER_END)
+        await self.db.commit()
+        return purged
+
+    async def _active_test(self, test_id: int) -> CompiledTest:
+        test = await self.test_service.get_compiled_test_or_404(test_id)
+        now = datetime.now(UTC)
+        if now < test.start_time or now >= test.end_time:
+            raise HTTPException(status_code=400, detail="Test not active")
+        return test
+
+    def _expires_at(self, test: CompiledTest) -> datetime:
+        return test.end_time + DRAFT_RETENTION_AFTER_END
+
+    def _key(self, test_id: int, draft_id: UUID) -> str:
+        return f"{DRAFT_KEY_PREFIX}{test_id}:{draft_id}"
+
+    def _saved(self, draft_id: UUID, test_id: int, revision: int) -> dict:
+        return {"id": draft_id, "testId": test_id, "revision": revision, "savedAt": datetime.now(UTC)}
+
+    def _unavailable(self, exc: RedisError) -> None:
+        logger.warning("draft_redis_error", error=str(exc))
+        raise HTTPException(status_code=503, detail="Autosave temporarily unavailable") from exc
@@ -0,0 +1,80 @@
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.submission_repository import SubmissionRepository
+from app.services.compiled_test import CompiledTest
+from app.services.scoring_service import stored_answers
+from app.services.test_service import TestService
+from app.utils.spreadsheet import CsvStreamWriter, XlsxStreamWriter
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_header(test: CompiledTest) -> list[str]:
+    header = ["Submission ID", "Full name", "Phone", "Attempt"]
+    header.extend(field.label for field in test.participant_fields)
+    header.extend(["Status", "Auto score", "Auto max score", "Final score", "Submitted at"])
+    for number, _ in enumerate(test.questions, start=1):
+        header.extend([f"Q{number} answer", f"Q{number} correct"])
+    return header
+
+
+def export_row(test: CompiledTest, row: Row) -> list:
+    fields = row.participant_fields_json or {}
+    values = [
+        str(row.id),
+        row.participant_full_name,
+        row.participant_secondary,
+        row.participant_attempt_value,
+    ]
+    values.extend(fields.get(field.field_key, "") for field in test.participant_fields)
+    values.extend(
+        [row.status.value, row.auto_score, row.auto_max_score, row.final_score, row.submitted_at.isoformat()]
+    )
+    answers = stored_answers(test.questions, row.answers_json, row.answers_schema_version)
+    verdicts = row.verdicts or {}
+    for question in test.questions:
+        verdict = verdicts.get(str(question.id))
+        values.extend([answers.get(str(question.id), ""), None if verdict is None else int(verdict)])
+    return values
+
+
+class SubmissionExportService:
+    """Streams a test's submissions into a spreadsheet writer without materializing them."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = SubmissionRepository(db)
+        self.test_service = TestService(db)
+
+    async def test_for_owner(self, test_id: int, user_id: UUID) -> CompiledTest:
+        test = await self.test_service.get_compiled_test_or_404(test_id)
+        if test.creator_id != user_id:
+            raise HTTPException(status_code=403, detail="Forbidden")
+        return test
+
+    async def write(self, test: CompiledTest, writer: CsvStreamWriter | XlsxStreamWriter) -> AsyncIterator[bytes]:
+        chunk = writer.row(export_header(test))
+        if chunk:
+            yield chunk
+        result = await self.repo.stream_for_export(test.id, EXPORT_BATCH_SIZE)
+        async for row in result:
+            chunk = writer.row(export_row(test, row))
+            if chunk:
+                yield chunk
+        yield writer.close()
+
+
+async def stream_submissions_export(
+    test: CompiledTest, writer: CsvStreamWriter | XlsxStreamWriter
+) -> AsyncIterator[bytes]:
+    # Runs after the request's session is released, so the cursor gets its own connection.
+    from app.db.session import SessionLocal
+
+    async with SessionLocal() as db:
+        async for chunk in SubmissionExportService(db).write(test, writer):
+            yield chunk
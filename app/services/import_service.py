@@ -0,0 +1,267 @@
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import DEFAULT_FREE_LIMITS, PARTICIPANT_VALUE_MAX_LENGTH, PlanCode, SubmissionStatus
+from app.models.domain import Submission
+from app.repositories.attempt_repository import AttemptRepository
+from app.repositories.leaderboard_repository import LeaderboardRepository
+from app.repositories.registration_repository import RegistrationRepository
+from app.repositories.submission_answer_repository import SubmissionAnswerRepository, answer_rows
+from app.repositories.test_stats_repository import TestStatsRepository
+from app.services.compiled_test import CompiledTest
+from app.services.leaderboard_stream import leaderboard_hub
+from app.services.scoring_service import SubmissionScorer, canonicalize_answers
+from app.services.test_service import TestService
+from app.utils.phone import normalize_phone_e164
+
+MAX_IMPORT_ROWS = 50_000
+MAX_IMPORT_BYTES = 32 * 1024 * 1024
+MAX_REPORTED_ERRORS = 1000
+# Submissions scored and written per round trip; bounds memory for large tests.
+IMPORT_BATCH_SIZE = 2000
+
+
+@dataclass(slots=True)
+class ImportRow:
+    line: int
+    participant_values: dict[str, str]
+    answers: dict[str, str | int | float]
+    submitted_at: str | None = None
+
+
+def _question_columns(test: CompiledTest) -> dict[str, str]:
+    """Header aliases for each question: its id, ``Q<n>`` and ``Q<n> answer`` (the export header)."""
+    columns: dict[str, str] = {}
+    for number, question in enumerate(test.questions, start=1):
+        question_id = str(question.id)
+        columns[question_id.lower()] = question_id
+        columns[f"q{number}"] = question_id
+        columns[f"q{number} answer"] = question_id
+    return columns
+
+
+def parse_csv(test: CompiledTest, text: str) -> list[ImportRow]:
+    reader = csv.reader(io.StringIO(text.lstrip("\ufeff")))
+    header = next(reader, None)
+    if not header:
+        return []
+    questions = _question_columns(test)
+    field_keys = {field.field_key.lower(): field.field_key for field in test.participant_fields}
+    field_keys.update({"fullname": "fullName", "phone": "phone"})
+    rows: list[ImportRow] = []
+    for line, cells in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in cells):
+            continue
+        row = ImportRow(line=line, participant_values={}, answers={})
+        for name, value in zip(header, cells):
+            key = name.strip().lower()
+            if key == "submittedat":
+                row.submitted_at = value.strip() or None
+            elif key in questions:
+                if value.strip():
+                    row.answers[questions[key]] = value
+            elif key in field_keys:
+                row.participant_values[field_keys[key]] = value.strip()
+        rows.append(row)
+    return rows
+
+
+def parse_ndjson(text: str) -> tuple[list[ImportRow], list[dict]]:
+    """Lines are ``{"participantValues": {...}, "answers": {...}, "submittedAt": "..."}`` objects."""
+    rows: list[ImportRow] = []
+    errors: list[dict] = []
+    for line, raw in enumerate(text.splitlines(), start=1):
+        if not raw.strip():
+            continue
+        try:
+            item = json.loads(raw)
+            participant_values = {str(k): str(v) for k, v in (item.get("participantValues") or {}).items()}
+            answers = {str(k): v for k, v in (item.get("answers") or {}).items()}
+        except (ValueError, AttributeError):
+            errors.append({"line": line, "error": "Invalid JSON object"})
+            continue
+        submitted_at = item.get("submittedAt")
+        rows.append(ImportRow(line, participant_values, answers, str(submitted_at) if submitted_at else None))
+    return rows, errors
+
+
+async def read_import_file(file: UploadFile) -> bytes:
+    """The upload's bytes, rejected before buffering once it exceeds ``MAX_IMPORT_BYTES``."""
+    too_large = HTTPException(status_code=413, detail=f"Import files are limited to {MAX_IMPORT_BYTES // 2**20} MB")
+    if file.size is not None and file.size > MAX_IMPORT_BYTES:
+        raise too_large
+    content = await file.read(MAX_IMPORT_BYTES + 1)
+    if len(content) > MAX_IMPORT_BYTES:
+        raise too_large
+    return content
+
+
+class SubmissionImportService:
+    """Bulk insert of keyed-in (e.g. paper exam) results.
+
+    Rows are validated up front, then scored with a shared ``SubmissionScorer`` and
+    written in batches of multi-row INSERTs inside a single transaction; invalid
+    rows are reported by line number and skipped.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.test_service = TestService(db)
+        self.attempts = AttemptRepository(db)
+        self.registrations = RegistrationRepository(db)
+        self.stats = TestStatsRepository(db)
+        self.leaderboard = LeaderboardRepository(db)
+        self.answers = SubmissionAnswerRepository(db)
+
+    async def import_submissions(self, test_id: int, user_id: UUID, content: bytes, fmt: str) -> dict:
+        test = await self.test_service.get_compiled_test_or_404(test_id)
+        if test.creator_id != user_id:
+            raise HTTPException(status_code=403, detail="Forbidden")
+        try:
+            text = content.decode("utf-8")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="File must be UTF-8 encoded") from None
+        if fmt == "ndjson":
+            rows, errors = parse_ndjson(text)
+        else:
+            rows, errors = parse_csv(test, text), []
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_IMPORT_ROWS} rows per import")
+
+        now = datetime.now(UTC)
+        accepted: list[tuple[ImportRow, str, str, str, datetime]] = []
+        for row in rows:
+            try:
+                accepted.append((row, *self._participant(test, row), self._submitted_at(row, now)))
+            except ValueError as exc:
+                errors.append({"line": row.line, "error": str(exc)})
+        # Rows rejected by the attempt rules must not use up the free plan's room.
+        if test.attempts_enabled:
+            accepted = await self._apply_attempt_rules(test, accepted, errors)
+        submissions_limit = (
+            DEFAULT_FREE_LIMITS["submissionsPerTest"] if test.creator_plan_snapshot == PlanCode.FREE else None
+        )
+        if submissions_limit is not None:
+            stats = await self.stats.get(test_id)
+            room = max(submissions_limit - (stats.total if stats else 0), 0)
+            for row, *_ in accepted[room:]:
+                errors.append({"line": row.line, "error": "Free submissionsPerTest limit reached"})
+            accepted = accepted[:room]
+        if test.attempts_enabled:
+            await self._reserve_attempts(test, accepted)
+
+        scorer = SubmissionScorer(test.questions, test.scoring_type)
+        pending = 0
+        for start in range(0, len(accepted), IMPORT_BATCH_SIZE):
+            values: list[dict] = []
+            answer_values: list[dict] = []
+            for row, full_name, attempt_value, secondary, submitted_at in accepted[start : start + IMPORT_BATCH_SIZE]:
+                canonical_answers, _ = canonicalize_answers(test.questions, row.answers)
+                auto_score, auto_max, status, answer_scores = scorer.score(canonical_answers)
+                pending += int(status == SubmissionStatus.PENDING_REVIEW)
+                submission_id = uuid4()
+                values.append(
+                    {
+                        "id": submission_id,
+                        "test_id": test_id,
+                        "participant_full_name": full_name,
+                        "participant_attempt_value": attempt_value,
+                        "participant_secondary": secondary,
+                        "participant_fields_json": row.participant_values,
+                        "answers_json": canonical_answers,
+                        "auto_score": auto_score,
+                        "auto_max_score": auto_max,
+                        "final_score": auto_score if status == SubmissionStatus.COMPLETED else None,
+                        "status": status,
+                        "submitted_at": submitted_at,
+                        "idempotency_key": None,
+                    }
+                )
+                answer_values.extend(answer_rows(submission_id, test_id, answer_scores))
+            # executemany lets SQLAlchemy batch rows into multi-row INSERTs without per-row statement building.
+            await self.db.execute(pg_insert(Submission.__table__), values)
+            await self.leaderboard.add(values)
+            await self.answers.add(answer_values)
+
+        if accepted:
+            recorded = await self.stats.record(
+                test_id,
+                total=len(accepted),
+                pending=pending,
+                completed=len(accepted) - pending,
+                submitted_at=max(item[4] for item in accepted),
+                limit=submissions_limit,
+            )
+            if not recorded:
+                await self.db.rollback()
+                raise HTTPException(status_code=409, detail="Submissions changed during import, retry")
+            await self.db.commit()
+            await leaderboard_hub.publish(test_id)
+
+        errors.sort(key=lambda item: item["line"])
+        return {
+            "importedCount": len(accepted),
+            "errorCount": len(errors),
+            "errors": errors[:MAX_REPORTED_ERRORS],
+        }
+
+    def _participant(self, test: CompiledTest, row: ImportRow) -> tuple[str, str, str]:
+        full_name = str(row.participant_values.get("fullName") or "").strip()
+        if not full_name:
+            raise ValueError("fullName required")
+        if len(full_name) > PARTICIPANT_VALUE_MAX_LENGTH:
+            raise ValueError(f"fullName must be at most {PARTICIPANT_VALUE_MAX_LENGTH} characters")
+        if test.attempts_enabled:
+            phone = normalize_phone_e164(row.participant_values.get("phone", ""))
+            if not phone:
+                raise ValueError("phone must be in +998901234567 format")
+            return full_name, phone, phone
+        phone = str(row.participant_values.get("phone", "")).strip()
+        if len(phone) > PARTICIPANT_VALUE_MAX_LENGTH:
+            raise ValueError(f"phone must be at most {PARTICIPANT_VALUE_MAX_LENGTH} characters")
+        return full_name, full_name, phone
+
+    def _submitted_at(self, row: ImportRow, default: datetime) -> datetime:
+        if not row.submitted_at:
+            return default
+        try:
+            value = datetime.fromisoformat(row.submitted_at)
+        except ValueError:
+            raise ValueError("submittedAt must be an ISO 8601 timestamp") from None
+        return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+    async def _apply_attempt_rules(self, test: CompiledTest, accepted: list, errors: list[dict]) -> list:
+        """Drops rows from unregistered phones or past the attempt limit; nothing is reserved yet."""
+        phones = list({attempt_value for _, _, attempt_value, _, _ in accepted})
+        registered = await self.registrations.registered_phones(test.id, phones)
+        used = await self.attempts.used_many(test.id, phones)
+        counts: dict[str, int] = {}
+        kept = []
+        for item in accepted:
+            row, attempt_value = item[0], item[2]
+            if attempt_value not in registered:
+                errors.append({"line": row.line, "error": "Phone is not registered for this test"})
+            elif used.get(attempt_value, 0) + counts.get(attempt_value, 0) >= test.attempts_count:
+                errors.append({"line": row.line, "error": "Attempt limit reached"})
+            else:
+                counts[attempt_value] = counts.get(attempt_value, 0) + 1
+                kept.append(item)
+        return kept
+
+    async def _reserve_attempts(self, test: CompiledTest, accepted: list) -> None:
+        counts: dict[str, int] = {}
+        for _, _, attempt_value, _, _ in accepted:
+            counts[attempt_value] = counts.get(attempt_value, 0) + 1
+        if counts:
+            reserved = await self.attempts.reserve_many(test.id, counts, test.attempts_count)
+            if len(reserved) != len(counts):
+                await self.db.rollback()
+                raise HTTPException(status_code=409, detail="Attempts changed during import, retry")
@@ -0,0 +1,243 @@
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import structlog
+from fastapi import HTTPException
+from sqlalchemy import String, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import SubmissionStatus
+from app.events.outbox import push_event
+from app.models.domain import OutboxEvent, Submission
+from app.repositories.leaderboard_repository import LeaderboardRepository
+from app.repositories.submission_answer_repository import SubmissionAnswerRepository, answer_rows
+from app.repositories.submission_repository import SubmissionRepository
+from app.repositories.test_stats_repository import TestStatsRepository
+from app.services.compiled_test import CompiledTest
+from app.services.leaderboard_stream import leaderboard_hub
+from app.services.scoring_service import SubmissionScorer, canonicalize_answers
+from app.services.test_service import TestService
+
+logger = structlog.get_logger()
+
+INGEST_EVENT = "submission.ingest"
+MAX_INGEST_RETRIES = 5
+
+
+def _payload_value(key: str):
+    # Literal operands, so the expression matches the partial indexes on ``outbox_events``.
+    return OutboxEvent.payload_json.op("->>", return_type=String)(literal_column(f"'{key}'"))
+
+
+_IS_INGEST_EVENT = OutboxEvent.event_type == literal_column(f"'{INGEST_EVENT}'")
+
+
+class SubmissionIngestService:
+    """Write-behind submission ingest backed by the ``outbox_events`` table.
+
+    Requests only append an event; ``drain`` scores queued submissions per test and
+    stores them with one multi-row INSERT per batch.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.test_service = TestService(db)
+        self.stats = TestStatsRepository(db)
+        self.leaderboard = LeaderboardRepository(db)
+        self.answers = SubmissionAnswerRepository(db)
+        self.submissions = SubmissionRepository(db)
+
+    async def enqueue(
+        self,
+        test: CompiledTest,
+        full_name: str,
+        attempt_value: str,
+        secondary: str,
+        participant_values: dict[str, str],
+        answers: dict[str, str | int | float],
+        idempotency_key: str | None,
+        record_total: bool = False,
+    ) -> dict:
+        submission_id = uuid4()
+        submitted_at = datetime.now(UTC)
+        await push_event(
+            self.db,
+            INGEST_EVENT,
+            {
+                "submissionId": str(submission_id),
+                "testId": test.id,
+                "fullName": full_name,
+                "attemptValue": attempt_value,
+                "secondary": secondary,
+                "participantValues": participant_values,
+                "answers": answers,
+                "idempotencyKey": idempotency_key,
+                "submittedAt": submitted_at.isoformat(),
+            },
+        )
+        if record_total:
+            # Unguarded delta, taken last so the test_stats row lock is held only through commit.
+            await self.stats.record(test.id, total=1, submitted_at=submitted_at)
+        await self.db.commit()
+        return self._queued(submission_id, test.id, submitted_at)
+
+    async def find_queued(
+        self, test_id: int, submission_id: UUID | None = None, idempotency_key: str | None = None
+    ) -> dict | None:
+        query = select(OutboxEvent).where(_IS_INGEST_EVENT, _payload_value("testId") == str(test_id))
+        if submission_id is not None:
+            query = query.where(_payload_value("submissionId") == str(submission_id))
+        if idempotency_key is not None:
+            query = query.where(_payload_value("idempotencyKey") == idempotency_key)
+        res = await self.db.execute(query.order_by(OutboxEvent.id.desc()).limit(1))
+        event = res.scalar_one_or_none()
+        if event is None:
+            return None
+        payload = event.payload_json
+        submitted_at = datetime.fromisoformat(payload["submittedAt"])
+        queued = self._queued(UUID(payload["submissionId"]), test_id, submitted_at)
+        if event.status == "pending":
+            return queued
+        if event.status == "done":
+            stored = await self._stored_for(test_id, payload)
+            if stored is not None:
+                # A duplicate key was dropped by the insert; the earlier submission under that key stands.
+                status = "stored" if stored.id == queued["id"] else "duplicate"
+                return {**queued, "status": status, "duplicateOf": stored.id if status == "duplicate" else None}
+        return {**queued, "status": "failed"}
+
+    async def _stored_for(self, test_id: int, payload: dict) -> Submission | None:
+        stored = await self.submissions.get(UUID(payload["submissionId"]))
+        if stored is None and payload.get("idempotencyKey"):
+            stored = await self.submissions.get_by_idempotency_key(test_id, payload["idempotencyKey"])
+        return stored
+
+    async def drain(self, batch_size: int) -> int:
+        res = await self.db.execute(
+            select(OutboxEvent)
+            .where(OutboxEvent.event_type == INGEST_EVENT, OutboxEvent.status == "pending")
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        events = list(res.scalars().all())
+        if not events:
+            return 0
+
+        by_test: dict[int, list[OutboxEvent]] = {}
+        for event in events:
+            by_test.setdefault(int(event.payload_json["testId"]), []).append(event)
+
+        scored: list[tuple[OutboxEvent, dict, list[dict]]] = []
+        failed_ids: list[int] = []
+        retry_ids: list[int] = []
+        for test_id, test_events in by_test.items():
+            try:
+                test = await self.test_service.get_compiled_test_or_404(test_id)
+            except HTTPException:
+                failed_ids.extend(event.id for event in test_events)
+                continue
+            scorer = SubmissionScorer(test.questions, test.scoring_type)
+            for event in test_events:
+                try:
+                    row, answer_values = self._score(test, event.payload_json, scorer)
+                except Exception as exc:
+                    logger.exception("submission_ingest_score_failed", event_id=event.id, error=str(exc))
+                    retry_ids.append(event.id)
+                    continue
+                scored.append((event, row, answer_values))
+
+        changed_tests: set[int] = set()
+        try:
+            try:
+                async with self.db.begin_nested():
+                    changed_tests.update(await self._store(scored))
+            except Exception as exc:
+                # Store event by event so one bad row doesn't hold back the rest of the batch.
+                logger.warning("submission_ingest_batch_failed", error=str(exc), events=len(scored))
+                for entry in scored:
+                    try:
+                        async with self.db.begin_nested():
+                            changed_tests.update(await self._store([entry]))
+                    except Exception as event_exc:
+                        event = entry[0]
+                        logger.exception("submission_ingest_event_failed", event_id=event.id, error=str(event_exc))
+                        retry_ids.append(event.id)
+            done_ids = [event.id for event in events if event.id not in failed_ids and event.id not in retry_ids]
+            if done_ids:
+                await self.db.execute(update(OutboxEvent).where(OutboxEvent.id.in_(done_ids)).values(status="done"))
+            if failed_ids:
+                await self.db.execute(
+                    update(OutboxEvent).where(OutboxEvent.id.in_(failed_ids)).values(status="failed")
+                )
+            await self._record_retry([event for event in events if event.id in retry_ids])
+            await self.db.commit()
+        except Exception as exc:
+            await self.db.rollback()
+            logger.exception("submission_ingest_failed", error=str(exc), events=len(events))
+            event_ids = [event.id for event in events]
+            res = await self.db.execute(select(OutboxEvent).where(OutboxEvent.id.in_(event_ids)))
+            await self._record_retry(list(res.scalars().all()))
+            await self.db.commit()
+            return 0
+        for test_id in changed_tests:
+            await leaderboard_hub.publish(test_id)
+        # Events left pending for a retry end this drain run; the next scheduled one picks them up.
+        return len(events) - len(retry_ids)
+
+    async def _store(self, scored: list[tuple[OutboxEvent, dict, list[dict]]]) -> set[int]:
+        """Inserts scored rows with their projections; returns the tests that gained submissions."""
+        if not scored:
+            return set()
+        rows = [row for _, row, _ in scored]
+        answers = {row["id"]: answer_values for _, row, answer_values in scored}
+        inserted = await self.submissions.insert_many_idempotent(rows)
+        await self._record_stats(rows, inserted)
+        inserted_ids = {submission_id for submission_id, _, _ in inserted}
+        await self.leaderboard.add([row for row in rows if row["id"] in inserted_ids])
+        await self.answers.add([value for submission_id in inserted_ids for value in answers[submission_id]])
+        return {int(test_id) for _, test_id, _ in inserted}
+
+    def _score(self, test: CompiledTest, payload: dict, scorer: SubmissionScorer) -> tuple[dict, list[dict]]:
+        submission_id = UUID(payload["submissionId"])
+        canonical_answers, _ = canonicalize_answers(test.questions, payload["answers"])
+        auto_score, auto_max, status, answer_scores = scorer.score(canonical_answers)
+        answer_values = answer_rows(submission_id, test.id, answer_scores)
+        return {
+            "id": submission_id,
+            "test_id": test.id,
+            "participant_full_name": payload["fullName"],
+            "participant_attempt_value": payload["attemptValue"],
+            "participant_secondary": payload["secondary"],
+            "participant_fields_json": payload["participantValues"],
+            "answers_json": canonical_answers,
+            "auto_score": auto_score,
+            "auto_max_score": auto_max,
+            "final_score": auto_score if status == SubmissionStatus.COMPLETED else None,
+            "status": status,
+            "submitted_at": datetime.fromisoformat(payload["submittedAt"]),
+            "idempotency_key": payload["idempotencyKey"],
+        }, answer_values
+
+    async def _record_stats(self, rows: list[dict], inserted: list) -> None:
+        # ``total`` was reserved at enqueue time; rows dropped as duplicates give it back.
+        deltas: dict[int, list[int]] = {}
+        for row in rows:
+            deltas.setdefault(row["test_id"], [0, 0, 0])[0] -= 1
+        for _, test_id, status in inserted:
+            delta = deltas[int(test_id)]
+            delta[0] += 1
+            delta[1 if status == SubmissionStatus.PENDING_REVIEW else 2] += 1
+        for test_id, (total, pending, completed) in deltas.items():
+            await self.stats.record(test_id, total=total, pending=pending, completed=completed)
+
+    async def _record_retry(self, events: list[OutboxEvent]) -> None:
+        # Flushed by the caller's commit; events stay pending until they run out of retries.
+        for event in events:
+            event.retry_count += 1
+            if event.retry_count >= MAX_INGEST_RETRIES:
+                event.status = "failed"
+                await self.stats.record(int(event.payload_json["testId"]), total=-1)
+
+    def _queued(self, submission_id: UUID, test_id: int, submitted_at: datetime) -> dict:
+        return {"id": submission_id, "testId": test_id, "status": "queued", "submittedAt": submitted_at}
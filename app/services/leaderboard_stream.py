@@ -0,0 +1,221 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+
+logger = structlog.get_logger()
+
+STREAM_TOP_N = 100
+SUBSCRIBER_QUEUE_SIZE = 32
+KEEPALIVE_SECONDS = 15.0
+CHANNEL_PREFIX = "nexo:leaderboard:"
+
+
+async def load_leaderboard_state(test_id: int) -> dict:
+    from app.db.session import SessionLocal
+    from app.repositories.leaderboard_repository import LeaderboardRepository
+    from app.repositories.test_stats_repository import TestStatsRepository
+
+    async with SessionLocal() as db:
+        entries = await LeaderboardRepository(db).ranked(test_id, STREAM_TOP_N)
+        stats = await TestStatsRepository(db).get(test_id)
+    return {
+        "ranked": [
+            {
+                "id": str(entry.submission_id),
+                "rank": rank,
+                "finalScore": float(entry.final_score or 0),
+                "submittedAt": entry.submitted_at.isoformat(),
+                "participant": {
+                    "fullName": entry.participant_full_name,
+                    "phone": entry.participant_secondary,
+                    "fields": entry.participant_fields_json,
+                    "attemptValue": entry.participant_attempt_value,
+                },
+            }
+            for rank, entry in enumerate(entries, start=1)
+        ],
+        "stats": {
+            "ranked": stats.completed if stats else 0,
+            "pending": stats.pending if stats else 0,
+            "total": stats.total if stats else 0,
+        },
+    }
+
+
+def diff_rankings(previous: list[dict], current: list[dict]) -> dict:
+    """Entries whose rank or score changed (or that entered the top N), and ids that left it."""
+    before = {item["id"]: item for item in previous}
+    changed = [
+        item
+        for item in current
+        if item["id"] not in before
+        or before[item["id"]]["rank"] != item["rank"]
+        or before[item["id"]]["finalScore"] != item["finalScore"]
+    ]
+    current_ids = {item["id"] for item in current}
+    removed = [item_id for item_id in before if item_id not in current_ids]
+    return {"changed": changed, "removed": removed}
+
+
+def sse_message(event: str, data: dict) -> bytes:
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class LeaderboardBroadcaster:
+    """Fans one leaderboard computation per change out to every watcher of a test.
+
+    Notifications are debounced; each refresh encodes the delta once and the same
+    bytes are queued for all subscribers. A subscriber that falls behind is reset
+    to a fresh snapshot instead of growing its queue.
+    """
+
+    def __init__(self, test_id: int, loader: Callable[[int], Awaitable[dict]], debounce_seconds: float):
+        self.test_id = test_id
+        self.loader = loader
+        self.debounce_seconds = debounce_seconds
+        self.subscribers: set[asyncio.Queue[bytes]] = set()
+        self.state: dict | None = None
+        self.sequence = 0
+        self._snapshot: bytes | None = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        self._dirty = False
+
+    def subscribe(self) -> asyncio.Queue[bytes]:
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[bytes]) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers and self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    async def snapshot(self) -> bytes:
+        async with self._lock:
+            if self.state is None:
+                self.state = await self.loader(self.test_id)
+                self._snapshot = None
+            if self._snapshot is None:
+                self._snapshot = sse_message("snapshot", {"seq": self.sequence, **self.state})
+            return self._snapshot
+
+    def notify(self) -> None:
+        if not self.subscribers:
+            self.state = None
+            return
+        self._dirty = True
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while self._dirty and self.subscribers:
+            await asyncio.sleep(self.debounce_seconds)
+            self._dirty = False
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.warning("leaderboard_stream_refresh_failed", test_id=self.test_id, error=str(exc))
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            current = await self.loader(self.test_id)
+            previous = self.state or {"ranked": [], "stats": {}}
+            delta = diff_rankings(previous["ranked"], current["ranked"])
+            self.state = current
+            self._snapshot = None
+            if not delta["changed"] and not delta["removed"] and previous.get("stats") == current["stats"]:
+                return
+            self.sequence += 1
+            message = sse_message("delta", {"seq": self.sequence, **delta, "stats": current["stats"]})
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(await self.snapshot())
+
+
+class LeaderboardHub:
+    """Per-process registry of broadcasters, joined across replicas through Redis pub/sub."""
+
+    def __init__(
+        self,
+        loader: Callable[[int], Awaitable[dict]] = load_leaderboard_state,
+        redis_factory: Callable[[], Redis | None] = get_redis,
+        debounce_seconds: float = 0.5,
+    ):
+        self.loader = loader
+        self.debounce_seconds = debounce_seconds
+        self.broadcasters: dict[int, LeaderboardBroadcaster] = {}
+        self._redis = redis_factory
+        self._listener: asyncio.Task | None = None
+
+    def notify(self, test_id: int) -> None:
+        broadcaster = self.broadcasters.get(test_id)
+        if broadcaster is not None:
+            broadcaster.notify()
+
+    async def publish(self, test_id: int) -> None:
+        redis = self._redis()
+        if redis is None:
+            self.notify(test_id)
+            return
+        try:
+            await redis.publish(f"{CHANNEL_PREFIX}{test_id}", b"1")
+        except RedisError as exc:
+            logger.warning("leaderboard_stream_publish_failed", test_id=test_id, error=str(exc))
+            self.notify(test_id)
+
+    async def stream(self, test_id: int) -> AsyncIterator[bytes]:
+        self._ensure_listener()
+        broadcaster = self.broadcasters.get(test_id)
+        if broadcaster is None:
+            broadcaster = LeaderboardBroadcaster(test_id, self.loader, self.debounce_seconds)
+            self.broadcasters[test_id] = broadcaster
+        queue = broadcaster.subscribe()
+        try:
+            yield await broadcaster.snapshot()
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(queue)
+            if not broadcaster.subscribers and self.broadcasters.get(test_id) is broadcaster:
+                del self.broadcasters[test_id]
+
+    def _ensure_listener(self) -> None:
+        if self._redis() is None or (self._listener is not None and not self._listener.done()):
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        redis = self._redis()
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode("utf-8")
+                self.notify(int(channel.removeprefix(CHANNEL_PREFIX)))
+        except RedisError as exc:
+            logger.warning("leaderboard_stream_listener_failed", error=str(exc))
+        finally:
+            await pubsub.aclose()
+
+
+leaderboard_hub = LeaderboardHub()
@@ -0,0 +1,47 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedPayload:
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+
+def encode_payload(model: type[BaseModel], payload: dict) -> EncodedPayload:
+    body = model.model_validate(payload).model_dump_json().encode("utf-8")
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return EncodedPayload(body=body, gzip_body=gzip.compress(body, compresslevel=6), etag=etag)
+
+
+class PayloadCache:
+    """LRU of encoded response bodies derived from a source snapshot.
+
+    An entry is only served while its source object is the current one, so a new
+    compiled test (edit, TTL expiry, other replica's bump) rebuilds the payload.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[object, EncodedPayload]] = OrderedDict()
+
+    def get(self, key: tuple, source: object) -> EncodedPayload | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not source:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: tuple, source: object, payload: EncodedPayload) -> None:
+        self._entries[key] = (source, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+public_payload_cache = PayloadCache()
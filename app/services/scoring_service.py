@@ -1,5 +1,8 @@
 import json
 import re
+from collections.abc import Hashable
+from functools import lru_cache
+from typing import NamedTuple
 
 from sympy import SympifyError, simplify
 from sympy.parsing.sympy_parser import (
@@ -10,7 +13,7 @@ from sympy.parsing.sympy_parser import (
     parse_expr,
 )
 
-from app.core.constants import QuestionType, ScoringType, SubmissionStatus
+from app.core.constants import ANSWERS_SCHEMA_VERSION, QuestionType, ScoringType, SubmissionStatus
 from app.models.domain import Question
 
 APOSTROPHE_REGEX = re.compile(r"[\u02BB\u02BC\u2018\u2019`\u00B4]")
@@ -72,10 +75,14 @@ def _tokenize_cells(value: str) -> list[str]:
     return tokens
 
 
+@lru_cache(maxsize=16384)
+def _cell_tokens(value: str) -> tuple[str, ...]:
+    # Doubles as an intern table: equal answers share one token tuple.
+    return tuple(_tokenize_cells(value))
+
+
 def _same_cell_answer(left: str, right: str) -> bool:
-    a = _tokenize_cells(left)
-    b = _tokenize_cells(right)
-    return len(a) == len(b) and all(x == y for x, y in zip(a, b))
+    return _cell_tokens(left) == _cell_tokens(right)
 
 
 def _normalize_math_text(value: str | int | float) -> str:
@@ -142,11 +149,21 @@ def _parse_two_part_payload(raw: str | int | float) -> tuple[str, str]:
     return str(payload.get("first", "")), str(payload.get("second", ""))
 
 
-def _parse_two_part_correct(raw: str) -> tuple[str, str, float, float]:
+class TwoPartKey(NamedTuple):
+    first: str
+    second: str
+    first_points: float
+    second_points: float
+    first_tokens: tuple[str, ...]
+    second_tokens: tuple[str, ...]
+
+
+@lru_cache(maxsize=4096)
+def _two_part_key(raw: str) -> TwoPartKey:
     try:
         payload = json.loads(str(raw or ""))
     except Exception:
-        return "", "", 1.0, 1.0
+        payload = {}
     first = str(payload.get("first", ""))
     second = str(payload.get("second", ""))
     first_points = float(payload.get("firstPoints", 1) or 1)
@@ -155,7 +172,19 @@ def _parse_two_part_correct(raw: str) -> tuple[str, str, float, float]:
         first_points = 1.0
     if second_points <= 0:
         second_points = 1.0
-    return first, second, first_points, second_points
+    return TwoPartKey(
+        first=first,
+        second=second,
+        first_points=first_points,
+        second_points=second_points,
+        first_tokens=_cell_tokens(first),
+        second_tokens=_cell_tokens(second),
+    )
+
+
+def _parse_two_part_correct(raw: str) -> tuple[str, str, float, float]:
+    key = _two_part_key(str(raw or ""))
+    return key.first, key.second, key.first_points, key.second_points
 
 
 def _normalize_multiple_choice_value(value: str | int | float) -> str:
@@ -206,13 +235,19 @@ def canonicalize_answers(
     return remapped, True
 
 
+def stored_answers(
+    questions: list[Question], answers: dict[str, str | int | float], schema_version: int
+) -> dict[str, str | int | float]:
+    """Canonical answers of a stored submission; rows at the current schema version are already canonical."""
+    if schema_version >= ANSWERS_SCHEMA_VERSION:
+        return answers
+    return canonicalize_answers(questions, answers)[0]
+
+
 def is_question_correct(question: Question, raw_answer: str | int | float) -> bool:
     if _is_two_part_question(question):
-        user_first, user_second = _parse_two_part_payload(raw_answer)
-        correct_first, correct_second, _, _ = _parse_two_part_correct(question.correct_answer_text)
-        if question.q_type == QuestionType.TWO_PART_MATH:
-            return _same_math_answer(user_first, correct_first) and _same_math_answer(user_second, correct_second)
-        return _same_cell_answer(user_first, correct_first) and _same_cell_answer(user_second, correct_second)
+        is_first, is_second, _, _ = two_part_part_results(question, raw_answer)
+        return is_first and is_second
     if question.q_type == QuestionType.MULTIPLE_CHOICE:
         return _normalize_multiple_choice_value(raw_answer) == _normalize_multiple_choice_value(question.correct_answer_text)
     if question.q_type == QuestionType.TRUE_FALSE:
@@ -224,22 +259,65 @@ def is_question_correct(question: Question, raw_answer: str | int | float) -> bo
 
 def two_part_part_results(question: Question, raw_answer: str | int | float) -> tuple[bool, bool, float, float]:
     user_first, user_second = _parse_two_part_payload(raw_answer)
-    correct_first, correct_second, first_points, second_points = _parse_two_part_correct(question.correct_answer_text)
+    key = _two_part_key(str(question.correct_answer_text or ""))
     if question.q_type == QuestionType.TWO_PART_MATH:
         return (
-            _same_math_answer(user_first, correct_first),
-            _same_math_answer(user_second, correct_second),
-            first_points,
-            second_points,
+            _same_math_answer(user_first, key.first),
+            _same_math_answer(user_second, key.second),
+            key.first_points,
+            key.second_points,
         )
     return (
-        _same_cell_answer(user_first, correct_first),
-        _same_cell_answer(user_second, correct_second),
-        first_points,
-        second_points,
+        _cell_tokens(user_first) == key.first_tokens,
+        _cell_tokens(user_second) == key.second_tokens,
+        key.first_points,
+        key.second_points,
     )
 
 
+def answer_key(question: Question, raw_answer: str | int | float) -> Hashable:
+    """Normalized form of an answer; answers with equal keys always get the same verdict."""
+    if _is_two_part_question(question):
+        user_first, user_second = _parse_two_part_payload(raw_answer)
+        if question.q_type == QuestionType.TWO_PART_MATH:
+            return _normalize_math_text(user_first), _normalize_math_text(user_second)
+        return _cell_tokens(user_first), _cell_tokens(user_second)
+    if question.q_type == QuestionType.MULTIPLE_CHOICE:
+        return _normalize_multiple_choice_value(raw_answer)
+    if question.q_type == QuestionType.TRUE_FALSE:
+        return _normalize_true_false_value(raw_answer)
+    return str(raw_answer), bool(raw_answer)
+
+
+class CohortGrader:
+    """Grades answers for many submissions, comparing each distinct normalized answer once."""
+
+    def __init__(self) -> None:
+        self._verdicts: dict[tuple[str, Hashable], tuple[bool, bool]] = {}
+
+    def part_results(self, question: Question, raw_answer: str | int | float) -> tuple[bool, bool, float, float]:
+        cache_key = (str(question.id), answer_key(question, raw_answer))
+        verdict = self._verdicts.get(cache_key)
+        if verdict is None:
+            is_first, is_second, _, _ = two_part_part_results(question, raw_answer)
+            verdict = (is_first, is_second)
+            self._verdicts[cache_key] = verdict
+        key = _two_part_key(str(question.correct_answer_text or ""))
+        return verdict[0], verdict[1], key.first_points, key.second_points
+
+    def is_correct(self, question: Question, raw_answer: str | int | float) -> bool:
+        if _is_two_part_question(question):
+            is_first, is_second, _, _ = self.part_results(question, raw_answer)
+            return is_first and is_second
+        cache_key = (str(question.id), answer_key(question, raw_answer))
+        verdict = self._verdicts.get(cache_key)
+        if verdict is None:
+            correct = is_question_correct(question, raw_answer)
+            verdict = (correct, correct)
+            self._verdicts[cache_key] = verdict
+        return verdict[0]
+
+
 def question_max_score(question: Question, scoring_type: ScoringType) -> float:
     if scoring_type == ScoringType.RASCH or question.q_type == QuestionType.ESSAY:
         if _is_two_part_question(question):
@@ -256,9 +334,79 @@ def question_max_score(question: Question, scoring_type: ScoringType) -> float:
     return 0
 
 
+NORMALIZED_VALUE_MAX_LENGTH = 512
+
+
+class AnswerScore(NamedTuple):
+    question_id: str
+    normalized_value: str
+    is_correct: bool | None
+    score: float | None
+    part_mask: int
+
+
+def normalized_answer_value(question: Question, raw_answer: str | int | float) -> str:
+    if _is_two_part_question(question):
+        user_first, user_second = _parse_two_part_payload(raw_answer)
+        value = json.dumps(
+            [" ".join(_normalize_text(user_first).split()), " ".join(_normalize_text(user_second).split())],
+            ensure_ascii=False,
+        )
+    elif question.q_type == QuestionType.MULTIPLE_CHOICE:
+        value = _normalize_multiple_choice_value(raw_answer)
+    elif question.q_type == QuestionType.TRUE_FALSE:
+        value = _normalize_true_false_value(raw_answer)
+    else:
+        value = " ".join(_normalize_text(raw_answer).split())
+    # Long essays are truncated so the value stays indexable.
+    return value[:NORMALIZED_VALUE_MAX_LENGTH]
+
+
+def score_answers(
+    questions: list[Question],
+    answers: dict[str, str | int | float],
+    scoring_type: ScoringType,
+    grader: CohortGrader | None = None,
+) -> list[AnswerScore]:
+    """Per-question breakdown of ``auto_score_submission`` for the answered questions.
+
+    ``part_mask`` has bit 0 set for a correct (first part) answer and bit 1 for a
+    correct second part; manually graded questions get ``None`` verdicts.
+    """
+    grader = grader or CohortGrader()
+    rows: list[AnswerScore] = []
+    for q in questions:
+        raw_answer = answers.get(str(q.id), "")
+        if not str(raw_answer if raw_answer is not None else "").strip():
+            continue
+        value = normalized_answer_value(q, raw_answer)
+        if q.q_type in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER}:
+            rows.append(AnswerScore(str(q.id), value, None, None, 0))
+            continue
+        max_score = question_max_score(q, scoring_type)
+        if _is_two_part_question(q):
+            is_first, is_second, first_points, second_points = grader.part_results(q, raw_answer)
+            correct = is_first and is_second
+            if scoring_type == ScoringType.RASCH:
+                score = (first_points if is_first else 0.0) + (second_points if is_second else 0.0)
+            else:
+                score = max_score if correct else 0.0
+            mask = int(is_first) | (int(is_second) << 1)
+        else:
+            correct = grader.is_correct(q, raw_answer)
+            score = max_score if correct else 0.0
+            mask = int(correct)
+        rows.append(AnswerScore(str(q.id), value, correct, float(score), mask))
+    return rows
+
+
 def auto_score_submission(
-    questions: list[Question], answers: dict[str, str | int | float], scoring_type: ScoringType
+    questions: list[Question],
+    answers: dict[str, str | int | float],
+    scoring_type: ScoringType,
+    grader: CohortGrader | None = None,
 ) -> tuple[float, float, SubmissionStatus]:
+    grader = grader or CohortGrader()
     auto_score = 0.0
     auto_max = 0.0
     requires_manual = scoring_type == ScoringType.RASCH
@@ -271,13 +419,70 @@ def auto_score_submission(
         auto_max += max_score
         raw_answer = answers.get(str(q.id), "")
         if _is_two_part_question(q) and scoring_type == ScoringType.RASCH:
-            is_first, is_second, first_points, second_points = two_part_part_results(q, raw_answer)
+            is_first, is_second, first_points, second_points = grader.part_results(q, raw_answer)
             if is_first:
                 auto_score += first_points
             if is_second:
                 auto_score += second_points
-        elif is_question_correct(q, raw_answer):
+        elif grader.is_correct(q, raw_answer):
             auto_score += max_score
 
     status = SubmissionStatus.PENDING_REVIEW if requires_manual else SubmissionStatus.COMPLETED
     return auto_score, auto_max, status
+
+
+class SubmissionScorer:
+    """``auto_score_submission`` plus ``score_answers`` for many submissions of one test.
+
+    Each distinct raw answer per question is normalized and graded once; later
+    submissions only do dictionary lookups, which keeps bulk imports and ingest
+    batches linear in the number of distinct answers rather than answers.
+    """
+
+    def __init__(self, questions: list[Question], scoring_type: ScoringType, grader: CohortGrader | None = None):
+        self.questions = list(questions)
+        self.scoring_type = scoring_type
+        self.grader = grader or CohortGrader()
+        self.auto_max = sum(
+            question_max_score(q, scoring_type)
+            for q in self.questions
+            if q.q_type not in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER}
+        )
+        requires_manual = scoring_type == ScoringType.RASCH or any(
+            q.q_type in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER} for q in self.questions
+        )
+        self.status = SubmissionStatus.PENDING_REVIEW if requires_manual else SubmissionStatus.COMPLETED
+        self._question_ids = [(str(q.id), q, _is_two_part_question(q)) for q in self.questions]
+        self._outcomes: dict[tuple[str, Hashable], tuple[float, AnswerScore | None]] = {}
+
+    def score(
+        self, answers: dict[str, str | int | float]
+    ) -> tuple[float, float, SubmissionStatus, list[AnswerScore]]:
+        auto_score = 0.0
+        rows: list[AnswerScore] = []
+        outcomes = self._outcomes
+        for question_id, q, two_part in self._question_ids:
+            raw_answer = answers.get(question_id, "")
+            # Keyed like ``CohortGrader``: raw values such as 1, 1.0 and True hash alike
+            # but normalize differently.
+            cache_key = (question_id, answer_key(q, raw_answer))
+            outcome = outcomes.get(cache_key)
+            if outcome is None:
+                outcome = self._outcome(q, raw_answer)
+                outcomes[cache_key] = outcome
+            auto_score += outcome[0]
+            row = outcome[1]
+            if row is not None:
+                if two_part:
+                    # Two-part keys ignore punctuation the stored value keeps.
+                    row = row._replace(normalized_value=normalized_answer_value(q, raw_answer))
+                rows.append(row)
+        return auto_score, self.auto_max, self.status, rows
+
+    def _outcome(self, q: Question, raw_answer: str | int | float) -> tuple[float, AnswerScore | None]:
+        scored = score_answers([q], {str(q.id): raw_answer}, self.scoring_type, self.grader)
+        row = scored[0] if scored else None
+        if q.q_type in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER}:
+            return 0.0, row
+        points, _, _ = auto_score_submission([q], {str(q.id): raw_answer}, self.scoring_type, self.grader)
+        return points, row
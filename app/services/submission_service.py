@@ -1,42 +1,103 @@
 from datetime import UTC, datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
 from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
 
+from app.core.config import get_settings
 from app.core.constants import (
     DEFAULT_FREE_LIMITS,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    PARTICIPANT_VALUE_MAX_LENGTH,
     PlanCode,
     QuestionType,
     ScoringType,
     SubmissionStatus,
 )
-from app.models.domain import ManualGrade, Submission, Test
+from app.models.domain import LeaderboardEntry, ManualGrade, Submission, Test
+from app.repositories.attempt_repository import AttemptRepository
+from app.repositories.leaderboard_repository import ENTRY_COLUMNS, LeaderboardRepository
 from app.repositories.registration_repository import RegistrationRepository
+from app.repositories.submission_answer_repository import SubmissionAnswerRepository, answer_rows
 from app.repositories.submission_repository import SubmissionRepository
+from app.repositories.test_stats_repository import TestStatsRepository
+from app.services.analytics_service import AnalyticsService, question_distributions
+from app.services.attempt_session import AttemptSessionService
+from app.services.clustering_service import cluster_answers
+from app.services.compiled_test import CompiledTest
+from app.services.draft_service import DraftService
+from app.services.ingest_service import SubmissionIngestService
+from app.services.leaderboard_stream import leaderboard_hub
 from app.services.plan_service import PlanService
-from app.services.rasch_service import estimate_rasch_1pl, summarize_rasch_items, theta_to_score_100
+from app.services.rasch_service import estimate_rasch_1pl, theta_to_score_100
 from app.services.scoring_service import (
+    CohortGrader,
     auto_score_submission,
     canonicalize_answers,
-    is_question_correct,
-    two_part_part_results,
+    score_answers,
+    stored_answers,
 )
 from app.services.test_service import TestService
+from app.utils.cursor import decode_cursor, encode_cursor
 from app.utils.phone import normalize_phone_e164
 
 
 TWO_PART_TYPES = {QuestionType.TWO_PART_WRITTEN, QuestionType.TWO_PART_MATH}
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def serialize_participant(row: Submission | LeaderboardEntry) -> dict:
+    return {
+        "fullName": row.participant_full_name,
+        "phone": row.participant_secondary,
+        "fields": row.participant_fields_json,
+        "attemptValue": row.participant_attempt_value,
+    }
+
+
+def leaderboard_rows(ranked: list[LeaderboardEntry], pending: list[LeaderboardEntry]) -> dict:
+    """Leaderboard items already in ``LeaderboardResponse`` shape, so they can be encoded without a model pass."""
+    return {
+        "ranked": [
+            {
+                "id": s.submission_id,
+                "participant": serialize_participant(s),
+                "finalScore": float(s.final_score or 0),
+                "submittedAt": s.submitted_at,
+            }
+            for s in ranked
+        ],
+        "pending": [
+            {
+                "id": s.submission_id,
+                "participant": serialize_participant(s),
+                "submittedAt": s.submitted_at,
+                "status": s.status.value,
+            }
+            for s in pending
+        ],
+    }
 
 
 class SubmissionService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = SubmissionRepository(db)
+        self.answers_repo = SubmissionAnswerRepository(db)
+        self.analytics = AnalyticsService(db)
+        self.attempts = AttemptRepository(db)
+        self.stats = TestStatsRepository(db)
+        self.leaderboard_repo = LeaderboardRepository(db)
         self.registration_repo = RegistrationRepository(db)
         self.test_service = TestService(db)
         self.plan_service = PlanService(db)
+        self.ingest = SubmissionIngestService(db)
+        self.drafts = DraftService(db)
+        self.sessions = AttemptSessionService()
+        self.settings = get_settings()
 
     async def create_submission(
         self,
@@ -44,12 +105,24 @@ class SubmissionService:
         participant_values: dict[str, str],
         answers: dict[str, str | int | float],
         idempotency_key: str | None = None,
+        draft_id: UUID | None = None,
+        session_token: str | None = None,
     ) -> dict:
-        test = await self.test_service.get_test_or_404(test_id)
+        if idempotency_key and len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise HTTPException(status_code=400, detail="Idempotency-Key too long")
+        test = await self.test_service.get_compiled_test_or_404(test_id)
         now = datetime.now(UTC)
         if now < test.start_time or now >= test.end_time:
             raise HTTPException(status_code=400, detail="Test not active")
 
+        if draft_id is not None:
+            draft = await self.drafts.load(test_id, draft_id)
+            if draft is None:
+                # Already sealed by an earlier attempt of this request, or expired.
+                return await self._replay_or_reject(test_id, idempotency_key, "Draft not found")
+            participant_values = participant_values or draft.participant_values
+            answers = {**draft.answers, **answers}
+
         full_name = str(participant_values.get("fullName") or "").strip()
         if not full_name:
             raise HTTPException(status_code=400, detail="fullName required")
@@ -64,65 +137,185 @@ class SubmissionService:
                 raise HTTPException(status_code=400, detail="Bu telefon raqam test uchun ro'yxatdan o'tmagan")
 
             attempt_value = phone
-            attempts = await self.repo.count_for_attempt_value(test_id=test_id, participant_attempt_value=attempt_value)
-            if attempts >= test.attempts_count:
-                raise HTTPException(status_code=400, detail="Attempt limit reached")
             secondary = phone
         else:
             attempt_value = full_name
             secondary = str(participant_values.get("phone", "")).strip()
+        # Checked here so a queued row can't fail the ingest batch it is stored with.
+        if max(len(full_name), len(secondary)) > PARTICIPANT_VALUE_MAX_LENGTH:
+            raise HTTPException(status_code=400, detail="Participant values too long")
 
-        if idempotency_key:
-            existing = await self.db.execute(
-                select(Submission).where(
-                    Submission.test_id == test_id, Submission.idempotency_key == idempotency_key
-                )
-            )
-            current = existing.scalar_one_or_none()
+        session_error = self.sessions.check(test, session_token, attempt_value)
+        if session_error:
+            return await self._replay_or_reject(test_id, idempotency_key, session_error)
+
+        queued = self.settings.submission_ingest_mode == "queued"
+        if idempotency_key and queued:
+            current = await self.repo.get_by_idempotency_key(test_id, idempotency_key)
             if current:
                 return self.serialize_submission(current)
+            pending = await self.ingest.find_queued(test_id, idempotency_key=idempotency_key)
+            if pending and pending["status"] in {"queued", "failed"}:
+                return pending
+            if pending:
+                # Drained since the lookup above; replay the submission stored under the key.
+                current = await self.repo.get_by_idempotency_key(test_id, idempotency_key)
+                if current:
+                    return self.serialize_submission(current)
 
-        if test.creator_plan_snapshot == PlanCode.FREE:
-            submissions_count = await self.repo.count_for_test(test_id)
-            if submissions_count >= DEFAULT_FREE_LIMITS["submissionsPerTest"]:
-                raise HTTPException(status_code=400, detail="Free submissionsPerTest limit reached")
+        if test.attempts_enabled:
+            reserved = await self.attempts.reserve(test_id, attempt_value, test.attempts_count)
+            if reserved is None:
+                return await self._replay_or_reject(test_id, idempotency_key, "Attempt limit reached")
+
+        submissions_limit = (
+            DEFAULT_FREE_LIMITS["submissionsPerTest"] if test.creator_plan_snapshot == PlanCode.FREE else None
+        )
+        # The guarded counter upsert holds the test_stats row lock until commit, so it is
+        # only taken up front when a limit applies; otherwise the delta goes in last.
+        if queued:
+            # Status counters are applied when the ingest drain stores the row.
+            limited = submissions_limit is not None
+            if limited and not await self.stats.record(test_id, total=1, submitted_at=now, limit=submissions_limit):
+                return await self._replay_or_reject(test_id, idempotency_key, "Free submissionsPerTest limit reached")
+            queued_result = await self.ingest.enqueue(
+                test=test,
+                full_name=full_name,
+                attempt_value=attempt_value,
+                secondary=secondary,
+                participant_values=participant_values,
+                answers=answers,
+                idempotency_key=idempotency_key,
+                record_total=not limited,
+            )
+            if draft_id is not None:
+                await self.drafts.seal(test_id, draft_id)
+            return queued_result
 
         canonical_answers, _ = canonicalize_answers(test.questions, answers)
+        grader = CohortGrader()
         auto_score, auto_max, status = auto_score_submission(
-            test.questions, canonical_answers, test.scoring_type
+            test.questions, canonical_answers, test.scoring_type, grader=grader
         )
         final_score = auto_score if status == SubmissionStatus.COMPLETED else None
-        row = Submission(
-            test_id=test_id,
-            participant_full_name=full_name,
-            participant_attempt_value=attempt_value,
-            participant_secondary=secondary,
-            participant_fields_json=participant_values,
-            answers_json=canonical_answers,
-            auto_score=auto_score,
-            auto_max_score=auto_max,
-            final_score=final_score,
-            status=status,
-            idempotency_key=idempotency_key,
+        counters = {
+            "total": 1,
+            "pending": int(status == SubmissionStatus.PENDING_REVIEW),
+            "completed": int(status == SubmissionStatus.COMPLETED),
+            "submitted_at": now,
+        }
+        if submissions_limit is not None and not await self.stats.record(
+            test_id, **counters, limit=submissions_limit
+        ):
+            return await self._replay_or_reject(test_id, idempotency_key, "Free submissionsPerTest limit reached")
+        row = await self.repo.insert_idempotent(
+            {
+                "id": uuid4(),
+                "test_id": test_id,
+                "participant_full_name": full_name,
+                "participant_attempt_value": attempt_value,
+                "participant_secondary": secondary,
+                "participant_fields_json": participant_values,
+                "answers_json": canonical_answers,
+                "auto_score": auto_score,
+                "auto_max_score": auto_max,
+                "final_score": final_score,
+                "status": status,
+                "submitted_at": now,
+                "idempotency_key": idempotency_key,
+            }
         )
-        await self.repo.create(row)
+        if row is None:
+            # A concurrent or earlier request with the same key won the insert.
+            return await self._replay_or_reject(test_id, idempotency_key, "Duplicate submission")
+        await self.leaderboard_repo.add([{"id": row.id, **{name: getattr(row, name) for name in ENTRY_COLUMNS}}])
+        await self.answers_repo.add(
+            answer_rows(row.id, test_id, score_answers(test.questions, canonical_answers, test.scoring_type, grader))
+        )
+        if submissions_limit is None:
+            await self.stats.record(test_id, **counters)
         await self.db.commit()
-        await self.db.refresh(row)
+        if draft_id is not None:
+            await self.drafts.seal(test_id, draft_id)
+        await leaderboard_hub.publish(test_id)
         return self.serialize_submission(row)
 
-    async def list_submissions(self, test_id: int, user_id: UUID, status: str | None, latest: int | None) -> list[dict]:
+    async def _replay_or_reject(self, test_id: int, idempotency_key: str | None, detail: str) -> dict:
+        # Roll back attempt and counter reservations made by this request before answering.
+        await self.db.rollback()
+        if idempotency_key:
+            current = await self.repo.get_by_idempotency_key(test_id, idempotency_key)
+            if current:
+                return self.serialize_submission(current)
+        raise HTTPException(status_code=400, detail=detail)
+
+    async def submission_status(self, test_id: int, submission_id: UUID, user_id: UUID | None = None) -> dict:
+        """Polling endpoint for queued submissions; only the test owner gets the stored submission back."""
+        row = await self.repo.get(submission_id)
+        if row and row.test_id == test_id:
+            submission = None
+            if user_id is not None:
+                test = await self.test_service.get_compiled_test_or_404(test_id)
+                if test.creator_id == user_id:
+                    submission = self.serialize_submission(row, test=test)
+            return {"id": row.id, "testId": row.test_id, "status": "stored", "submission": submission}
+        queued = await self.ingest.find_queued(test_id, submission_id=submission_id)
+        if not queued:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        return {
+            "id": queued["id"],
+            "testId": test_id,
+            "status": queued["status"],
+            "duplicateOf": queued.get("duplicateOf"),
+            "submission": None,
+        }
+
+    async def list_submissions(
+        self,
+        test_id: int,
+        user_id: UUID,
+        status: str | None,
+        latest: int | None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
         test = await self.test_service.get_test_or_404(test_id)
         if test.creator_id != user_id:
             raise HTTPException(status_code=403, detail="Forbidden")
         await self._auto_finalize_rasch_if_ready(test)
-        rows = await self.repo.list_for_test(test_id)
+        status_filter = None
         if status:
-            rows = [s for s in rows if s.status.value == status]
+            if status not in {item.value for item in SubmissionStatus}:
+                return [], None
+            status_filter = SubmissionStatus(status)
+
+        page_size = min(limit or latest or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        before = self._decode_keyset(cursor, (datetime.fromisoformat, UUID))
+        paginate = True
         if test.creator_plan_snapshot == PlanCode.FREE:
-            rows = rows[: DEFAULT_FREE_LIMITS["manualReviewRecent"]]
-        if latest:
-            rows = rows[:latest]
-        return [self.serialize_submission(s, test=test) for s in rows]
+            # Free plans only see the most recent window, so there is no next page.
+            if before is not None:
+                return [], None
+            page_size = min(page_size, DEFAULT_FREE_LIMITS["manualReviewRecent"])
+            paginate = False
+
+        rows = await self.repo.page_for_test(test_id, page_size + 1, status=status_filter, before=before)
+        next_cursor = None
+        if paginate and len(rows) > page_size:
+            last = rows[page_size - 1]
+            next_cursor = encode_cursor([last.submitted_at.isoformat(), str(last.id)])
+        return [self.serialize_submission(s, test=test) for s in rows[:page_size]], next_cursor
+
+    def _decode_keyset(self, cursor: str | None, parsers: tuple) -> tuple | None:
+        if not cursor:
+            return None
+        values = decode_cursor(cursor, len(parsers))
+        try:
+            if values is None:
+                raise ValueError(cursor)
+            return tuple(parse(value) for parse, value in zip(parsers, values))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
 
     async def patch_manual_grades(
         self, test_id: int, submission_id: UUID, user_id: UUID, grades: dict[str, float]
@@ -134,10 +327,8 @@ class SubmissionService:
         if not submission or submission.test_id != test_id:
             raise HTTPException(status_code=404, detail="Submission not found")
 
-        for qid, score in grades.items():
-            q_uuid = UUID(str(qid))
+        for q_uuid, bounded in self._bounded_manual_grades(test, grades).items():
             existing = next((g for g in submission.manual_grades if g.question_id == q_uuid), None)
-            bounded = max(0.0, float(score))
             if existing:
                 existing.score = bounded
                 existing.grader_id = user_id
@@ -149,6 +340,118 @@ class SubmissionService:
         await self.db.refresh(submission)
         return self.serialize_submission(submission, test=test)
 
+    def _bounded_manual_grades(self, test, grades: dict[str, float]) -> dict[UUID, float]:
+        """Grades keyed by question id, clamped to [0, max(1, points)] as finalization sums them."""
+        manual_questions = {
+            str(q.id): q for q in test.questions if q.q_type in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER}
+        }
+        bounded: dict[UUID, float] = {}
+        for qid, score in grades.items():
+            question = manual_questions.get(str(qid))
+            if question is None:
+                raise HTTPException(status_code=400, detail=f"Question {qid} is not manually graded")
+            bounded[question.id] = max(0.0, min(max(1.0, float(question.points)), float(score)))
+        return bounded
+
+    async def bulk_patch_manual_grades(self, test_id: int, user_id: UUID, items: list[dict]) -> dict:
+        test = await self.test_service.get_test_or_404(test_id)
+        if test.creator_id != user_id:
+            raise HTTPException(status_code=403, detail="Forbidden")
+        # Later items win; ON CONFLICT cannot touch the same row twice in one statement.
+        now = datetime.now(UTC)
+        pending: dict[tuple[UUID, UUID], float] = {}
+        for item in items:
+            for q_uuid, bounded in self._bounded_manual_grades(test, item["grades"]).items():
+                for submission_id in item["submissionIds"]:
+                    pending[(submission_id, q_uuid)] = bounded
+
+        submission_ids = list({submission_id for submission_id, _ in pending})
+        existing = await self.repo.existing_ids_for_test(test_id, submission_ids)
+        missing = [str(submission_id) for submission_id in submission_ids if submission_id not in existing]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Submissions not found: {', '.join(missing)}")
+
+        updated = await self.repo.upsert_manual_grades(
+            [
+                {
+                    "submission_id": submission_id,
+                    "question_id": q_uuid,
+                    "score": score,
+                    "grader_id": user_id,
+                    "graded_at": now,
+                }
+                for (submission_id, q_uuid), score in pending.items()
+            ]
+        )
+        await self.db.commit()
+        # The upsert bypasses the ORM, so submissions this session already holds reload their grades.
+        for submission_id in submission_ids:
+            loaded = self.db.identity_map.get(identity_key(Submission, submission_id))
+            if loaded is not None:
+                await self.db.refresh(loaded, ["manual_grades"])
+        return {"updatedCount": updated, "submissionIds": submission_ids}
+
+    async def answer_clusters(
+        self, test_id: int, question_id: UUID, user_id: UUID, threshold: float
+    ) -> dict:
+        test = await self.test_service.get_compiled_test_or_404(test_id)
+        if test.creator_id != user_id:
+            raise HTTPException(status_code=403, detail="Forbidden")
+        question = next((q for q in test.questions if q.id == question_id), None)
+        if not question:
+            raise HTTPException(status_code=404, detail="Question not found")
+        if question.q_type not in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER}:
+            raise HTTPException(status_code=400, detail="Question is not manually graded")
+
+        rows = await self.repo.list_for_grading(test_id)
+        answers = []
+        graded: dict[UUID, float] = {}
+        for row in rows:
+            row_answers = stored_answers(test.questions, row.answers_json, row.answers_schema_version)
+            answers.append((row.id, row_answers.get(str(question_id), "")))
+            grade = next((g for g in row.manual_grades if g.question_id == question_id), None)
+            if grade is not None:
+                graded[row.id] = float(grade.score)
+
+        clusters = cluster_answers(answers, threshold=threshold)
+        return {
+            "questionId": str(question_id),
+            "totalAnswers": len(answers),
+            "clusters": [
+                {
+                    "representative": cluster.representative,
+                    "size": cluster.size,
+                    "submissionIds": cluster.submission_ids,
+                    "variants": [
+                        {"text": text, "count": count} for text, count in cluster.variants.items()
+                    ],
+                    "gradedCount": sum(1 for sid in cluster.submission_ids if sid in graded),
+                }
+                for cluster in clusters
+            ],
+        }
+
+    async def question_stats(self, test_id: int, question_id: UUID) -> dict:
+        test = await self.test_service.get_compiled_test_or_404(test_id)
+        if not any(q.id == question_id for q in test.questions):
+            raise HTTPException(status_code=404, detail="Question not found")
+        result = await self.all_question_stats(test_id, test=test)
+        question = next(item for item in result["questions"] if item["questionId"] == str(question_id))
+        return {**question, "computedAt": result["computedAt"]}
+
+    async def all_question_stats(self, test_id: int, test: CompiledTest | None = None) -> dict:
+        test = test or await self.test_service.get_compiled_test_or_404(test_id)
+        snapshot = await self.analytics.snapshot(test_id)
+        stored = {item["questionId"]: item for item in (snapshot.payload_json["questions"] if snapshot else [])}
+        # Questions added since the last rebuild are listed without responses until the next one.
+        questions = [stored.get(item["questionId"], item) for item in question_distributions(test, {}, 0)]
+        return {
+            "testId": test.id,
+            "totalResponses": questions[0]["totalResponses"] if questions else 0,
+            "questions": questions,
+            "computedAt": snapshot.computed_at if snapshot else None,
+        }
+
     async def finalize_submission(
         self, test_id: int, submission_id: UUID, user_id: UUID, override: float | None
     ) -> dict:
@@ -166,68 +469,111 @@ class SubmissionService:
         if test.scoring_type == ScoringType.RASCH:
             if override is not None:
                 raise HTTPException(status_code=400, detail="Rasch final score override qo'llab-quvvatlanmaydi")
-            await self._finalize_rasch_for_test(
-                test=test,
-                triggering_submission_id=submission_id,
-                reviewer_id=user_id,
-                override=None,
-            )
-            refreshed = await self.repo.get(submission_id)
-            if not refreshed:
-                raise HTTPException(status_code=404, detail="Submission not found")
+            # ``submission`` is the same identity the grading pass updates, so it needs no reload.
+            await self._finalize_rasch_for_test(test=test, reviewer_id=user_id)
             await self.db.commit()
-            return self.serialize_submission(refreshed, test=test)
+            await leaderboard_hub.publish(test_id)
+            return self.serialize_submission(submission, test=test)
 
         manual_total, _, _ = self._manual_component(submission=submission, test=test)
+        if submission.status != SubmissionStatus.COMPLETED:
+            await self.stats.mark_completed(test_id)
         submission.final_score = submission.auto_score + manual_total
         submission.status = SubmissionStatus.COMPLETED
         submission.reviewed_at = datetime.now(UTC)
         submission.review_by = user_id
+        await self.db.flush()
+        await self.leaderboard_repo.sync(test_id, [submission_id])
         await self.db.commit()
+        await leaderboard_hub.publish(test_id)
         await self.db.refresh(submission)
         return self.serialize_submission(submission, test=test)
 
-    async def leaderboard(self, test_id: int) -> dict:
+    async def bulk_finalize(
+        self,
+        test_id: int,
+        user_id: UUID,
+        submission_ids: list[UUID] | None,
+        fully_graded_only: bool = False,
+    ) -> dict:
         test = await self.test_service.get_test_or_404(test_id)
-        await self._auto_finalize_rasch_if_ready(test)
-        rows = await self.repo.list_for_test(test_id, include_manual_grades=False)
-        ranked = sorted(
-            [s for s in rows if s.status == SubmissionStatus.COMPLETED and s.final_score is not None],
-            key=lambda x: (-float(x.final_score or 0), x.submitted_at),
-        )
-        pending = sorted(
-            [s for s in rows if s.status != SubmissionStatus.COMPLETED],
-            key=lambda x: x.submitted_at,
-            reverse=True,
+        if test.creator_id != user_id:
+            raise HTTPException(status_code=403, detail="Forbidden")
+        if test.creator_plan_snapshot == PlanCode.FREE:
+            raise HTTPException(status_code=400, detail="Finalize requires pro")
+        if test.scoring_type == ScoringType.RASCH:
+            raise HTTPException(status_code=400, detail="Rasch tests are finalized per test, not in bulk")
+
+        if submission_ids is not None:
+            submission_ids = list(dict.fromkeys(submission_ids))
+            existing = await self.repo.existing_ids_for_test(test_id, submission_ids)
+            missing = [str(submission_id) for submission_id in submission_ids if submission_id not in existing]
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Submissions not found: {', '.join(missing)}")
+
+        required_manual_count = None
+        if fully_graded_only:
+            required_manual_count = sum(
+                1 for q in test.questions if q.q_type in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER}
+            )
+        finalized = await self.repo.finalize_classic(
+            test_id=test_id,
+            reviewer_id=user_id,
+            reviewed_at=datetime.now(UTC),
+            submission_ids=submission_ids,
+            required_manual_count=required_manual_count,
         )
+        if finalized:
+            await self.stats.recount(test_id)
+            await self.leaderboard_repo.sync(test_id, finalized)
+        await self.db.commit()
+        if finalized:
+            await leaderboard_hub.publish(test_id)
+        return {"finalizedCount": len(finalized), "submissionIds": finalized}
+
+    async def leaderboard(
+        self,
+        test_id: int,
+        limit: int | None = None,
+        ranked_cursor: str | None = None,
+        pending_cursor: str | None = None,
+    ) -> dict:
+        test = await self.test_service.get_compiled_test_or_404(test_id)
+        page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        ranked_after = self._decode_keyset(ranked_cursor, (float, datetime.fromisoformat, UUID))
+        pending_before = self._decode_keyset(pending_cursor, (datetime.fromisoformat, UUID))
+        await self._auto_finalize_rasch_if_ready(test)
+        stats = await self.stats.get(test_id)
+        ranked = await self.leaderboard_repo.ranked(test_id, page_size + 1, after=ranked_after)
+        pending = await self.leaderboard_repo.pending(test_id, page_size + 1, before=pending_before)
+        next_ranked = next_pending = None
+        if len(ranked) > page_size:
+            last = ranked[page_size - 1]
+            next_ranked = encode_cursor([last.final_score, last.submitted_at.isoformat(), str(last.submission_id)])
+        if len(pending) > page_size:
+            last = pending[page_size - 1]
+            next_pending = encode_cursor([last.submitted_at.isoformat(), str(last.submission_id)])
         return {
-            "ranked": [
-                {
-                    "id": s.id,
-                    "participant": self._participant(s),
-                    "finalScore": float(s.final_score or 0),
-                    "submittedAt": s.submitted_at,
-                }
-                for s in ranked
-            ],
-            "pending": [
-                {
-                    "id": s.id,
-                    "participant": self._participant(s),
-                    "submittedAt": s.submitted_at,
-                    "status": s.status.value,
-                }
-                for s in pending
-            ],
+            **leaderboard_rows(ranked[:page_size], pending[:page_size]),
             "stats": {
-                "ranked": len(ranked),
-                "pending": len(pending),
-                "total": len(rows),
+                "ranked": stats.completed if stats else 0,
+                "pending": stats.pending if stats else 0,
+                "total": stats.total if stats else 0,
             },
-            "raschStats": self._build_rasch_stats(test=test, rows=rows),
+            "raschStats": await self._rasch_stats(test),
+            "nextRankedCursor": next_ranked,
+            "nextPendingCursor": next_pending,
         }
 
-    def serialize_submission(self, row: Submission, test: Test | None = None) -> dict:
+    async def _rasch_stats(self, test: CompiledTest) -> dict | None:
+        if test.scoring_type != ScoringType.RASCH:
+            return None
+        snapshot = await self.analytics.snapshot(test.id)
+        if snapshot is None or snapshot.payload_json.get("raschStats") is None:
+            return None
+        return {**snapshot.payload_json["raschStats"], "computedAt": snapshot.computed_at}
+
+    def serialize_submission(self, row: Submission, test: Test | CompiledTest | None = None) -> dict:
         state = inspect(row)
         if "manual_grades" in state.unloaded:
             manual = {}
@@ -235,7 +581,7 @@ class SubmissionService:
             manual = {str(g.question_id): float(g.score) for g in row.manual_grades}
         answers = row.answers_json
         if test is not None:
-            answers, _ = canonicalize_answers(test.questions, row.answers_json)
+            answers = stored_answers(test.questions, row.answers_json, row.answers_schema_version)
         return {
             "id": row.id,
             "testId": row.test_id,
@@ -251,14 +597,9 @@ class SubmissionService:
         }
 
     def _participant(self, row: Submission) -> dict:
-        return {
-            "fullName": row.participant_full_name,
-            "phone": row.participant_secondary,
-            "fields": row.participant_fields_json,
-            "attemptValue": row.participant_attempt_value,
-        }
+        return serialize_participant(row)
 
-    def _manual_component(self, submission: Submission, test: Test) -> tuple[float, float, bool]:
+    def _manual_component(self, submission: Submission, test: Test | CompiledTest) -> tuple[float, float, bool]:
         manual_questions = {
             str(q.id): q
             for q in test.questions
@@ -282,141 +623,22 @@ class SubmissionService:
 
         return total, total_max, all_graded
 
-    def _build_rasch_stats(self, test: Test, rows: list[Submission]) -> dict | None:
-        if test.scoring_type != ScoringType.RASCH or not rows:
-            return None
-
-        objective_questions = [
-            q
-            for q in test.questions
-            if q.q_type in {
-                QuestionType.MULTIPLE_CHOICE,
-                QuestionType.TRUE_FALSE,
-                QuestionType.TWO_PART_WRITTEN,
-                QuestionType.TWO_PART_MATH,
-            }
-        ]
-        if not objective_questions:
-            return None
-
-        objective_items: list[dict] = []
-        for q in objective_questions:
-            if q.q_type in TWO_PART_TYPES:
-                objective_items.append({"item_id": f"{q.id}:first", "question": q, "part": "first"})
-                objective_items.append({"item_id": f"{q.id}:second", "question": q, "part": "second"})
-            else:
-                objective_items.append({"item_id": str(q.id), "question": q, "part": None})
-
-        item_ids = [item["item_id"] for item in objective_items]
-        matrix: list[list[int]] = []
-        for row in rows:
-            row_answers, changed = canonicalize_answers(test.questions, row.answers_json)
-            if changed:
-                row.answers_json = row_answers
-            row_vector: list[int] = []
-            for item in objective_items:
-                q = item["question"]
-                ans = row_answers.get(str(q.id), "")
-                if q.q_type in TWO_PART_TYPES:
-                    is_first, is_second, _, _ = two_part_part_results(q, ans)
-                    row_vector.append(1 if (is_first if item["part"] == "first" else is_second) else 0)
-                else:
-                    row_vector.append(1 if is_question_correct(q, ans) else 0)
-            matrix.append(row_vector)
-
-        item_stats = summarize_rasch_items(item_ids=item_ids, matrix=matrix)
-        item_stat_map = {stat.item_id: stat for stat in item_stats}
-
-        question_stats: list[dict] = []
-        for q in objective_questions:
-            if q.q_type in TWO_PART_TYPES:
-                related_ids = [f"{q.id}:first", f"{q.id}:second"]
-            else:
-                related_ids = [str(q.id)]
-            related_stats = [item_stat_map[item_id] for item_id in related_ids if item_id in item_stat_map]
-            if not related_stats:
-                continue
-            correct_count = sum(item.correct_count for item in related_stats)
-            incorrect_count = sum(item.incorrect_count for item in related_stats)
-            total_count = sum(item.total_count for item in related_stats)
-            accuracy = (correct_count / total_count) if total_count > 0 else 0.0
-            question_stats.append(
-                {
-                    "questionId": str(q.id),
-                    "label": f"{q.sort_order + 1}-savol",
-                    "contentPreview": self._question_preview(q.content_html),
-                    "correctCount": correct_count,
-                    "incorrectCount": incorrect_count,
-                    "totalCount": total_count,
-                    "accuracy": round(accuracy, 4),
-                    "itemCount": len(related_stats),
-                }
-            )
-
-        if not question_stats:
-            return None
-
-        ordered = sorted(
-            question_stats,
-            key=lambda item: (-float(item["accuracy"]), -int(item["correctCount"]), item["label"]),
-        )
-        reverse_ordered = sorted(
-            question_stats,
-            key=lambda item: (float(item["accuracy"]), -int(item["incorrectCount"]), item["label"]),
-        )
-
-        return {
-            "totalSubmissions": len(rows),
-            "easiestQuestion": ordered[0],
-            "hardestQuestion": reverse_ordered[0],
-            "questionStats": question_stats,
-        }
-
-    def _question_preview(self, html: str, limit: int = 140) -> str:
-        text = " ".join(str(html or "").replace("<", " <").replace(">", "> ").split())
-        cleaned = []
-        inside_tag = False
-        for ch in text:
-            if ch == "<":
-                inside_tag = True
-                continue
-            if ch == ">":
-                inside_tag = False
-                cleaned.append(" ")
-                continue
-            if not inside_tag:
-                cleaned.append(ch)
-        plain = " ".join("".join(cleaned).split())
-        if len(plain) <= limit:
-            return plain
-        return f"{plain[: max(limit - 1, 0)].rstrip()}…"
-
-    async def _auto_finalize_rasch_if_ready(self, test: Test) -> None:
+    async def _auto_finalize_rasch_if_ready(self, test: Test | CompiledTest) -> None:
         if test.scoring_type != ScoringType.RASCH:
             return
         if datetime.now(UTC) < test.end_time:
             return
 
-        rows = await self.repo.list_for_test(test.id, include_manual_grades=False)
-        if not rows:
+        stats = await self.stats.get(test.id)
+        if stats is None or not stats.pending:
             return
 
-        await self._finalize_rasch_for_test(
-            test=test,
-            triggering_submission_id=rows[0].id,
-            reviewer_id=test.creator_id,
-            override=None,
-        )
+        await self._finalize_rasch_for_test(test=test, reviewer_id=test.creator_id)
         await self.db.commit()
+        await leaderboard_hub.publish(test.id)
 
-    async def _finalize_rasch_for_test(
-        self,
-        test: Test,
-        triggering_submission_id: UUID,
-        reviewer_id: UUID,
-        override: float | None,
-    ) -> None:
-        all_rows = await self.repo.list_for_test(test.id)
+    async def _finalize_rasch_for_test(self, test: Test | CompiledTest, reviewer_id: UUID) -> None:
+        all_rows = await self.repo.list_for_grading(test.id)
         objective_questions = [
             q
             for q in test.questions
@@ -438,6 +660,7 @@ class SubmissionService:
                 if row.status == SubmissionStatus.COMPLETED:
                     row.reviewed_at = datetime.now(UTC)
                     row.review_by = reviewer_id
+            await self._refresh_projections(test.id)
             return
 
         objective_items: list[dict] = []
@@ -456,22 +679,21 @@ class SubmissionService:
 
         item_ids = [item["item_id"] for item in objective_items]
         submission_ids: list[UUID] = []
+        grader = CohortGrader()
         matrix: list[list[int]] = []
 
         for row in all_rows:
-            row_answers, changed = canonicalize_answers(test.questions, row.answers_json)
-            if changed:
-                row.answers_json = row_answers
+            row_answers = stored_answers(test.questions, row.answers_json, row.answers_schema_version)
             submission_ids.append(row.id)
             row_vector: list[int] = []
             for item in objective_items:
                 q = item["question"]
                 ans = row_answers.get(str(q.id), "")
                 if q.q_type in TWO_PART_TYPES:
-                    is_first, is_second, _, _ = two_part_part_results(q, ans)
+                    is_first, is_second, _, _ = grader.part_results(q, ans)
                     row_vector.append(1 if (is_first if item["part"] == "first" else is_second) else 0)
                 else:
-                    row_vector.append(1 if is_question_correct(q, ans) else 0)
+                    row_vector.append(1 if grader.is_correct(q, ans) else 0)
             matrix.append(row_vector)
 
         estimate = estimate_rasch_1pl(
@@ -488,3 +710,61 @@ class SubmissionService:
             row.status = SubmissionStatus.COMPLETED
             row.reviewed_at = now
             row.review_by = reviewer_id
+        await self._refresh_projections(test.id)
+
+    async def backfill_answers(self, batch_size: int) -> int:
+        """Write ``submission_answers`` rows for submissions stored before the table existed."""
+        tests: dict[int, CompiledTest | None] = {}
+        after: UUID | None = None
+        stored = 0
+        while True:
+            rows = await self.repo.answers_after(after, batch_size)
+            if not rows:
+                return stored
+            values: list[dict] = []
+            for submission_id, test_id, answers_json, schema_version in rows:
+                test = await self._compiled_for_batch(tests, test_id)
+                if test is None:
+                    continue
+                canonical_answers = stored_answers(test.questions, answers_json, schema_version)
+                values.extend(
+                    answer_rows(
+                        submission_id, test_id, score_answers(test.questions, canonical_answers, test.scoring_type)
+                    )
+                )
+            await self.answers_repo.add(values)
+            await self.db.commit()
+            stored += len(rows)
+            after = rows[-1][0]
+
+    async def migrate_answers_schema(self, batch_size: int) -> int:
+        """Canonicalize legacy ``answers_json`` rows in place so reads can skip the remap."""
+        tests: dict[int, CompiledTest | None] = {}
+        after: UUID | None = None
+        migrated = 0
+        while True:
+            rows = await self.repo.answers_after(after, batch_size, legacy_only=True)
+            if not rows:
+                return migrated
+            canonical: dict[UUID, dict] = {}
+            for submission_id, test_id, answers_json, _ in rows:
+                test = await self._compiled_for_batch(tests, test_id)
+                if test is not None:
+                    canonical[submission_id] = canonicalize_answers(test.questions, answers_json)[0]
+            await self.repo.store_canonical_answers(canonical)
+            await self.db.commit()
+            migrated += len(canonical)
+            after = rows[-1][0]
+
+    async def _compiled_for_batch(self, tests: dict[int, CompiledTest | None], test_id: int) -> CompiledTest | None:
+        if test_id not in tests:
+            try:
+                tests[test_id] = await self.test_service.get_compiled_test_or_404(test_id)
+            except HTTPException:
+                tests[test_id] = None
+        return tests[test_id]
+
+    async def _refresh_projections(self, test_id: int) -> None:
+        await self.db.flush()
+        await self.stats.recount(test_id)
+        await self.leaderboard_repo.sync(test_id)
@@ -3,13 +3,19 @@ import json
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.constants import DEFAULT_FREE_LIMITS, PlanCode, QuestionType, ScoringType
-from app.models.domain import ParticipantField, Question, QuestionOption, Submission, Test
+from app.db.loader import loader_cache
+from app.models.domain import ParticipantField, Question, QuestionOption, Test
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.repositories.attempt_repository import AttemptRepository
 from app.repositories.registration_repository import RegistrationRepository
 from app.repositories.test_repository import TestRepository
+from app.schemas.tests import SessionConfigOut, TestDetailOut
+from app.services.attempt_session import AttemptSessionService
+from app.services.compiled_test import CompiledTest, compile_test, get_compiled_test_cache
+from app.services.payload_cache import EncodedPayload, encode_payload, public_payload_cache
 from app.services.plan_service import PlanService
 from app.utils.phone import normalize_phone_e164
 from app.utils.html import sanitize_rich_html
@@ -22,6 +28,8 @@ class TestService:
         self.db = db
         self.repo = TestRepository(db)
         self.registration_repo = RegistrationRepository(db)
+        self.attempt_repo = AttemptRepository(db)
+        self.analytics_repo = AnalyticsRepository(db)
         self.plan_service = PlanService(db)
 
     async def list_creator_tests(self, creator_id: UUID) -> list[dict]:
@@ -45,11 +53,33 @@ class TestService:
         return output
 
     async def get_test_or_404(self, test_id: int) -> Test:
-        row = await self.repo.get_by_id(test_id)
-        if not row:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Test not found")
+        loaded = loader_cache(self.db, "tests")
+        row = loaded.get(test_id)
+        if row is None:
+            row = await self.repo.get_by_id(test_id)
+            if not row:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Test not found")
+            loaded[test_id] = row
         return row
 
+    async def get_compiled_test_or_404(self, test_id: int) -> CompiledTest:
+        loaded = loader_cache(self.db, "compiled_tests")
+        compiled = loaded.get(test_id)
+        if compiled is not None:
+            return compiled
+        # The version is read from the database, so every process sees an edit as soon as it commits.
+        version = await self.repo.version(test_id)
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Test not found")
+        cache = get_compiled_test_cache()
+        compiled = await cache.get(test_id, version)
+        if compiled is None:
+            row = await self.get_test_or_404(test_id)
+            compiled = compile_test(row, row.version)
+            await cache.put(compiled)
+        loaded[test_id] = compiled
+        return compiled
+
     async def create_test(self, creator_id: UUID, payload: dict) -> dict:
         user_plan = await self.plan_service.get_user_plan(creator_id)
         existing_tests_count = await self.repo.count_creator_tests(creator_id)
@@ -90,6 +120,7 @@ class TestService:
             raise HTTPException(status_code=403, detail="Forbidden")
         test_data = payload.get("testData")
         questions = payload.get("questions")
+        answer_key = self._answer_key(row)
         if test_data:
             self._validate_rasch_configuration(
                 test_data["scoringType"],
@@ -112,7 +143,10 @@ class TestService:
                 questions,
             )
             self._replace_questions(row, questions)
+        await self.repo.bump_version(test_id, answer_key_changed=self._answer_key(row) != answer_key)
+        await self.analytics_repo.mark_stale(test_id)
         await self.db.commit()
+        get_compiled_test_cache().invalidate(test_id)
         updated = await self.get_test_or_404(test_id)
         return self.serialize_test_detail(updated)
 
@@ -122,15 +156,39 @@ class TestService:
             raise HTTPException(status_code=403, detail="Forbidden")
         await self.repo.delete(row)
         await self.db.commit()
+        get_compiled_test_cache().invalidate(test_id)
 
     async def session_config(self, test_id: int) -> dict:
-        row = await self.get_test_or_404(test_id)
+        row = await self.get_compiled_test_or_404(test_id)
+        return self._session_config(row, self._session_status(row))
+
+    async def session_config_payload(self, test_id: int) -> EncodedPayload:
+        row = await self.get_compiled_test_or_404(test_id)
+        status_txt = self._session_status(row)
+        key = (row.id, "session-config", status_txt)
+        cached = public_payload_cache.get(key, row)
+        if cached is None:
+            cached = encode_payload(SessionConfigOut, self._session_config(row, status_txt))
+            public_payload_cache.put(key, row, cached)
+        return cached
+
+    async def public_detail_payload(self, row: CompiledTest) -> EncodedPayload:
+        key = (row.id, "detail")
+        cached = public_payload_cache.get(key, row)
+        if cached is None:
+            cached = encode_payload(TestDetailOut, self.serialize_test_detail(row, include_correct=False))
+            public_payload_cache.put(key, row, cached)
+        return cached
+
+    def _session_status(self, row: Test | CompiledTest) -> str:
         now = datetime.now(UTC)
-        status_txt = "active"
         if now < row.start_time:
-            status_txt = "pending"
-        elif now >= row.end_time:
-            status_txt = "ended"
+            return "pending"
+        if now >= row.end_time:
+            return "ended"
+        return "active"
+
+    def _session_config(self, row: Test | CompiledTest, status_txt: str) -> dict:
         detail = self.serialize_test_detail(row, include_correct=False)
         return {
             "id": detail["id"],
@@ -140,14 +198,15 @@ class TestService:
             "status": status_txt,
         }
 
-    async def validate_attempt(self, test_id: int, participant_value: str) -> dict:
-        row = await self.get_test_or_404(test_id)
+    async def validate_attempt(self, test_id: int, participant_value: str, client_id: str = "") -> dict:
+        row = await self.get_compiled_test_or_404(test_id)
         if not row.attempts_enabled:
             return {
                 "allowed": True,
                 "used_attempts": 0,
                 "max_attempts": row.attempts_count,
                 "reason": None,
+                **await self._start_session(row, client_id=client_id),
             }
 
         phone = normalize_phone_e164(participant_value)
@@ -168,21 +227,28 @@ class TestService:
                 "reason": "Bu telefon raqam test uchun Telegram botda ro'yxatdan o'tmagan",
             }
 
-        used_res = await self.db.execute(
-            select(func.count(Submission.id)).where(
-                Submission.test_id == test_id,
-                Submission.participant_attempt_value == phone,
-            )
-        )
-        used = int(used_res.scalar() or 0)
+        used = await self.attempt_repo.used(test_id, phone)
+        allowed = used < row.attempts_count
         return {
-            "allowed": used < row.attempts_count,
+            "allowed": allowed,
             "used_attempts": used,
             "max_attempts": row.attempts_count,
-            "reason": None if used < row.attempts_count else "Urinish limiti tugagan",
+            "reason": None if allowed else "Urinish limiti tugagan",
+            **(await self._start_session(row, phone, used) if allowed else {}),
         }
 
-    def serialize_test_detail(self, row: Test, include_correct: bool = True) -> dict:
+    async def start_session(self, test_id: int, client_id: str = "") -> dict:
+        """Anonymous attempt session for the ``session-config`` response; empty outside the test window."""
+        return await self._start_session(await self.get_compiled_test_or_404(test_id), client_id=client_id)
+
+    async def _start_session(
+        self, row: CompiledTest, subject: str = "", attempt: int = 0, client_id: str = ""
+    ) -> dict:
+        if self._session_status(row) != "active":
+            return {}
+        return await AttemptSessionService().start(row, subject, attempt, client_id)
+
+    def serialize_test_detail(self, row: Test | CompiledTest, include_correct: bool = True) -> dict:
         questions = []
         for q in sorted(row.questions, key=lambda item: item.sort_order):
             options = [o.option_html for o in sorted(q.options, key=lambda x: x.option_index)]
@@ -227,7 +293,7 @@ class TestService:
             "hasOpenQuestions": has_open,
         }
 
-    def _test_data(self, row: Test) -> dict:
+    def _test_data(self, row: Test | CompiledTest) -> dict:
         fields = sorted(row.participant_fields, key=lambda f: f.sort_order)
         return {
             "title": row.title,
@@ -332,6 +398,12 @@ class TestService:
             mapped_questions.append(q)
         test.questions = mapped_questions
 
+    def _answer_key(self, test: Test) -> tuple:
+        """Everything ``score_answers`` reads from a test; stored verdicts go stale when it changes."""
+        return ScoringType(test.scoring_type), tuple(
+            (str(q.id), QuestionType(q.q_type), q.correct_answer_text, float(q.points)) for q in test.questions
+        )
+
     def _validate_rasch_configuration(self, scoring_type: str | ScoringType, questions: list[dict] | list[Question]) -> None:
         if str(scoring_type) != ScoringType.RASCH.value:
             return
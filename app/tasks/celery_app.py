@@ -8,6 +8,7 @@ celery = Celery(
     "nexo",
     broker=settings.redis_url,
     backend=settings.redis_url,
+    include=["app.tasks.tasks"],
 )
 celery.conf.update(
     timezone="UTC",
@@ -19,7 +20,19 @@ celery.conf.update(
         "storage-cleanup-orphans": {
             "task": "app.tasks.tasks.storage_cleanup_orphans",
             "schedule": 60 * 30,
-        }
+        },
+        "submission-ingest-drain": {
+            "task": "app.tasks.tasks.submission_ingest_drain",
+            "schedule": 2.0,
+        },
+        "analytics-rebuild": {
+            "task": "app.tasks.tasks.analytics_rebuild",
+            "schedule": 15.0,
+        },
+        "drafts-purge": {
+            "task": "app.tasks.tasks.drafts_purge",
+            "schedule": 60 * 30,
+        },
     },
 )
 
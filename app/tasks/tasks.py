@@ -1,5 +1,31 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.redis import close_redis
+from app.db.session import SessionLocal, engine
 from app.tasks.celery_app import celery
 
+T = TypeVar("T")
+
+
+def _run_with_session(work: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    # Each task gets a fresh event loop, so pooled connections and Redis clients must not outlive it.
+    async def runner() -> T:
+        try:
+            async with SessionLocal() as db:
+                return await work(db)
+        finally:
+            await close_redis()
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
 
 @celery.task(name="app.tasks.tasks.submission_postprocess")
 def submission_postprocess(submission_id: str) -> dict:
@@ -17,11 +43,86 @@ def storage_cleanup_orphans() -> dict:
 
 
 @celery.task(name="app.tasks.tasks.audit_export")
-def audit_export() -> dict:
-    return {"ok": True}
+def audit_export(test_id: int, fmt: str = "csv") -> dict:
+    from app.services.export_service import SubmissionExportService
+    from app.utils.spreadsheet import make_writer
+
+    writer = make_writer(fmt)
+    export_dir = Path(get_settings().storage_local_dir) / "exports"
+    export_dir.mkdir(parents=True, exist_ok=True)
+    path = export_dir / f"test-{test_id}-{datetime.now(UTC):%Y%m%dT%H%M%S}.{writer.extension}"
+
+    async def work(db: AsyncSession) -> int:
+        service = SubmissionExportService(db)
+        test = await service.test_service.get_compiled_test_or_404(test_id)
+        written = 0
+        with path.open("wb") as fh:
+            async for chunk in service.write(test, writer):
+                written += fh.write(chunk)
+        return written
+
+    return {"ok": True, "path": str(path), "bytes": _run_with_session(work)}
 
 
 @celery.task(name="app.tasks.tasks.notifications_send")
 def notifications_send(payload: dict) -> dict:
     return {"ok": True, "payload": payload}
 
+
+
+@celery.task(name="app.tasks.tasks.submission_ingest_drain")
+def submission_ingest_drain() -> dict:
+    from app.services.ingest_service import SubmissionIngestService
+
+    batch_size = get_settings().submission_ingest_batch_size
+
+    async def work(db: AsyncSession) -> int:
+        service = SubmissionIngestService(db)
+        stored = 0
+        while True:
+            count = await service.drain(batch_size)
+            stored += count
+            if count < batch_size:
+                return stored
+
+    return {"ok": True, "stored": _run_with_session(work)}
+
+
+@celery.task(name="app.tasks.tasks.submission_answers_backfill")
+def submission_answers_backfill(batch_size: int = 1000) -> dict:
+    from app.services.submission_service import SubmissionService
+
+    async def work(db: AsyncSession) -> int:
+        return await SubmissionService(db).backfill_answers(batch_size)
+
+    return {"ok": True, "processed": _run_with_session(work)}
+
+
+@celery.task(name="app.tasks.tasks.answers_schema_migrate")
+def answers_schema_migrate(batch_size: int = 1000) -> dict:
+    from app.services.submission_service import SubmissionService
+
+    async def work(db: AsyncSession) -> int:
+        return await SubmissionService(db).migrate_answers_schema(batch_size)
+
+    return {"ok": True, "migrated": _run_with_session(work)}
+
+
+@celery.task(name="app.tasks.tasks.analytics_rebuild")
+def analytics_rebuild(limit: int = 50) -> dict:
+    from app.services.analytics_service import AnalyticsService
+
+    async def work(db: AsyncSession) -> int:
+        return await AnalyticsService(db).rebuild_stale(limit)
+
+    return {"ok": True, "rebuilt": _run_with_session(work)}
+
+
+@celery.task(name="app.tasks.tasks.drafts_purge")
+def drafts_purge() -> dict:
+    from app.services.draft_service import DraftService
+
+    async def work(db: AsyncSession) -> int:
+        return await DraftService(db).purge_ended()
+
+    return {"ok": True, "purged": _run_with_session(work)}
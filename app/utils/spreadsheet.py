@@ -0,0 +1,142 @@
+import csv
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+CSV_CHUNK_SIZE = 64 * 1024
+
+_XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+class CsvStreamWriter:
+    """Encodes rows as UTF-8 CSV (with BOM, so Excel detects the encoding) in chunks."""
+
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._buffer.write("\ufeff")
+
+    def row(self, values: list) -> bytes:
+        self._writer.writerow(["" if value is None else value for value in values])
+        if self._buffer.tell() < CSV_CHUNK_SIZE:
+            return b""
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable file that hands written bytes back to the caller."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class XlsxStreamWriter:
+    """Single-sheet XLSX written row by row into a streamed zip.
+
+    Cells are inline strings or numbers, so no shared-strings table has to be
+    held in memory; the zip uses data descriptors because the output is unseekable.
+    """
+
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    def __init__(self, sheet_name: str = "Submissions") -> None:
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        for name, content in _XLSX_STATIC_PARTS.items():
+            self._zip.writestr(name, content)
+        self._zip.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(sheet_name[:31], {chr(34): "&quot;"})}" sheetId="1" r:id="rId1"/></sheets>'
+            "</workbook>",
+        )
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        )
+
+    def row(self, values: list) -> bytes:
+        cells = []
+        for value in values:
+            if value is None or value == "":
+                cells.append("<c/>")
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append(f"<c><v>{value}</v></c>")
+            else:
+                cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{_xml_text(value)}</t></is></c>')
+        self._sheet.write(f"<row>{''.join(cells)}</row>".encode("utf-8"))
+        return self._sink.take()
+
+    def close(self) -> bytes:
+        self._sheet.write(b"</sheetData></worksheet>")
+        self._sheet.close()
+        self._zip.close()
+        return self._sink.take()
+
+
+def _xml_text(value) -> str:
+    text = escape(str(value))
+    # XML 1.0 forbids most control characters; drop them instead of producing a corrupt sheet.
+    return "".join(ch for ch in text if ch >= " " or ch in "\t\n\r")
+
+
+def make_writer(fmt: str) -> CsvStreamWriter | XlsxStreamWriter:
+    if fmt == "xlsx":
+        return XlsxStreamWriter()
+    return CsvStreamWriter()
@@ -0,0 +1,313 @@
+"""Scoring throughput benchmark.
+
+Run from the repository root:
+
+    python -m benchmarks.scoring_benchmark                    # print results
+    python -m benchmarks.scoring_benchmark --update-baseline  # write baselines/scoring.json
+    python -m benchmarks.scoring_benchmark --check            # fail on regression vs baseline
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import UUID
+
+from app.core.constants import QuestionType, ScoringType
+from app.models.domain import Question
+from app.services import scoring_service
+from app.services.scoring_service import (
+    CohortGrader,
+    auto_score_submission,
+    canonicalize_answers,
+    is_question_correct,
+)
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "scoring.json"
+
+QUESTION_MIX = [
+    (QuestionType.MULTIPLE_CHOICE, 24),
+    (QuestionType.TRUE_FALSE, 8),
+    (QuestionType.TWO_PART_WRITTEN, 10),
+    (QuestionType.TWO_PART_MATH, 10),
+    (QuestionType.SHORT_ANSWER, 5),
+    (QuestionType.ESSAY, 3),
+]
+MATH_KEYS = [
+    ("sqrt(2)", "x^2 + 2*x + 1"),
+    ("1/2", "sin(x)^2 + cos(x)^2"),
+    ("pi/4", "(x-1)*(x+1)"),
+    ("log(8)/log(2)", "2*x + 3"),
+    ("3", "x^3 - 1"),
+]
+MATH_EQUIVALENTS = {
+    "sqrt(2)": ["2^(1/2)", "√2", "sqrt(2)"],
+    "x^2 + 2*x + 1": ["(x+1)^2", "x^2+2x+1"],
+    "1/2": ["0.5", "2/4"],
+    "sin(x)^2 + cos(x)^2": ["1"],
+    "pi/4": ["π/4", "atan(1)"],
+    "(x-1)*(x+1)": ["x^2 - 1"],
+    "log(8)/log(2)": ["3", "ln(8)/ln(2)"],
+    "2*x + 3": ["3 + 2x"],
+    "3": ["9^(1/2)", "3.0"],
+    "x^3 - 1": ["(x-1)(x^2+x+1)"],
+}
+WRITTEN_KEYS = [("bo'shang", "tamga"), ("o'zbek", "g'alaba"), ("12 ta", "yuz"), ("alpha", "beta")]
+ADVERSARIAL = [
+    "",
+    " ",
+    "{not json",
+    '{"first": null}',
+    "((x+1)",
+    "x/",
+    "1/0",
+    "sqrt(-1)",
+    " −×÷",
+    "a" * 2000,
+    "\U0001D465²",
+    "DROP TABLE submissions;",
+]
+
+
+def build_questions(rng: random.Random) -> list[Question]:
+    questions: list[Question] = []
+    index = 0
+    for q_type, count in QUESTION_MIX:
+        for _ in range(count):
+            correct = ""
+            if q_type == QuestionType.MULTIPLE_CHOICE:
+                correct = str(rng.randrange(4))
+            elif q_type == QuestionType.TRUE_FALSE:
+                correct = rng.choice(["true", "false", "To'g'ri", "Noto'g'ri"])
+            elif q_type == QuestionType.TWO_PART_WRITTEN:
+                first, second = rng.choice(WRITTEN_KEYS)
+                correct = json.dumps({"first": first, "second": second}, ensure_ascii=False)
+            elif q_type == QuestionType.TWO_PART_MATH:
+                first, second = rng.choice(MATH_KEYS)
+                correct = json.dumps({"first": first, "second": second})
+            q = Question(
+                q_type=q_type,
+                content_html=f"<p>Savol {index + 1}</p>",
+                points=1,
+                correct_answer_text=correct,
+                sort_order=index,
+                test_id=1,
+            )
+            q.id = UUID(int=index + 1)
+            questions.append(q)
+            index += 1
+    rng.shuffle(questions)
+    return questions
+
+
+def _answer_for(question: Question, rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.05:
+        return rng.choice(ADVERSARIAL)
+    if question.q_type == QuestionType.MULTIPLE_CHOICE:
+        if roll < 0.6:
+            return question.correct_answer_text
+        return rng.choice(["0", "1", "2", "3", "A", "B", "c", "1.0"])
+    if question.q_type == QuestionType.TRUE_FALSE:
+        return rng.choice(["true", "false", "ha", "yo'q", "1", "0"])
+    if question.q_type == QuestionType.TWO_PART_WRITTEN:
+        key = json.loads(question.correct_answer_text)
+        if roll < 0.6:
+            first, second = key["first"], key["second"]
+        else:
+            first, second = rng.choice(WRITTEN_KEYS)
+        first = first.replace("'", rng.choice(["'", "’", "`"]))
+        return json.dumps({"first": first.upper() if roll < 0.3 else first, "second": f" {second} "})
+    if question.q_type == QuestionType.TWO_PART_MATH:
+        key = json.loads(question.correct_answer_text)
+        if roll < 0.6:
+            first = rng.choice(MATH_EQUIVALENTS[key["first"]])
+            second = rng.choice(MATH_EQUIVALENTS[key["second"]])
+        else:
+            first, second = rng.choice(MATH_KEYS)
+            first = rng.choice([first, "2", "x", "x+1"])
+        return json.dumps({"first": first, "second": second})
+    return rng.choice(["javob", "Javob ", "boshqa javob", "uzun javob " * 20])
+
+
+def build_corpus(questions: list[Question], size: int, rng: random.Random) -> list[dict[str, str]]:
+    ordered = sorted(questions, key=lambda item: item.sort_order)
+    corpus: list[dict[str, str]] = []
+    for index in range(size):
+        answers = {str(q.id): _answer_for(q, rng) for q in questions}
+        if index % 10 == 0:
+            # Legacy positional payloads exercise the canonicalization remap.
+            answers = {str(position): answers[str(q.id)] for position, q in enumerate(ordered)}
+        corpus.append(answers)
+    return corpus
+
+
+class SympyCounter:
+    def __init__(self) -> None:
+        self.parse_calls = 0
+        self.simplify_calls = 0
+        self._parse = scoring_service.parse_expr
+        self._simplify = scoring_service.simplify
+
+    def __enter__(self) -> "SympyCounter":
+        def parse(*args, **kwargs):
+            self.parse_calls += 1
+            return self._parse(*args, **kwargs)
+
+        def simplify(*args, **kwargs):
+            self.simplify_calls += 1
+            return self._simplify(*args, **kwargs)
+
+        scoring_service.parse_expr = parse
+        scoring_service.simplify = simplify
+        return self
+
+    def __exit__(self, *exc) -> None:
+        scoring_service.parse_expr = self._parse
+        scoring_service.simplify = self._simplify
+
+
+def _clear_caches() -> None:
+    scoring_service._cell_tokens.cache_clear()
+    scoring_service._two_part_key.cache_clear()
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench_auto_score(
+    questions: list[Question], corpus: list[dict[str, str]], scoring_type: ScoringType, cohort: bool
+) -> dict:
+    _clear_caches()
+    grader = CohortGrader() if cohort else None
+    latencies: list[float] = []
+    with SympyCounter() as counter:
+        started = time.perf_counter()
+        for answers in corpus:
+            t0 = time.perf_counter()
+            canonical, _ = canonicalize_answers(questions, answers)
+            auto_score_submission(questions, canonical, scoring_type, grader=grader)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+    return {
+        "submissions": len(corpus),
+        "submissions_per_second": round(len(corpus) / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "sympy_parse_calls": counter.parse_calls,
+        "sympy_simplify_calls": counter.simplify_calls,
+    }
+
+
+def bench_is_question_correct(questions: list[Question], corpus: list[dict[str, str]]) -> dict:
+    _clear_caches()
+    pairs = []
+    for answers in corpus:
+        canonical, _ = canonicalize_answers(questions, answers)
+        pairs.extend(
+            (q, canonical.get(str(q.id), ""))
+            for q in questions
+            if q.q_type not in {QuestionType.ESSAY, QuestionType.SHORT_ANSWER}
+        )
+    with SympyCounter() as counter:
+        started = time.perf_counter()
+        for q, answer in pairs:
+            is_question_correct(q, answer)
+        elapsed = time.perf_counter() - started
+    return {
+        "calls": len(pairs),
+        "calls_per_second": round(len(pairs) / elapsed, 2),
+        "sympy_parse_calls": counter.parse_calls,
+        "sympy_simplify_calls": counter.simplify_calls,
+    }
+
+
+def bench_canonicalize(questions: list[Question], corpus: list[dict[str, str]], rounds: int = 100) -> dict:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for answers in corpus:
+            canonicalize_answers(questions, answers)
+    elapsed = time.perf_counter() - started
+    calls = rounds * len(corpus)
+    return {"calls": calls, "calls_per_second": round(calls / elapsed, 2)}
+
+
+def run(size: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    questions = build_questions(rng)
+    corpus = build_corpus(questions, size, rng)
+    return {
+        "config": {"submissions": size, "questions": len(questions), "seed": seed},
+        "environment": {"python": platform.python_version(), "machine": platform.machine()},
+        "metrics": {
+            "auto_score_classic": bench_auto_score(questions, corpus, ScoringType.CLASSIC, cohort=False),
+            "auto_score_rasch": bench_auto_score(questions, corpus, ScoringType.RASCH, cohort=False),
+            "auto_score_cohort": bench_auto_score(questions, corpus, ScoringType.CLASSIC, cohort=True),
+            "is_question_correct": bench_is_question_correct(questions, corpus),
+            "canonicalize_answers": bench_canonicalize(questions, corpus),
+        },
+    }
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> list[str]:
+    failures: list[str] = []
+    for name, metrics in baseline.get("metrics", {}).items():
+        now = current["metrics"].get(name)
+        if now is None:
+            continue
+        for key, base_value in metrics.items():
+            value = now.get(key)
+            if value is None or not base_value:
+                continue
+            if key.endswith("_per_second") and value < base_value * (1 - max_regression):
+                failures.append(f"{name}.{key}: {value} < {base_value} (-{max_regression:.0%} allowed)")
+            elif key.endswith("_ms") and value > base_value * (1 + max_regression):
+                failures.append(f"{name}.{key}: {value} > {base_value} (+{max_regression:.0%} allowed)")
+            elif key.startswith("sympy_") and value > base_value:
+                failures.append(f"{name}.{key}: {value} > {base_value}")
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit non-zero on regression vs baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    result = run(args.submissions, args.seed)
+    print(json.dumps(result, indent=2))
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline}; run with --update-baseline", file=sys.stderr)
+            return 2
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != result["config"]:
+            print("baseline was recorded with a different config", file=sys.stderr)
+            return 2
+        failures = compare(result, baseline, args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+"""Leaderboard response serialization benchmark.
+
+Compares FastAPI's default response path (validate the dict through the
+``response_model``, dump it to JSON-compatible Python, encode with the stdlib
+``json``) with encoding the service's dict directly through ``ORJSONResponse``.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization_benchmark                    # print results
+    python -m benchmarks.serialization_benchmark --update-baseline  # write baselines/serialization.json
+    python -m benchmarks.serialization_benchmark --check            # fail on regression vs baseline
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.core.constants import SubmissionStatus
+from app.core.responses import ORJSONResponse
+from app.models.domain import LeaderboardEntry
+from app.schemas.submissions import LeaderboardResponse
+from app.services.submission_service import leaderboard_rows
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "serialization.json"
+
+
+def build_payload(rows: int, rng: random.Random) -> dict:
+    started = datetime(2026, 10, 19, 9, tzinfo=UTC)
+    entries = []
+    for index in range(rows):
+        name = f"Participant {index}"
+        phone = f"+99890{rng.randrange(10**7):07d}"
+        offset = timedelta(seconds=rng.randrange(3 * 3600), microseconds=rng.randrange(10**6))
+        entries.append(
+            LeaderboardEntry(
+                submission_id=UUID(int=rng.getrandbits(128)),
+                test_id=1,
+                status=SubmissionStatus.COMPLETED,
+                final_score=round(rng.uniform(0, 100), 2),
+                submitted_at=started + offset,
+                participant_full_name=name,
+                participant_secondary=phone,
+                participant_attempt_value=phone,
+                participant_fields_json={
+                    "fullName": name,
+                    "phone": phone,
+                    "region": rng.choice(["Toshkent", "Samarqand"]),
+                },
+            )
+        )
+    entries.sort(key=lambda entry: -entry.final_score)
+    return {
+        **leaderboard_rows(entries, []),
+        "stats": {"ranked": rows, "pending": 0, "total": rows},
+        "raschStats": None,
+        "nextRankedCursor": None,
+        "nextPendingCursor": None,
+    }
+
+
+def model_path(payload: dict) -> bytes:
+    # What a route with ``response_model=LeaderboardResponse`` does with a returned dict.
+    content = LeaderboardResponse.model_validate(payload).model_dump(mode="json")
+    return JSONResponse(content).body
+
+
+def orjson_path(payload: dict) -> bytes:
+    return ORJSONResponse(payload).body
+
+
+def bench(encode, payload: dict, rounds: int) -> tuple[dict, bytes]:
+    body = encode(payload)
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        encode(payload)
+        latencies.append(time.perf_counter() - started)
+    return {
+        "responses_per_second": round(rounds / sum(latencies), 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "bytes": len(body),
+    }, body
+
+
+def run(rows: int, rounds: int, seed: int) -> dict:
+    payload = build_payload(rows, random.Random(seed))
+    model, model_body = bench(model_path, payload, rounds)
+    fast, fast_body = bench(orjson_path, payload, rounds)
+    if orjson.loads(model_body) != orjson.loads(fast_body):
+        raise AssertionError("orjson response differs from the response_model output")
+    return {
+        "config": {"rows": rows, "rounds": rounds, "seed": seed},
+        "environment": {"python": platform.python_version(), "machine": platform.machine()},
+        "metrics": {
+            "leaderboard_response_model": model,
+            "leaderboard_orjson": fast,
+        },
+        "speedup": round(model["p50_ms"] / fast["p50_ms"], 2),
+    }
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> list[str]:
+    failures: list[str] = []
+    for name, metrics in baseline.get("metrics", {}).items():
+        now = current["metrics"].get(name)
+        if now is None:
+            continue
+        for key, base_value in metrics.items():
+            value = now.get(key)
+            if value is None or not base_value:
+                continue
+            if key.endswith("_per_second") and value < base_value * (1 - max_regression):
+                failures.append(f"{name}.{key}: {value} < {base_value} (-{max_regression:.0%} allowed)")
+            elif key.endswith("_ms") and value > base_value * (1 + max_regression):
+                failures.append(f"{name}.{key}: {value} > {base_value} (+{max_regression:.0%} allowed)")
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit non-zero on regression vs baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    result = run(args.rows, args.rounds, args.seed)
+    print(json.dumps(result, indent=2))
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline}; run with --update-baseline", file=sys.stderr)
+            return 2
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != result["config"]:
+            print("baseline was recorded with a different config", file=sys.stderr)
+            return 2
+        failures = compare(result, baseline, args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
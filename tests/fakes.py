@@ -0,0 +1,319 @@
+"""Shared builders and in-memory stand-ins for unit-testing services without a database or Redis."""
+
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm.util import identity_key
+
+from app.core.constants import FieldType, PlanCode, QuestionType, ScoringType, SubmissionStatus, TestType
+from app.models.domain import ParticipantField, Question, QuestionOption, Submission, Test
+from app.services.compiled_test import CompiledTest, compile_test
+from app.services.leaderboard_stream import leaderboard_hub
+
+ESSAY = UUID(int=3)
+
+
+def make_test() -> Test:
+    row = Test(
+        id=7,
+        creator_id=uuid4(),
+        title="Algebra",
+        description="",
+        start_time=datetime(2026, 1, 1, tzinfo=UTC),
+        end_time=datetime(2026, 1, 2, tzinfo=UTC),
+        duration_minutes=60,
+        attempts_count=1,
+        attempts_enabled=False,
+        registration_window_hours=None,
+        scoring_type=ScoringType.CLASSIC,
+        test_type=TestType.EXAM,
+        creator_plan_snapshot=PlanCode.PRO,
+        created_at=datetime(2025, 12, 31, tzinfo=UTC),
+    )
+    second = Question(q_type=QuestionType.TRUE_FALSE, content_html="b", points=1, correct_answer_text="true", sort_order=1)
+    first = Question(q_type=QuestionType.MULTIPLE_CHOICE, content_html="a", points=1, correct_answer_text="B", sort_order=0)
+    first.id = UUID(int=1)
+    second.id = UUID(int=2)
+    first.options = [QuestionOption(option_index=1, option_html="y"), QuestionOption(option_index=0, option_html="x")]
+    row.questions = [second, first]
+    row.participant_fields = [
+        ParticipantField(field_key="fullName", label="Ism", field_type=FieldType.TEXT, required=True, locked=True, sort_order=0)
+    ]
+    return row
+
+
+def essay_test() -> Test:
+    """``make_test`` plus a manually graded essay (``ESSAY``) worth 5 points."""
+    row = make_test()
+    essay = Question(q_type=QuestionType.ESSAY, content_html="c", points=5, correct_answer_text="", sort_order=2)
+    essay.id = ESSAY
+    essay.options = []
+    row.questions = [*row.questions, essay]
+    return row
+
+
+def open_test(hours: int = 1, **changes) -> CompiledTest:
+    """Compiled ``make_test`` that started ``hours`` ago and ends ``hours`` from now."""
+    now = datetime.now(UTC)
+    return replace(
+        compile_test(make_test(), version=1),
+        start_time=now - timedelta(hours=hours),
+        end_time=now + timedelta(hours=hours),
+        **changes,
+    )
+
+
+def make_submission(test, **changes) -> Submission:
+    row = Submission(
+        id=uuid4(),
+        test_id=test.id,
+        participant_full_name="Ali",
+        participant_secondary="",
+        participant_attempt_value="Ali",
+        participant_fields_json={},
+        answers_json={str(UUID(int=1)): "1", str(UUID(int=2)): "true"},
+        answers_schema_version=1,
+        auto_score=2.0,
+        auto_max_score=2.0,
+        final_score=None,
+        status=SubmissionStatus.PENDING_REVIEW,
+        submitted_at=datetime.now(UTC) - timedelta(hours=2),
+        reviewed_at=None,
+    )
+    row.manual_grades = []
+    for name, value in changes.items():
+        setattr(row, name, value)
+    return row
+
+
+def build(service_cls, **collaborators):
+    """A service instance without running ``__init__``, wired to the given fakes."""
+    service = service_cls.__new__(service_cls)
+    vars(service).update(collaborators)
+    return service
+
+
+def mute_leaderboard(monkeypatch) -> None:
+    async def publish(test_id):
+        pass
+
+    monkeypatch.setattr(leaderboard_hub, "publish", publish)
+
+
+class FakeResult:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeDb:
+    """``AsyncSession`` stand-in; ``loaded`` submissions make up its identity map."""
+
+    def __init__(self, loaded=()):
+        self.info = {}
+        self.identity_map = {identity_key(Submission, row.id): row for row in loaded}
+        self.executed: list[tuple] = []
+        self.refreshed: list[tuple] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+        return FakeResult()
+
+    async def flush(self):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def refresh(self, row, attribute_names=None):
+        self.refreshed.append((row, attribute_names))
+
+
+class RecordingSession:
+    """Keeps the PostgreSQL SQL of every statement; each returns ``rows``."""
+
+    def __init__(self, rows=()):
+        self.rows = rows
+        self.statements: list[str] = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows)
+
+
+class CountingRepo:
+    """Any async method; records the call and returns ``results[name]``."""
+
+    def __init__(self, **results):
+        self.results = results
+        self.calls: list[str] = []
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            self.calls.append(name)
+            return self.results.get(name)
+
+        return call
+
+
+class FakeTests:
+    """``TestService`` stand-in: ``row`` answers fresh loads and ``compiled`` the cached one."""
+
+    def __init__(self, compiled=None, row=None):
+        self.compiled = compiled
+        self.row = row
+
+    async def get_compiled_test_or_404(self, test_id):
+        if self.compiled is None:
+            raise AssertionError("the compiled-test cache must not be read here")
+        return self.compiled
+
+    async def get_test_or_404(self, test_id):
+        if self.row is None:
+            raise AssertionError("a fresh test load was not expected here")
+        return self.row
+
+
+class FakeStats:
+    def __init__(self, total=0, pending=0, completed=0):
+        self.counts = SimpleNamespace(total=total, pending=pending, completed=completed)
+        self.recorded: list[dict] = []
+
+    async def get(self, test_id):
+        return self.counts
+
+    async def record(self, test_id, **kwargs):
+        self.recorded.append(kwargs)
+        return True
+
+
+class FakeRows:
+    """Leaderboard or answer projection; keeps what was added."""
+
+    def __init__(self):
+        self.rows: list[dict] = []
+
+    async def add(self, rows):
+        self.rows.extend(rows)
+
+
+class InMemorySubmissions:
+    """``SubmissionRepository`` over a dict, with the unique index on ``(test_id, idempotency_key)``."""
+
+    def __init__(self, rows=()):
+        self.rows = {row.id: row for row in rows}
+        self.upserted: list[dict] = []
+        self.finalize_calls: list[dict] = []
+
+    async def get(self, submission_id):
+        return self.rows.get(submission_id)
+
+    async def get_by_idempotency_key(self, test_id, idempotency_key):
+        return next(
+            (row for row in self.rows.values() if (row.test_id, row.idempotency_key) == (test_id, idempotency_key)),
+            None,
+        )
+
+    async def insert_many_idempotent(self, rows):
+        inserted = []
+        for row in rows:
+            if row["idempotency_key"] and await self.get_by_idempotency_key(row["test_id"], row["idempotency_key"]):
+                continue
+            self.rows[row["id"]] = SimpleNamespace(**row)
+            inserted.append((row["id"], row["test_id"], row["status"]))
+        return inserted
+
+    async def existing_ids_for_test(self, test_id, submission_ids):
+        return {
+            submission_id
+            for submission_id in submission_ids
+            if submission_id in self.rows and self.rows[submission_id].test_id == test_id
+        }
+
+    async def upsert_manual_grades(self, rows):
+        self.upserted.extend(rows)
+        return len(rows)
+
+    async def finalize_classic(self, **kwargs):
+        self.finalize_calls.append(kwargs)
+        return []
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """The string and hash commands the services use, replayed in order by ``pipeline``."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.expiry: dict[str, datetime] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value).encode()
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def hexists(self, key, field):
+        return field in self.hashes.get(key, {})
+
+    async def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+        return int(fields[field])
+
+    async def expireat(self, key, when):
+        self.expiry[key] = when
+
+    async def hgetall(self, key):
+        return {k.encode(): v.encode() for k, v in self.hashes.get(key, {}).items()}
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+        self.values.pop(key, None)
@@ -0,0 +1,88 @@
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.attempt_session import AttemptSessionService
+from tests.fakes import FakeRedis, open_test
+
+SECRET = "test-attempt-session-secret-0123456789"
+CLIENT = str(uuid4())
+
+
+async def test_token_within_duration_is_accepted_and_deadline_capped_by_end_time():
+    redis = FakeRedis()
+    service = AttemptSessionService(redis_factory=lambda: redis, enforced=True, grace_seconds=0, secret_key=SECRET)
+    test = open_test(hours=2, duration_minutes=600)
+
+    session = await service.start(test, client_id=CLIENT)
+
+    assert session["deadline"] == test.end_time
+    assert service.check(test, session["session_token"]) is None
+    assert service.check(replace(test, id=8), session["session_token"]) == "Invalid attempt session"
+
+
+async def test_expired_or_missing_token_is_refused_only_when_required():
+    test = open_test(hours=2, duration_minutes=0)
+    redis = FakeRedis()
+    enforced = AttemptSessionService(redis_factory=lambda: redis, enforced=True, grace_seconds=-5, secret_key=SECRET)
+    relaxed = AttemptSessionService(redis_factory=lambda: None, enforced=False, grace_seconds=-5, secret_key=SECRET)
+
+    session = await enforced.start(test, client_id=CLIENT)
+
+    assert enforced.check(test, session["session_token"]) == "Test duration exceeded"
+    assert enforced.check(test, None) == "Attempt session required"
+    assert relaxed.check(test, None) is None
+    assert relaxed.check(test, "garbage") == "Invalid attempt session"
+
+
+async def test_identified_sessions_keep_their_start_and_are_bound_to_the_participant():
+    redis = FakeRedis()
+    service = AttemptSessionService(redis_factory=lambda: redis, enforced=True, grace_seconds=0, secret_key=SECRET)
+    test = open_test(hours=2, attempts_enabled=True)
+    phone = "+998901234567"
+    redis.values[f"nexo:attempt-session:{test.id}:{phone}:0"] = str(
+        int((datetime.now(UTC) - timedelta(minutes=30)).timestamp())
+    ).encode()
+
+    session = await service.start(test, phone, 0)
+    next_attempt = await service.start(test, phone, 1)
+
+    assert datetime.now(UTC) - session["started_at"] >= timedelta(minutes=30)
+    assert next_attempt["deadline"] - session["deadline"] >= timedelta(minutes=29)
+    assert service.check(test, session["session_token"], phone) is None
+    assert service.check(test, session["session_token"], "+998900000000") == "Invalid attempt session"
+
+
+async def test_anonymous_sessions_are_pinned_to_their_client_id():
+    redis = FakeRedis()
+    service = AttemptSessionService(redis_factory=lambda: redis, enforced=True, grace_seconds=0, secret_key=SECRET)
+    test = open_test(hours=2)
+    redis.values[f"nexo:attempt-session:{test.id}:client:{CLIENT}:0"] = str(
+        int((datetime.now(UTC) - timedelta(minutes=30)).timestamp())
+    ).encode()
+
+    again = await service.start(test, client_id=CLIENT)
+    other = await service.start(test, client_id=str(uuid4()))
+
+    assert datetime.now(UTC) - again["started_at"] >= timedelta(minutes=30)
+    assert other["started_at"] > again["started_at"]
+
+
+async def test_enforced_sessions_fail_closed_when_the_start_cannot_be_pinned():
+    test = open_test(hours=2)
+    without_redis = AttemptSessionService(redis_factory=lambda: None, enforced=True, grace_seconds=0, secret_key=SECRET)
+    relaxed = AttemptSessionService(redis_factory=lambda: None, enforced=False, grace_seconds=0, secret_key=SECRET)
+
+    with pytest.raises(HTTPException) as unavailable:
+        await without_redis.start(test, client_id=CLIENT)
+    with pytest.raises(HTTPException) as anonymous:
+        await AttemptSessionService(
+            redis_factory=FakeRedis, enforced=True, grace_seconds=0, secret_key=SECRET
+        ).start(test)
+
+    assert unavailable.value.status_code == 503
+    assert anonymous.value.status_code == 400
+    assert relaxed.check(test, (await relaxed.start(test))["session_token"]) is None
@@ -0,0 +1,15 @@
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.attempt_repository import reserve_attempt_statement
+
+
+def test_reserve_attempt_is_single_conditional_upsert():
+    sql = str(
+        reserve_attempt_statement(7, "+998901234567", 3).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert sql.startswith("INSERT INTO participant_attempts")
+    assert "ON CONFLICT (test_id, attempt_value) DO UPDATE SET used = (participant_attempts.used + 1)" in sql
+    assert "WHERE participant_attempts.used < 3" in sql
+    assert sql.endswith("RETURNING participant_attempts.used")
@@ -0,0 +1,76 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.submission_repository import finalize_classic_statement
+from app.services.submission_service import SubmissionService
+from tests.fakes import FakeDb, FakeTests, InMemorySubmissions, build, essay_test, make_submission
+
+
+def compiled_sql(**kwargs) -> str:
+    stmt = finalize_classic_statement(7, uuid4(), datetime(2026, 10, 19, tzinfo=UTC), **kwargs)
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_finalize_clamps_manual_grades_to_question_points():
+    sql = compiled_sql()
+    assert "final_score=(submissions.auto_score + (SELECT coalesce(sum(" in sql
+    assert "least(greatest(manual_grades.score, 0.0), greatest(questions.points, 1.0))" in sql
+    assert "questions.q_type IN ('ESSAY', 'SHORT_ANSWER')" in sql
+
+
+def test_finalize_ignores_grades_for_questions_of_other_tests():
+    graded = compiled_sql().split("FROM manual_grades JOIN questions", 1)[1].split(")", 1)[0]
+    assert "questions.test_id = 7" in graded
+
+
+def test_finalize_all_only_touches_pending_submissions():
+    where = compiled_sql().split(" WHERE submissions.test_id = 7", 1)[1]
+    assert where.startswith(" AND submissions.status = 'PENDING_REVIEW'")
+    assert "count(manual_grades.id)" not in where
+
+
+def test_finalize_fully_graded_requires_every_manual_question():
+    where = compiled_sql(required_manual_count=2).split(" WHERE submissions.test_id = 7", 1)[1]
+    assert where.count("submissions.status = 'PENDING_REVIEW'") == 1
+    assert ">= 2 RETURNING submissions.id" in where
+
+
+def test_finalize_explicit_ids_may_refinalize():
+    submission_id = uuid4()
+    where = compiled_sql(submission_ids=[submission_id]).split(" WHERE submissions.test_id = 7", 1)[1]
+    assert f"submissions.id IN ('{submission_id}')" in where
+    assert "PENDING_REVIEW" not in where
+
+
+def make_service(stored):
+    test = essay_test()
+    service = build(SubmissionService, db=FakeDb(), test_service=FakeTests(row=test), repo=InMemorySubmissions(stored))
+    return service, test
+
+
+async def test_bulk_finalize_rejects_submissions_of_other_tests():
+    own, foreign = make_submission(SimpleNamespace(id=7)), uuid4()
+    service, test = make_service([own])
+
+    with pytest.raises(HTTPException) as error:
+        await service.bulk_finalize(test.id, test.creator_id, [own.id, foreign])
+
+    assert error.value.status_code == 404
+    assert str(foreign) in error.value.detail
+    assert service.repo.finalize_calls == []
+
+
+async def test_bulk_finalize_fully_graded_counts_manual_questions():
+    service, test = make_service([])
+
+    result = await service.bulk_finalize(test.id, test.creator_id, None, fully_graded_only=True)
+
+    assert result == {"finalizedCount": 0, "submissionIds": []}
+    [call] = service.repo.finalize_calls
+    assert call["submission_ids"] is None
+    assert call["required_manual_count"] == 1
@@ -0,0 +1,44 @@
+from uuid import UUID
+
+from app.services.clustering_service import cluster_answers, normalize_answer
+
+
+def sid(n: int) -> UUID:
+    return UUID(int=n)
+
+
+def test_exact_matches_group_after_normalization():
+    answers = [
+        (sid(1), "Bo’shang"),
+        (sid(2), "bo'shang "),
+        (sid(3), "BO'SHANG"),
+        (sid(4), "tamga"),
+    ]
+
+    clusters = cluster_answers(answers)
+
+    assert [cluster.size for cluster in clusters] == [3, 1]
+    assert set(clusters[0].submission_ids) == {sid(1), sid(2), sid(3)}
+    assert normalize_answer(clusters[0].representative) == "bo'shang"
+
+
+def test_near_duplicates_are_merged_and_distinct_answers_kept_apart():
+    answers = [
+        (sid(1), "The mitochondria is the powerhouse of the cell"),
+        (sid(2), "the mitochondria is the powerhouse of the cell."),
+        (sid(3), "The mitochondria is the power house of the cell"),
+        (sid(4), "Photosynthesis happens in chloroplasts"),
+    ]
+
+    clusters = cluster_answers(answers, threshold=0.7)
+
+    assert clusters[0].size == 3
+    assert len(clusters[0].variants) == 3
+    assert clusters[1].submission_ids == [sid(4)]
+
+
+def test_empty_answers_form_their_own_cluster():
+    clusters = cluster_answers([(sid(1), ""), (sid(2), None), (sid(3), "x")])
+
+    sizes = sorted(cluster.size for cluster in clusters)
+    assert sizes == [1, 2]
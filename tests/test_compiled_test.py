@@ -0,0 +1,77 @@
+import gzip
+import json
+from uuid import UUID
+from app.services.compiled_test import (
+    CompiledTestCache,
+    compile_test,
+    dump_compiled_test,
+    load_compiled_test,
+)
+from app.schemas.tests import TestDetailOut
+from app.services.payload_cache import PayloadCache, encode_payload
+from app.services.scoring_service import auto_score_submission
+from app.services.test_service import TestService
+from tests.fakes import make_test
+
+
+def test_compiled_test_is_sorted_and_scores_like_orm_rows():
+    row = make_test()
+    compiled = compile_test(row, version=3)
+
+    assert [q.sort_order for q in compiled.questions] == [0, 1]
+    assert [o.option_index for o in compiled.questions[0].options] == [0, 1]
+    answers = {str(UUID(int=1)): "1", str(UUID(int=2)): "ha"}
+    assert auto_score_submission(compiled.questions, answers, compiled.scoring_type) == auto_score_submission(
+        row.questions, answers, row.scoring_type
+    )
+
+
+def test_compiled_test_round_trips_through_json():
+    compiled = compile_test(make_test(), version=2)
+    assert load_compiled_test(dump_compiled_test(compiled)) == compiled
+
+
+async def test_cache_serves_only_the_current_version():
+    cache = CompiledTestCache(maxsize=2, redis_factory=lambda: None)
+    compiled = compile_test(make_test(), version=4)
+    await cache.put(compiled)
+    assert await cache.get(7, 4) is compiled
+
+    # Another process committed an edit: the version read from the database moved on.
+    assert await cache.get(7, 5) is None
+    assert await cache.get(7, 4) is None
+
+
+async def test_older_snapshot_does_not_replace_newer_one():
+    cache = CompiledTestCache(maxsize=2, redis_factory=lambda: None)
+    newer = compile_test(make_test(), version=5)
+    await cache.put(newer)
+    await cache.put(compile_test(make_test(), version=4))
+
+    assert await cache.get(7, 4) is None
+    assert await cache.get(7, 5) is newer
+
+
+def test_public_payload_matches_orm_serialization_and_hides_answers():
+    row = make_test()
+    compiled = compile_test(row, version=0)
+    service = TestService(None)
+
+    assert service.serialize_test_detail(compiled, include_correct=False) == service.serialize_test_detail(
+        row, include_correct=False
+    )
+    payload = encode_payload(TestDetailOut, service.serialize_test_detail(compiled, include_correct=False))
+    assert gzip.decompress(payload.gzip_body) == payload.body
+    assert json.loads(payload.body)["questions"][0]["correctAnswer"] == ""
+
+
+def test_payload_cache_is_tied_to_its_source_snapshot():
+    cache = PayloadCache(maxsize=4)
+    first = compile_test(make_test(), version=0)
+    second = compile_test(make_test(), version=0)
+    payload = encode_payload(TestDetailOut, TestService(None).serialize_test_detail(first, include_correct=False))
+
+    cache.put((7, "detail"), first, payload)
+
+    assert cache.get((7, "detail"), first) is payload
+    assert cache.get((7, "detail"), second) is None
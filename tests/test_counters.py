@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.constants import DEFAULT_FREE_LIMITS, PlanCode
+from app.repositories.test_stats_repository import record_stats_statement
+from app.services.submission_service import SubmissionService
+from tests.fakes import FakeTests, build, make_submission, mute_leaderboard, open_test
+
+
+def test_record_stats_applies_free_limit_in_conflict_clause():
+    sql = str(
+        record_stats_statement(7, total=1, pending=1, limit=50).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "ON CONFLICT (test_id) DO UPDATE" in sql
+    assert "total = (test_stats.total + excluded.total)" in sql
+    assert "WHERE test_stats.total + 1 <= 50" in sql
+    assert "RETURNING test_stats.total" in sql
+
+
+def test_record_stats_without_limit_is_unconditional():
+    sql = str(record_stats_statement(7, pending=-1, completed=1).compile(dialect=postgresql.dialect()))
+    assert "WHERE" not in sql
+
+
+class Journal:
+    """Records the order of the writes a submit makes."""
+
+    def __init__(self, row):
+        self.row = row
+        self.calls: list[str] = []
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            self.calls.append(f"{name}:{kwargs.get('limit')}" if name == "record" else name)
+            return self.row if name == "insert_idempotent" else True
+
+        return call
+
+
+def make_submit_service(plan, monkeypatch):
+    mute_leaderboard(monkeypatch)
+    test = open_test(creator_plan_snapshot=plan)
+    journal = Journal(make_submission(test))
+    service = build(
+        SubmissionService,
+        test_service=FakeTests(test),
+        sessions=SimpleNamespace(check=lambda *args: None),
+        settings=SimpleNamespace(submission_ingest_mode="sync"),
+        db=journal,
+        repo=journal,
+        stats=journal,
+        leaderboard_repo=journal,
+        answers_repo=journal,
+    )
+    return service, journal
+
+
+async def test_unlimited_submit_records_counters_just_before_commit(monkeypatch):
+    service, journal = make_submit_service(PlanCode.PRO, monkeypatch)
+
+    await service.create_submission(7, {"fullName": "Ali"}, {})
+
+    assert journal.calls == ["insert_idempotent", "add", "add", "record:None", "commit"]
+
+
+async def test_limited_submit_checks_the_limit_first(monkeypatch):
+    service, journal = make_submit_service(PlanCode.FREE, monkeypatch)
+
+    await service.create_submission(7, {"fullName": "Ali"}, {})
+
+    assert journal.calls[0] == f"record:{DEFAULT_FREE_LIMITS['submissionsPerTest']}"
+    assert journal.calls[1:] == ["insert_idempotent", "add", "add", "commit"]
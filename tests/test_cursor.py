@@ -0,0 +1,35 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.submission_service import SubmissionService
+from app.utils.cursor import decode_cursor, encode_cursor
+from tests.fakes import build
+
+
+def test_cursor_round_trip():
+    submission_id = uuid4()
+    submitted_at = datetime(2026, 10, 19, 8, 30, tzinfo=UTC)
+    cursor = encode_cursor([87.25, submitted_at.isoformat(), str(submission_id)])
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 3) == [87.25, submitted_at.isoformat(), str(submission_id)]
+
+
+def test_decode_cursor_rejects_garbage():
+    assert decode_cursor(None, 2) is None
+    assert decode_cursor("not base64 !!", 2) is None
+    assert decode_cursor(encode_cursor(["only-one"]), 2) is None
+
+
+def test_keyset_parsing():
+    service = build(SubmissionService)
+    submission_id = uuid4()
+    submitted_at = datetime(2026, 10, 19, tzinfo=UTC)
+    cursor = encode_cursor([submitted_at.isoformat(), str(submission_id)])
+    assert service._decode_keyset(cursor, (datetime.fromisoformat, str)) == (submitted_at, str(submission_id))
+    assert service._decode_keyset(None, (datetime.fromisoformat, str)) is None
+    with pytest.raises(HTTPException) as exc:
+        service._decode_keyset(encode_cursor(["yesterday", "x"]), (datetime.fromisoformat, str))
+    assert exc.value.status_code == 400
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.repositories.draft_repository import fold_draft_events
+from app.schemas.submissions import SubmissionCreateRequest
+from app.services.draft_service import DraftService
+from tests.fakes import FakeDb, FakeRedis, FakeTests, open_test
+
+FIRST = str(UUID(int=1))
+SECOND = str(UUID(int=2))
+
+
+def make_service(redis):
+    compiled = open_test()
+    service = DraftService(None, redis_factory=lambda: redis)
+    service.test_service = FakeTests(compiled)
+    return service, compiled
+
+
+def test_fold_applies_deltas_in_order_and_none_clears():
+    participant, answers = fold_draft_events(
+        [
+            ({"fullName": "Ali"}, {}),
+            (None, {FIRST: "A", SECOND: "true"}),
+            (None, {FIRST: "B", SECOND: None}),
+        ]
+    )
+
+    assert participant == {"fullName": "Ali"}
+    assert answers == {FIRST: "B"}
+
+
+async def test_redis_draft_merges_deltas_and_seal_removes_it():
+    redis = FakeRedis()
+    service, compiled = make_service(redis)
+
+    created = await service.create(7, {"fullName": "Ali"})
+    await service.save(7, created["id"], {FIRST: "A", SECOND: "true"})
+    saved = await service.save(7, created["id"], {FIRST: 1, SECOND: None})
+    draft = await service.load(7, created["id"])
+
+    assert saved["revision"] == 2
+    assert draft.participant_values == {"fullName": "Ali"}
+    assert draft.answers == {FIRST: 1}
+    assert set(redis.expiry.values()) == {compiled.end_time + timedelta(hours=1)}
+
+    await service.seal(7, created["id"])
+    assert await service.load(7, created["id"]) is None
+
+
+async def test_saving_unknown_draft_or_question_is_rejected():
+    redis = FakeRedis()
+    service, _ = make_service(redis)
+    created = await service.create(7, {"fullName": "Ali"})
+
+    with pytest.raises(HTTPException) as missing:
+        await service.save(7, uuid4(), {FIRST: "A"})
+    with pytest.raises(HTTPException) as unknown:
+        await service.save(7, created["id"], {str(UUID(int=99)): "A"})
+
+    assert missing.value.status_code == 404
+    assert unknown.value.status_code == 400
+    assert len(redis.hashes) == 1
+
+
+class FakeDraftRepo:
+    def __init__(self):
+        self.log: list[tuple[int, UUID, dict | None, dict]] = []
+
+    async def append(self, test_id, draft_id, answers, participant_values=None):
+        # Interleaved drafts: event ids are global, revisions must not be.
+        self.log.append((len(self.log) + 100, draft_id, participant_values, answers))
+
+    async def exists(self, test_id, draft_id):
+        return any(event[1] == draft_id for event in self.log)
+
+    async def events_for(self, draft_id):
+        return [(event_id, fields, delta) for event_id, owner, fields, delta in self.log if owner == draft_id]
+
+    async def revision(self, test_id, draft_id):
+        return len(await self.events_for(draft_id)) - 1
+
+    async def events(self, test_id, draft_id):
+        return await self.events_for(draft_id)
+
+
+async def test_database_revisions_count_saves_per_draft_like_redis():
+    service, _ = make_service(None)
+    service.db = FakeDb()
+    service.repo = FakeDraftRepo()
+
+    first = await service.create(7, {"fullName": "Ali"})
+    second = await service.create(7, {"fullName": "Vali"})
+    await service.save(7, second["id"], {FIRST: "A"})
+    saved = await service.save(7, first["id"], {FIRST: "B"})
+
+    assert first["revision"] == second["revision"] == 0
+    assert saved["revision"] == 1
+    assert (await service.load(7, first["id"])).revision == 1
+
+
+def test_submission_without_draft_requires_values_and_answers():
+    with pytest.raises(ValidationError):
+        SubmissionCreateRequest(participant_values={"fullName": "Ali"})
+    with pytest.raises(ValidationError):
+        SubmissionCreateRequest(answers={})
+    assert SubmissionCreateRequest(participant_values={"fullName": "Ali"}, answers={}).draft_id is None
+    assert SubmissionCreateRequest(draft_id=uuid4()).answers == {}
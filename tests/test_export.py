@@ -0,0 +1,70 @@
+import csv
+import io
+import zipfile
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from uuid import UUID
+
+from app.core.constants import SubmissionStatus
+from app.services.compiled_test import compile_test
+from app.services.export_service import export_header, export_row
+from app.utils import spreadsheet
+from app.utils.spreadsheet import CsvStreamWriter, XlsxStreamWriter
+from tests.fakes import make_test
+
+
+def make_row(**overrides):
+    values = {
+        "id": UUID(int=99),
+        "participant_full_name": "Ali",
+        "participant_secondary": "+998901234567",
+        "participant_attempt_value": "A1",
+        "participant_fields_json": {"fullName": "Ali"},
+        "status": SubmissionStatus.COMPLETED,
+        "auto_score": 1.0,
+        "auto_max_score": 2.0,
+        "final_score": 1.0,
+        "submitted_at": datetime(2026, 1, 1, 9, tzinfo=UTC),
+        "answers_json": {"0": "B", "1": "true"},
+        "answers_schema_version": 0,
+        "verdicts": {str(UUID(int=1)): True},
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_export_row_lines_up_with_header():
+    compiled = compile_test(make_test(), version=1)
+
+    header = export_header(compiled)
+    row = export_row(compiled, make_row())
+
+    assert len(header) == len(row)
+    assert header[-4:] == ["Q1 answer", "Q1 correct", "Q2 answer", "Q2 correct"]
+    # Positional answers are remapped to question ids; missing verdicts stay blank.
+    assert row[-4:] == ["B", 1, "true", None]
+    assert row[4] == "Ali"
+
+
+def test_csv_writer_flushes_in_chunks(monkeypatch):
+    monkeypatch.setattr(spreadsheet, "CSV_CHUNK_SIZE", 64)
+    writer = CsvStreamWriter()
+    chunks = [writer.row(["x" * 40, index, None]) for index in range(10)]
+    chunks.append(writer.close())
+
+    assert sum(1 for chunk in chunks if chunk) > 2
+    text = b"".join(chunks).decode("utf-8-sig")
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[3] == ["x" * 40, "3", ""]
+
+
+def test_xlsx_writer_produces_a_readable_workbook():
+    writer = XlsxStreamWriter()
+    data = writer.row(["Name", "Score"]) + writer.row(["<Ali & Vali>", 2.5]) + writer.close()
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert "&lt;Ali &amp; Vali&gt;" in sheet
+    assert "<c><v>2.5</v></c>" in sheet
+    assert "[Content_Types].xml" in archive.namelist()
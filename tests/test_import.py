@@ -0,0 +1,174 @@
+import json
+from dataclasses import replace
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.constants import PlanCode, SubmissionStatus
+from app.services import import_service
+from app.services.compiled_test import compile_test
+from app.services.import_service import SubmissionImportService, parse_csv, parse_ndjson
+from tests.fakes import FakeDb, FakeRows, FakeStats, FakeTests, build, make_test, mute_leaderboard
+
+FIRST = str(UUID(int=1))
+SECOND = str(UUID(int=2))
+
+
+def make_service(compiled, monkeypatch, total=0):
+    mute_leaderboard(monkeypatch)
+    return build(
+        SubmissionImportService,
+        db=FakeDb(),
+        test_service=FakeTests(compiled),
+        stats=FakeStats(total),
+        leaderboard=FakeRows(),
+        answers=FakeRows(),
+    )
+
+
+def test_csv_columns_accept_positions_ids_and_export_headers():
+    compiled = compile_test(make_test(), version=1)
+    text = f"\ufefffullName,Q1,{SECOND},Q2 answer,submittedAt\nAli,B,true,,2026-01-01T10:00:00\n,,,,\n"
+
+    (row,) = parse_csv(compiled, text)
+
+    assert row.line == 2
+    assert row.participant_values == {"fullName": "Ali"}
+    assert row.answers == {FIRST: "B", SECOND: "true"}
+    assert row.submitted_at == "2026-01-01T10:00:00"
+
+
+def test_ndjson_reports_malformed_lines():
+    text = '{"participantValues": {"fullName": "Ali"}, "answers": {"0": "B"}}\n[1, 2]\nnot json\n'
+
+    rows, errors = parse_ndjson(text)
+
+    assert [row.line for row in rows] == [1]
+    assert errors == [{"line": 2, "error": "Invalid JSON object"}, {"line": 3, "error": "Invalid JSON object"}]
+
+
+async def test_import_scores_valid_rows_and_reports_the_rest(monkeypatch):
+    compiled = compile_test(make_test(), version=1)
+    service = make_service(compiled, monkeypatch)
+    lines = [
+        {"participantValues": {"fullName": f"P{index}"}, "answers": {FIRST: "B", SECOND: "false"}}
+        for index in range(5)
+    ]
+    lines.insert(2, {"participantValues": {"fullName": " "}, "answers": {}})
+    lines.append({"participantValues": {"fullName": "Late"}, "answers": {}, "submittedAt": "yesterday"})
+    content = "\n".join(json.dumps(line) for line in lines).encode("utf-8")
+
+    monkeypatch.setattr(import_service, "IMPORT_BATCH_SIZE", 2)
+
+    result = await service.import_submissions(7, compiled.creator_id, content, "ndjson")
+
+    assert result["importedCount"] == 5
+    assert result["errors"] == [
+        {"line": 3, "error": "fullName required"},
+        {"line": 7, "error": "submittedAt must be an ISO 8601 timestamp"},
+    ]
+    assert [len(params) for _, params in service.db.executed] == [2, 2, 1]
+    assert service.db.commits == 1
+    assert service.stats.recorded[0]["total"] == 5
+    assert all(row["status"] == SubmissionStatus.COMPLETED for row in service.leaderboard.rows)
+    assert {row["final_score"] for row in service.leaderboard.rows} == {1.0}
+    assert len(service.answers.rows) == 10
+
+
+async def test_import_stops_at_the_free_plan_limit(monkeypatch):
+    compiled = replace(compile_test(make_test(), version=1), creator_plan_snapshot=PlanCode.FREE)
+    service = make_service(compiled, monkeypatch, total=99)
+    content = "fullName,Q1\nAli,B\nVali,A\n".encode("utf-8")
+
+    result = await service.import_submissions(7, compiled.creator_id, content, "csv")
+
+    assert result["importedCount"] == 1
+    assert result["errors"] == [{"line": 3, "error": "Free submissionsPerTest limit reached"}]
+
+
+class FakeRegistrations:
+    def __init__(self, phones):
+        self.phones = phones
+
+    async def registered_phones(self, test_id, phones):
+        return self.phones & set(phones)
+
+
+class FakeAttempts:
+    def __init__(self):
+        self.reserved = []
+
+    async def used_many(self, test_id, attempt_values):
+        return {}
+
+    async def reserve_many(self, test_id, counts, limit):
+        self.reserved.append(counts)
+        return set(counts)
+
+
+async def test_free_plan_room_is_spent_on_rows_that_pass_the_attempt_rules(monkeypatch):
+    compiled = replace(
+        compile_test(make_test(), version=1), creator_plan_snapshot=PlanCode.FREE, attempts_enabled=True
+    )
+    service = make_service(compiled, monkeypatch, total=99)
+    service.registrations = FakeRegistrations({"+998901111111", "+998902222222"})
+    service.attempts = FakeAttempts()
+    content = "fullName,phone,Q1\nAli,+998900000000,B\nVali,+998901111111,B\nSoli,+998902222222,B\n".encode()
+
+    result = await service.import_submissions(7, compiled.creator_id, content, "csv")
+
+    assert result["importedCount"] == 1
+    assert result["errors"] == [
+        {"line": 2, "error": "Phone is not registered for this test"},
+        {"line": 4, "error": "Free submissionsPerTest limit reached"},
+    ]
+    assert service.attempts.reserved == [{"+998901111111": 1}]
+
+
+async def test_import_is_limited_to_the_test_owner(monkeypatch):
+    compiled = compile_test(make_test(), version=1)
+    service = make_service(compiled, monkeypatch)
+    with pytest.raises(HTTPException) as exc:
+        await service.import_submissions(7, uuid4(), b"", "csv")
+    assert exc.value.status_code == 403
+
+
+async def test_overlong_participant_values_are_row_errors(monkeypatch):
+    compiled = compile_test(make_test(), version=1)
+    service = make_service(compiled, monkeypatch)
+    content = f"fullName,phone,Q1\nAli,,B\n{'x' * 201},,B\nVali,{'9' * 201},B\n".encode()
+
+    result = await service.import_submissions(7, compiled.creator_id, content, "csv")
+
+    assert result["importedCount"] == 1
+    assert [error["line"] for error in result["errors"]] == [3, 4]
+    assert "at most 200 characters" in result["errors"][0]["error"]
+
+
+class FakeUpload:
+    def __init__(self, content, size):
+        self.content = content
+        self.size = size
+        self.reads = []
+
+    async def read(self, size=-1):
+        self.reads.append(size)
+        return self.content[:size] if size >= 0 else self.content
+
+
+async def test_oversized_uploads_are_rejected_before_being_buffered(monkeypatch):
+    monkeypatch.setattr(import_service, "MAX_IMPORT_BYTES", 10)
+
+    declared = FakeUpload(b"x" * 20, size=20)
+    with pytest.raises(HTTPException) as error:
+        await import_service.read_import_file(declared)
+    assert error.value.status_code == 413
+    assert declared.reads == []
+
+    undeclared = FakeUpload(b"x" * 20, size=None)
+    with pytest.raises(HTTPException):
+        await import_service.read_import_file(undeclared)
+    assert undeclared.reads == [11]
+
+    assert await import_service.read_import_file(FakeUpload(b"fullName\n", size=None)) == b"fullName\n"
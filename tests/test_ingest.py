@@ -0,0 +1,205 @@
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Update
+
+from app.models.domain import OutboxEvent
+from app.services.compiled_test import compile_test
+from app.services.ingest_service import INGEST_EVENT, MAX_INGEST_RETRIES, SubmissionIngestService
+from app.services.submission_service import SubmissionService
+from tests.fakes import (
+    CountingRepo,
+    FakeDb,
+    FakeResult,
+    FakeRows,
+    FakeStats,
+    FakeTests,
+    InMemorySubmissions,
+    RecordingSession,
+    build,
+    make_submission,
+    make_test,
+    mute_leaderboard,
+    open_test,
+)
+
+
+class FakeSavepoint:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.db.savepoints.append(exc_type is None)
+        return False
+
+
+class OutboxDb(FakeDb):
+    """Serves ``events`` to every SELECT and applies status UPDATEs to them."""
+
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+        self.updates: dict[str, str] = {}
+        self.savepoints: list[bool] = []
+
+    async def execute(self, statement, params=None):
+        if isinstance(statement, Update):
+            sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            params = statement.compile().params
+            self.updates[params["status"]] = sql
+            for event in self.events:
+                if event.id in params["id_1"]:
+                    event.status = params["status"]
+            return None
+        return FakeResult(self.events)
+
+    def begin_nested(self):
+        return FakeSavepoint(self)
+
+    async def rollback(self):
+        raise AssertionError("a bad event must not roll back the batch")
+
+
+def make_event(event_id, full_name="Ali", idempotency_key=None):
+    return OutboxEvent(
+        id=event_id,
+        event_type=INGEST_EVENT,
+        status="pending",
+        retry_count=0,
+        payload_json={
+            "submissionId": str(uuid4()),
+            "testId": 7,
+            "fullName": full_name,
+            "attemptValue": full_name,
+            "secondary": "",
+            "participantValues": {"fullName": full_name},
+            "answers": {},
+            "idempotencyKey": idempotency_key,
+            "submittedAt": datetime.now(UTC).isoformat(),
+        },
+    )
+
+
+class NameCheckedSubmissions(InMemorySubmissions):
+    """Rejects the batch like the ``varchar(200)`` name column would."""
+
+    async def insert_many_idempotent(self, rows):
+        if any(len(row["participant_full_name"]) > 200 for row in rows):
+            raise ValueError("value too long for type character varying(200)")
+        return await super().insert_many_idempotent(rows)
+
+
+def make_service(events, monkeypatch):
+    mute_leaderboard(monkeypatch)
+    return build(
+        SubmissionIngestService,
+        db=OutboxDb(events),
+        test_service=FakeTests(compile_test(make_test(), version=1)),
+        stats=FakeStats(),
+        submissions=NameCheckedSubmissions(),
+        leaderboard=FakeRows(),
+        answers=FakeRows(),
+    )
+
+
+def stored_names(service):
+    return [row.participant_full_name for row in service.submissions.rows.values()]
+
+
+async def test_one_bad_event_only_fails_itself(monkeypatch):
+    events = [make_event(1), make_event(2, "x" * 201), make_event(3, "Vali")]
+    service = make_service(events, monkeypatch)
+
+    processed = await service.drain(batch_size=3)
+
+    assert stored_names(service) == ["Ali", "Vali"]
+    assert service.db.savepoints == [False, True, False, True]
+    assert "outbox_events.id IN (1, 3)" in service.db.updates["done"]
+    assert (events[1].status, events[1].retry_count) == ("pending", 1)
+    assert processed == 2
+    assert service.db.commits == 1
+
+
+async def test_scoring_errors_count_as_retries(monkeypatch):
+    events = [make_event(1), make_event(2)]
+    events[1].retry_count = MAX_INGEST_RETRIES - 1
+    service = make_service(events, monkeypatch)
+    score = service._score
+
+    def flaky_score(test, payload, scorer):
+        if payload is events[1].payload_json:
+            raise KeyError("answers")
+        return score(test, payload, scorer)
+
+    service._score = flaky_score
+
+    await service.drain(batch_size=2)
+
+    assert stored_names(service) == ["Ali"]
+    assert events[1].status == "failed"
+    assert service.stats.recorded[-1] == {"total": -1}
+    assert "outbox_events.id IN (1)" in service.db.updates["done"]
+
+
+@pytest.mark.parametrize(
+    ("participant_values", "idempotency_key"),
+    [
+        ({"fullName": "x" * 201}, None),
+        ({"fullName": "Ali", "phone": "9" * 201}, None),
+        ({"fullName": "Ali"}, "k" * 129),
+    ],
+)
+async def test_overlong_values_are_rejected_before_queueing(participant_values, idempotency_key):
+    service = build(SubmissionService, test_service=FakeTests(open_test()))
+
+    with pytest.raises(HTTPException) as error:
+        await service.create_submission(7, participant_values, {}, idempotency_key=idempotency_key)
+
+    assert error.value.status_code == 400
+
+
+async def test_queued_lookups_match_the_outbox_expression_indexes():
+    service = build(SubmissionIngestService, db=RecordingSession())
+
+    await service.find_queued(7, idempotency_key="key-1")
+    await service.find_queued(7, submission_id=uuid4())
+
+    by_key, by_id = service.db.statements
+    assert "outbox_events.event_type = 'submission.ingest'" in by_key
+    assert "(outbox_events.payload_json ->> 'idempotencyKey') = " in by_key
+    assert "(outbox_events.payload_json ->> 'submissionId') = " in by_id
+    assert "CAST" not in by_key + by_id
+
+
+async def test_submission_status_only_returns_answers_to_the_owner():
+    test = compile_test(make_test(), version=1)
+    row = make_submission(test)
+    service = build(SubmissionService, test_service=FakeTests(test), repo=CountingRepo(get=row))
+
+    anonymous = await service.submission_status(test.id, row.id)
+    stranger = await service.submission_status(test.id, row.id, user_id=uuid4())
+    owner = await service.submission_status(test.id, row.id, user_id=test.creator_id)
+
+    assert anonymous == stranger == {"id": row.id, "testId": test.id, "status": "stored", "submission": None}
+    assert owner["submission"]["answers"] == row.answers_json
+
+
+async def test_duplicate_drained_event_reports_the_kept_submission(monkeypatch):
+    events = [make_event(1, idempotency_key="key-1"), make_event(2, idempotency_key="key-1")]
+    ingest = make_service(events, monkeypatch)
+    await ingest.drain(batch_size=2)
+    kept, dropped = (UUID(event.payload_json["submissionId"]) for event in events)
+    service = build(SubmissionService, repo=ingest.submissions, ingest=ingest)
+    ingest.db.events = [events[1]]
+
+    status = await service.submission_status(7, dropped)
+
+    assert [event.status for event in events] == ["done", "done"]
+    assert list(ingest.submissions.rows) == [kept]
+    assert (status["status"], status["duplicateOf"]) == ("duplicate", kept)
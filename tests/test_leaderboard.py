@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+from app.repositories.leaderboard_repository import LeaderboardRepository, entry_values
+from tests.fakes import RecordingSession
+
+
+def test_entry_values_drop_answer_payloads():
+    submission_id = uuid4()
+    values = entry_values(
+        {
+            "id": submission_id,
+            "test_id": 3,
+            "status": "completed",
+            "final_score": 7.5,
+            "submitted_at": None,
+            "participant_full_name": "Ali",
+            "participant_secondary": "",
+            "participant_attempt_value": "Ali",
+            "participant_fields_json": {},
+            "answers_json": {"q": "a"},
+            "auto_score": 7.5,
+        }
+    )
+    assert values["submission_id"] == submission_id
+    assert "answers_json" not in values
+    assert "id" not in values
+
+
+async def test_sync_refreshes_entries_from_submissions():
+    session = RecordingSession()
+    repo = LeaderboardRepository(session)
+    await repo.sync(3, [])
+    assert session.statements == []
+
+    await repo.sync(3, [uuid4()])
+    sql = session.statements[0]
+    assert sql.startswith("INSERT INTO leaderboard_entries (submission_id, test_id, status, final_score")
+    assert "SELECT submissions.id" in sql
+    assert "ON CONFLICT (submission_id) DO UPDATE SET status = excluded.status" in sql
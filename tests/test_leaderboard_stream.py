@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from app.services.leaderboard_stream import LeaderboardHub, diff_rankings
+
+
+def _entry(item_id: str, rank: int, score: float) -> dict:
+    return {"id": item_id, "rank": rank, "finalScore": score}
+
+
+def _decode(message: bytes) -> tuple[str, dict]:
+    event, data = message.decode("utf-8").strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_diff_rankings_reports_moves_entries_and_exits():
+    previous = [_entry("a", 1, 90), _entry("b", 2, 80), _entry("c", 3, 70)]
+    current = [_entry("b", 1, 95), _entry("a", 2, 90), _entry("d", 3, 75)]
+    delta = diff_rankings(previous, current)
+    assert [item["id"] for item in delta["changed"]] == ["b", "a", "d"]
+    assert delta["removed"] == ["c"]
+    assert diff_rankings(current, current) == {"changed": [], "removed": []}
+
+
+async def test_hub_computes_once_per_change_for_all_watchers():
+    calls = []
+    boards = [[_entry("a", 1, 50)], [_entry("b", 1, 60), _entry("a", 2, 50)]]
+
+    async def loader(test_id: int) -> dict:
+        calls.append(test_id)
+        return {"ranked": boards[min(len(calls), len(boards)) - 1], "stats": {"total": len(calls)}}
+
+    hub = LeaderboardHub(loader=loader, redis_factory=lambda: None, debounce_seconds=0.01)
+    streams = [hub.stream(5) for _ in range(50)]
+    snapshots = [await anext(stream) for stream in streams]
+    assert len(calls) == 1
+    assert all(message is snapshots[0] for message in snapshots)
+    assert _decode(snapshots[0])[0] == "snapshot"
+
+    for _ in range(10):
+        await hub.publish(5)
+    deltas = [await asyncio.wait_for(anext(stream), timeout=1) for stream in streams]
+    assert len(calls) == 2
+    event, data = _decode(deltas[0])
+    assert event == "delta"
+    assert data["seq"] == 1
+    assert [item["id"] for item in data["changed"]] == ["b", "a"]
+
+    for stream in streams:
+        await stream.aclose()
+    assert hub.broadcasters == {}
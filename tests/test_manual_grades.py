@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.schemas.submissions import MAX_BULK_GRADE_ROWS, BulkManualGradesRequest
+from app.services.submission_service import SubmissionService
+from tests.fakes import ESSAY, FakeDb, FakeTests, InMemorySubmissions, build, essay_test, make_submission
+
+CHOICE = str(UUID(int=1))
+
+
+def make_service(test, stored=(), loaded=()):
+    """``loaded`` submissions are stored too, and already held by the session."""
+    return build(
+        SubmissionService,
+        db=FakeDb(loaded),
+        test_service=FakeTests(row=test),
+        repo=InMemorySubmissions([*stored, *loaded]),
+    )
+
+
+async def test_bulk_grades_are_clamped_and_later_items_win():
+    test = essay_test()
+    first, second = make_submission(test).id, make_submission(test).id
+    service = make_service(test, [make_submission(test, id=first), make_submission(test, id=second)])
+
+    result = await service.bulk_patch_manual_grades(
+        test.id,
+        test.creator_id,
+        [
+            {"submissionIds": [first, second], "grades": {str(ESSAY): 9}},
+            {"submissionIds": [second], "grades": {str(ESSAY): -2}},
+        ],
+    )
+
+    scores = {row["submission_id"]: row["score"] for row in service.repo.upserted}
+    assert scores == {first: 5.0, second: 0.0}
+    assert result["updatedCount"] == 2
+    assert set(result["submissionIds"]) == {first, second}
+    assert service.db.commits == 1
+
+
+@pytest.mark.parametrize("question_id", [CHOICE, str(UUID(int=99))])
+async def test_bulk_grades_reject_objective_and_unknown_questions(question_id):
+    test = essay_test()
+    submission_id = make_submission(test).id
+    service = make_service(test, [make_submission(test, id=submission_id)])
+
+    with pytest.raises(HTTPException) as error:
+        await service.bulk_patch_manual_grades(
+            test.id, test.creator_id, [{"submissionIds": [submission_id], "grades": {question_id: 1}}]
+        )
+
+    assert error.value.status_code == 400
+    assert service.repo.upserted == []
+
+
+async def test_bulk_grades_reject_submissions_of_other_tests():
+    test = essay_test()
+    own, foreign = make_submission(test), make_submission(SimpleNamespace(id=8))
+    service = make_service(test, [own, foreign])
+
+    with pytest.raises(HTTPException) as error:
+        await service.bulk_patch_manual_grades(
+            test.id, test.creator_id, [{"submissionIds": [own.id, foreign.id], "grades": {str(ESSAY): 1}}]
+        )
+
+    assert error.value.status_code == 404
+    assert str(foreign.id) in error.value.detail
+    assert service.repo.upserted == []
+    assert service.db.commits == 0
+
+
+async def test_bulk_grades_refresh_submissions_already_in_the_session():
+    test = essay_test()
+    held, other = make_submission(test), make_submission(test)
+    service = make_service(test, [other], loaded=[held])
+
+    await service.bulk_patch_manual_grades(
+        test.id, test.creator_id, [{"submissionIds": [held.id, other.id], "grades": {str(ESSAY): 3}}]
+    )
+
+    assert service.db.refreshed == [(held, ["manual_grades"])]
+
+
+@pytest.mark.parametrize("question_id", [CHOICE, str(UUID(int=99))])
+async def test_grades_reject_objective_and_unknown_questions(question_id):
+    test = essay_test()
+    submission = make_submission(test)
+    service = make_service(test, loaded=[submission])
+
+    with pytest.raises(HTTPException) as error:
+        await service.patch_manual_grades(test.id, submission.id, test.creator_id, {question_id: 1})
+
+    assert error.value.status_code == 400
+    assert submission.manual_grades == []
+    assert service.db.commits == 0
+
+
+@pytest.mark.parametrize(("score", "stored"), [(9, 5.0), (-2, 0.0), (3.5, 3.5)])
+async def test_grades_are_clamped_like_bulk_grades(score, stored):
+    test = essay_test()
+    submission = make_submission(test)
+    service = make_service(test, loaded=[submission])
+
+    await service.patch_manual_grades(test.id, submission.id, test.creator_id, {str(ESSAY): score})
+
+    assert [(grade.question_id, grade.score) for grade in submission.manual_grades] == [(ESSAY, stored)]
+
+
+def test_bulk_grade_request_bounds_total_rows():
+    ids = [uuid4() for _ in range(10000)]
+    grades = {str(UUID(int=index)): 1.0 for index in range(MAX_BULK_GRADE_ROWS // len(ids) + 1)}
+
+    with pytest.raises(ValidationError):
+        BulkManualGradesRequest(items=[{"submissionIds": ids, "grades": grades}])
+    assert BulkManualGradesRequest(items=[{"submissionIds": ids[:10], "grades": grades}])
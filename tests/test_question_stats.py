@@ -0,0 +1,176 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from uuid import UUID
+
+
+from app.core.constants import ANSWERS_SCHEMA_VERSION, SubmissionStatus
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.services.analytics_service import AnalyticsService
+from app.services.compiled_test import compile_test
+from app.services.submission_service import SubmissionService
+from tests.fakes import FakeDb, FakeStats, FakeTests, RecordingSession, build, make_test
+
+
+class FakeAnswers:
+    def __init__(self):
+        self.calls = []
+
+    async def value_counts(self, test_id, question_ids, status=None):
+        self.calls.append((test_id, question_ids, status))
+        return {str(UUID(int=1)): {"0": 3, "1": 1, "7": 2}}
+
+
+class FakeAnalytics:
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    async def snapshot(self, test_id):
+        return self._snapshot
+
+
+async def test_snapshot_uses_one_grouped_query_for_all_questions():
+    service = build(AnalyticsService, answers_repo=FakeAnswers(), stats=FakeStats(total=6, completed=6))
+    compiled = compile_test(make_test(), version=1)
+
+    payload, total, completed = await service.build(compiled)
+
+    assert service.answers_repo.calls == [(7, [str(UUID(int=1))], SubmissionStatus.COMPLETED)]
+    assert (total, completed) == (6, 6)
+    choice, true_false = payload["questions"]
+    assert choice["options"]["0"] == {"index": 0, "html": "x", "count": 3, "percentage": 50.0}
+    assert choice["options"]["1"]["count"] == 1
+    assert choice["totalResponses"] == 6
+    assert true_false["options"] == {}
+    assert payload["raschStats"] is None
+
+
+async def test_question_stats_are_read_from_the_snapshot():
+    compiled = compile_test(make_test(), version=1)
+    computed_at = datetime(2026, 10, 19, tzinfo=UTC)
+    stored = {
+        "questionId": str(UUID(int=1)),
+        "options": {"0": {"index": 0, "html": "x", "count": 3, "percentage": 50.0}},
+        "totalResponses": 6,
+    }
+    service = build(
+        SubmissionService,
+        test_service=FakeTests(compiled),
+        analytics=FakeAnalytics(SimpleNamespace(payload_json={"questions": [stored]}, computed_at=computed_at)),
+    )
+
+    result = await service.all_question_stats(7)
+
+    assert result["computedAt"] == computed_at
+    assert result["questions"][0] is stored
+    # A question missing from the snapshot is listed with an empty distribution.
+    assert result["questions"][1]["questionId"] == str(UUID(int=2))
+    assert result["questions"][1]["totalResponses"] == 0
+
+    single = await service.question_stats(7, UUID(int=1))
+    assert single["totalResponses"] == 6 and single["computedAt"] == computed_at
+
+
+async def test_stale_snapshots_are_detected_from_submission_counters():
+    session = RecordingSession(rows=[7])
+
+    assert await AnalyticsRepository(session).stale_test_ids(50) == [7]
+
+    (sql,) = session.statements
+    assert "LEFT OUTER JOIN test_analytics" in sql
+    assert "test_analytics.source_total != test_stats.total" in sql
+    assert "test_analytics.stale" in sql
+
+
+class VersionRepo:
+    def __init__(self, version):
+        self.current = version
+        self.locked = False
+
+    async def version(self, test_id, lock=False):
+        self.locked = lock
+        return self.current
+
+
+class SavingAnalytics:
+    def __init__(self, answer_key_version=0):
+        self.snapshot = SimpleNamespace(answer_key_version=answer_key_version)
+        self.saved = []
+
+    async def get(self, test_id):
+        return self.snapshot
+
+    async def save(self, test_id, payload, total, completed, computed_at, stale=False, answer_key_version=0):
+        self.saved.append(stale)
+        self.snapshot.answer_key_version = answer_key_version
+
+
+class StoredSubmissions:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def answers_after(self, after, limit, legacy_only=False, test_id=None):
+        pending = [row for row in self.rows if row[1] == test_id and (after is None or row[0] > after)]
+        return pending[:limit]
+
+
+class RescoringAnswers(FakeAnswers):
+    def __init__(self):
+        super().__init__()
+        self.replaced = []
+
+    async def replace(self, rows):
+        self.replaced.extend(rows)
+
+
+def rebuild_service(row, current_version, snapshot_key_version=0, submissions=()):
+    return build(
+        AnalyticsService,
+        db=FakeDb(),
+        test_service=FakeTests(row=row),
+        tests=VersionRepo(current_version),
+        repo=SavingAnalytics(snapshot_key_version),
+        answers_repo=RescoringAnswers(),
+        submissions=StoredSubmissions(list(submissions)),
+        stats=FakeStats(total=6, completed=6),
+    )
+
+
+async def rebuilt_stale_flag(read_version, current_version):
+    row = make_test()
+    row.version = read_version
+    row.answer_key_version = 0
+    service = rebuild_service(row, current_version)
+
+    assert await service.rebuild(7)
+    assert service.tests.locked
+    assert service.answers_repo.replaced == []
+    return service.repo.saved
+
+
+async def test_rebuild_clears_stale_only_if_the_test_was_not_edited_meanwhile():
+    assert await rebuilt_stale_flag(read_version=3, current_version=3) == [False]
+    assert await rebuilt_stale_flag(read_version=3, current_version=4) == [True]
+
+
+async def test_rebuild_rescores_answers_after_an_answer_key_change():
+    row = make_test()
+    row.version = 2
+    row.answer_key_version = 1
+    choice = next(q for q in row.questions if q.id == UUID(int=1))
+    choice.correct_answer_text = "A"
+    submissions = [(UUID(int=10 + index), 7, {str(UUID(int=1)): "0"}, ANSWERS_SCHEMA_VERSION) for index in range(3)]
+    service = rebuild_service(row, current_version=2, submissions=submissions)
+
+    await service.rescore_answers(compile_test(row, row.version), batch_size=2)
+    assert [answer["is_correct"] for answer in service.answers_repo.replaced] == [True, True, True]
+    assert service.db.commits == 2
+
+    service.answers_repo.replaced.clear()
+    assert await service.rebuild(7)
+    assert len(service.answers_repo.replaced) == 3
+    assert service.repo.snapshot.answer_key_version == 1
+
+    # The snapshot now records the key it was scored against, so the next rebuild skips rescoring.
+    service.answers_repo.replaced.clear()
+    assert await service.rebuild(7)
+    assert service.answers_repo.replaced == []
@@ -0,0 +1,29 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core import redis as redis_module
+
+
+def test_each_event_loop_gets_its_own_client(monkeypatch):
+    settings = SimpleNamespace(redis_cache_enabled=True, redis_url="redis://localhost:6379/0")
+    monkeypatch.setattr(redis_module, "get_settings", lambda: settings)
+
+    async def clients():
+        first = redis_module.get_redis()
+        assert redis_module.get_redis() is first
+        return first
+
+    async def closed():
+        client = redis_module.get_redis()
+        await redis_module.close_redis()
+        return client, redis_module.get_redis()
+
+    assert asyncio.run(clients()) is not asyncio.run(clients())
+    before, after = asyncio.run(closed())
+    assert before is not after
+
+
+def test_disabled_cache_has_no_client(monkeypatch):
+    monkeypatch.setattr(redis_module, "get_settings", lambda: SimpleNamespace(redis_cache_enabled=False))
+
+    assert redis_module.get_redis() is None
@@ -0,0 +1,90 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.orm import Session
+
+from app.core.constants import ScoringType, SubmissionStatus
+from app.services import test_service
+from app.services.compiled_test import compile_test
+from app.services.submission_service import SubmissionService
+from app.services.test_service import TestService
+from tests.fakes import CountingRepo, FakeDb, build, make_submission, make_test, mute_leaderboard
+
+
+def finished_rasch_test():
+    row = make_test()
+    row.scoring_type = ScoringType.RASCH
+    row.end_time = datetime.now(UTC) - timedelta(hours=1)
+    return row
+
+
+def make_service(test, submission, monkeypatch):
+    mute_leaderboard(monkeypatch)
+    return build(
+        SubmissionService,
+        db=FakeDb(),
+        test_service=CountingRepo(get_test_or_404=test),
+        repo=CountingRepo(get=submission, list_for_grading=[submission], page_for_test=[submission]),
+        stats=CountingRepo(get=SimpleNamespace(pending=1, completed=0, total=1)),
+        leaderboard_repo=CountingRepo(),
+    )
+
+
+async def test_test_loads_are_reused_until_the_transaction_ends():
+    row = make_test()
+    db = Session()
+    service = TestService(db)
+    service.repo = CountingRepo(get_by_id=row)
+
+    assert await service.get_test_or_404(7) is row
+    assert await service.get_test_or_404(7) is row
+    assert service.repo.calls == ["get_by_id"]
+
+    db.begin()
+    db.commit()
+    await service.get_test_or_404(7)
+    assert service.repo.calls == ["get_by_id", "get_by_id"]
+
+
+async def test_compiled_test_is_resolved_once_per_transaction(monkeypatch):
+    compiled = compile_test(make_test(), version=1)
+    cache = CountingRepo(get=compiled)
+    monkeypatch.setattr(test_service, "get_compiled_test_cache", lambda: cache)
+    db = Session()
+    services = [TestService(db), TestService(db)]
+    for service in services:
+        service.repo = CountingRepo(version=1)
+
+    first = await services[0].get_compiled_test_or_404(7)
+    second = await services[1].get_compiled_test_or_404(7)
+
+    assert first is second is compiled
+    assert cache.calls == ["get"]
+    assert services[0].repo.calls == ["version"]
+    assert services[1].repo.calls == []
+
+
+async def test_rasch_finalize_loads_test_and_submissions_once(monkeypatch):
+    test = finished_rasch_test()
+    submission = make_submission(test)
+    service = make_service(test, submission, monkeypatch)
+
+    result = await service.finalize_submission(test.id, submission.id, test.creator_id, None)
+
+    assert service.test_service.calls == ["get_test_or_404"]
+    assert service.repo.calls == ["get", "list_for_grading"]
+    assert result["status"] == SubmissionStatus.COMPLETED.value
+    assert result["finalScore"] == submission.final_score
+
+
+async def test_listing_after_auto_finalize_reads_each_entity_set_once(monkeypatch):
+    test = finished_rasch_test()
+    submission = make_submission(test)
+    service = make_service(test, submission, monkeypatch)
+
+    items, _ = await service.list_submissions(test.id, test.creator_id, status=None, latest=None)
+
+    assert service.test_service.calls == ["get_test_or_404"]
+    assert service.repo.calls == ["list_for_grading", "page_for_test"]
+    assert service.stats.calls == ["get", "recount"]
+    assert items[0]["status"] == SubmissionStatus.COMPLETED.value
@@ -1,7 +1,15 @@
 import json
 from app.core.constants import QuestionType, ScoringType, SubmissionStatus
 from app.models.domain import Question
-from app.services.scoring_service import auto_score_submission
+from app.services import scoring_service
+from app.services.scoring_service import (
+    CohortGrader,
+    SubmissionScorer,
+    answer_key,
+    auto_score_submission,
+    score_answers,
+    stored_answers,
+)
 from uuid import UUID
 
 
@@ -101,3 +109,121 @@ def test_two_part_math_accepts_equivalent_forms():
     assert score == 1
     assert max_score == 1
     assert status == SubmissionStatus.COMPLETED
+
+
+def test_two_part_written_answer_key_ignores_spacing_and_apostrophe_variants():
+    q = make_question(
+        QuestionType.TWO_PART_WRITTEN,
+        correct=json.dumps({"first": "bo'shang", "second": "tamga"}),
+    )
+    left = json.dumps({"first": "Bo\u2019shang", "second": "  tamga "})
+    right = json.dumps({"first": "bo'shang", "second": "tamga"})
+    assert answer_key(q, left) == answer_key(q, right)
+
+
+def test_cohort_grader_compares_each_distinct_answer_once(monkeypatch):
+    q = make_question(
+        QuestionType.TWO_PART_MATH,
+        correct=json.dumps({"first": "sqrt(2)", "second": "x^2 + 2*x + 1"}),
+    )
+    calls = []
+    original = scoring_service._same_math_answer
+
+    def counting(left, right):
+        calls.append((left, right))
+        return original(left, right)
+
+    monkeypatch.setattr(scoring_service, "_same_math_answer", counting)
+    grader = CohortGrader()
+    correct = json.dumps({"first": "2^(1/2)", "second": "(x+1)^2"})
+    wrong = json.dumps({"first": "2", "second": "x"})
+    answers = [correct, wrong] * 50
+
+    verdicts = [grader.is_correct(q, answer) for answer in answers]
+
+    assert verdicts == [True, False] * 50
+    assert len(calls) == 4
+
+
+def test_score_answers_matches_auto_score_per_question():
+    mc = make_question(QuestionType.MULTIPLE_CHOICE, correct="1")
+    two_part = make_question(
+        QuestionType.TWO_PART_WRITTEN, correct=json.dumps({"first": "alpha", "second": "beta"})
+    )
+    two_part.id = UUID(int=2)
+    essay = make_question(QuestionType.ESSAY)
+    essay.id = UUID(int=3)
+    skipped = make_question(QuestionType.TRUE_FALSE, correct="true")
+    skipped.id = UUID(int=4)
+    questions = [mc, two_part, essay, skipped]
+    answers = {
+        str(mc.id): " B ",
+        str(two_part.id): json.dumps({"first": " ALPHA ", "second": "gamma"}),
+        str(essay.id): "Some  long\nanswer",
+    }
+
+    rows = score_answers(questions, answers, ScoringType.CLASSIC)
+
+    assert [row.question_id for row in rows] == [str(mc.id), str(two_part.id), str(essay.id)]
+    assert rows[0].normalized_value == "1"
+    assert (rows[0].is_correct, rows[0].score, rows[0].part_mask) == (True, 1.0, 1)
+    assert rows[1].normalized_value == json.dumps(["alpha", "gamma"])
+    assert (rows[1].is_correct, rows[1].score, rows[1].part_mask) == (False, 0.0, 1)
+    assert rows[2].normalized_value == "some long answer"
+    assert (rows[2].is_correct, rows[2].score) == (None, None)
+    total = sum(row.score or 0 for row in rows)
+    assert total == auto_score_submission(questions, answers, ScoringType.CLASSIC)[0]
+
+
+def test_stored_answers_only_remaps_legacy_rows():
+    first = make_question(QuestionType.MULTIPLE_CHOICE, correct="0")
+    second = make_question(QuestionType.TRUE_FALSE, correct="true")
+    second.id = UUID(int=2)
+    second.sort_order = 1
+    positional = {"0": "A", "1": "true"}
+
+    assert stored_answers([first, second], positional, schema_version=0) == {
+        str(first.id): "A",
+        str(second.id): "true",
+    }
+    # Current-version rows were canonicalized when written and are returned untouched.
+    assert stored_answers([first, second], positional, schema_version=1) is positional
+
+
+def test_submission_scorer_matches_per_submission_scoring():
+    mc = make_question(QuestionType.MULTIPLE_CHOICE, correct="1")
+    two_part = make_question(
+        QuestionType.TWO_PART_MATH, correct=json.dumps({"first": "sqrt(2)", "second": "x^2 + 2*x + 1"})
+    )
+    two_part.id = UUID(int=2)
+    essay = make_question(QuestionType.ESSAY)
+    essay.id = UUID(int=3)
+    questions = [mc, two_part, essay]
+    submissions = [
+        {str(mc.id): "B", str(two_part.id): json.dumps({"first": "2^(1/2)", "second": "(x+1)^2"})},
+        {str(mc.id): "a", str(two_part.id): json.dumps({"first": "2^(1/2)", "second": "x"}), str(essay.id): "so"},
+        {},
+    ]
+
+    for scoring_type in (ScoringType.CLASSIC, ScoringType.RASCH):
+        scorer = SubmissionScorer(questions, scoring_type)
+        for answers in submissions * 2:
+            score, max_score, status, rows = scorer.score(answers)
+            assert (score, max_score, status) == auto_score_submission(questions, answers, scoring_type)
+            assert rows == score_answers(questions, answers, scoring_type)
+
+
+def test_submission_scorer_does_not_conflate_equal_hashing_answers():
+    essay = make_question(QuestionType.ESSAY)
+    written = make_question(QuestionType.TWO_PART_WRITTEN, correct=json.dumps({"first": "abc", "second": "de"}))
+    written.id = UUID(int=2)
+    questions = [essay, written]
+    scorer = SubmissionScorer(questions, ScoringType.CLASSIC)
+    submissions = [
+        {str(essay.id): 1, str(written.id): json.dumps({"first": "abc", "second": "de"})},
+        {str(essay.id): 1.0, str(written.id): json.dumps({"first": "abc.", "second": "de!"})},
+        {str(essay.id): True},
+    ]
+
+    for answers in submissions:
+        assert scorer.score(answers)[3] == score_answers(questions, answers, ScoringType.CLASSIC)
@@ -0,0 +1,65 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import orjson
+
+from app.core.constants import SubmissionStatus
+from app.core.responses import ORJSONResponse
+from app.models.domain import LeaderboardEntry
+from app.schemas.submissions import LeaderboardResponse, SubmissionOut
+from app.services.submission_service import leaderboard_rows
+
+
+def entry(status, score, submitted_at):
+    return LeaderboardEntry(
+        submission_id=uuid4(),
+        test_id=1,
+        status=status,
+        final_score=score,
+        submitted_at=submitted_at,
+        participant_full_name="Ali Valiyev",
+        participant_secondary="+998901234567",
+        participant_attempt_value="+998901234567",
+        participant_fields_json={"region": "Toshkent"},
+    )
+
+
+def model_json(model, payload) -> bytes:
+    return model.model_validate(payload).model_dump_json().encode()
+
+
+def test_orjson_leaderboard_matches_response_model_output():
+    submitted_at = datetime(2026, 10, 19, 9, 30, 15, 123456, tzinfo=UTC)
+    payload = {
+        **leaderboard_rows(
+            [entry(SubmissionStatus.COMPLETED, 87, submitted_at)],
+            [entry(SubmissionStatus.PENDING_REVIEW, None, submitted_at)],
+        ),
+        "stats": {"ranked": 1, "pending": 1, "total": 2},
+        "raschStats": None,
+        "nextRankedCursor": "abc",
+        "nextPendingCursor": None,
+    }
+
+    body = ORJSONResponse(payload).body
+
+    assert orjson.loads(body) == orjson.loads(model_json(LeaderboardResponse, payload))
+    assert b'"submittedAt":"2026-10-19T09:30:15.123456Z"' in body
+
+
+def test_orjson_submission_matches_response_model_output():
+    payload = {
+        "id": uuid4(),
+        "testId": 7,
+        "participant": {"fullName": "Ali", "phone": "", "fields": {}, "attemptValue": "Ali"},
+        "answers": {"q1": "A", "q2": 3},
+        "autoScore": 2.0,
+        "autoMaxScore": 3.0,
+        "finalScore": None,
+        "status": SubmissionStatus.PENDING_REVIEW.value,
+        "submittedAt": datetime(2026, 10, 19, tzinfo=UTC),
+        "manualGrades": {"q3": 0.5},
+        "reviewedAt": None,
+    }
+
+    assert ORJSONResponse([payload]).body == b"[" + model_json(SubmissionOut, payload) + b"]"
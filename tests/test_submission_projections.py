@@ -0,0 +1,11 @@
+from app.repositories.submission_repository import SubmissionRepository
+from tests.fakes import RecordingSession
+
+
+async def test_grading_view_loads_answers_but_not_participant_fields():
+    session = RecordingSession()
+    await SubmissionRepository(session).list_for_grading(1, include_manual_grades=False)
+    sql = session.statements[0]
+    assert "submissions.answers_json" in sql
+    assert "participant_fields_json" not in sql
+    assert "participant_full_name" not in sql
@@ -2,6 +2,7 @@ from fastapi import HTTPException
 
 from app.core.constants import QuestionType, ScoringType
 from app.services.test_service import TestService
+from tests.fakes import make_test
 
 
 def test_rasch_rejects_open_questions():
@@ -65,3 +66,26 @@ def test_rasch_accepts_two_part_math_with_unit_part_points():
     ]
 
     service._validate_rasch_configuration(ScoringType.RASCH, questions)
+
+
+def test_answer_key_ignores_wording_but_not_correct_answers():
+    service = TestService(None)
+    row = make_test()
+    key = service._answer_key(row)
+    questions = [
+        {
+            "id": str(q.id),
+            "type": q.q_type.value,
+            "content": "edited",
+            "points": q.points,
+            "correctAnswer": q.correct_answer_text,
+        }
+        for q in row.questions
+    ]
+
+    service._replace_questions(row, questions)
+    assert service._answer_key(row) == key
+
+    questions[0]["correctAnswer"] = "false" if questions[0]["correctAnswer"] == "true" else "A"
+    service._replace_questions(row, questions)
+    assert service._answer_key(row) != key